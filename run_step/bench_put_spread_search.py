@@ -0,0 +1,74 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.tariff_strategy.trading.put_spread_search import (
+    search_best_put_spread,
+    search_put_spreads_batched,
+)
+from src.tariff_strategy.trading.target_payoff import build_price_grid, downside_target_payoff
+
+TOP_K = 20
+N_REPEATS = 3
+
+# Synthetic "full chain" case: dense strikes on a fine grid
+N_SYNTH_STRIKES = 150
+N_SYNTH_GRID = 1_000
+
+
+def best_time(fn, *args, **kwargs):
+    times = []
+    for _ in range(N_REPEATS):
+        t0 = time.perf_counter()
+        out = fn(*args, **kwargs)
+        times.append(time.perf_counter() - t0)
+    return min(times), out
+
+
+def synthetic_puts(s0: float, n_strikes: int) -> pd.DataFrame:
+    """
+    Dense put chain with mids from a crude intrinsic + time-value shape.
+    """
+    strikes = np.linspace(0.70 * s0, 1.10 * s0, n_strikes).round(1)
+    mids = np.maximum(strikes - s0, 0.0) + 0.03 * s0 * np.exp(-((strikes - s0) / (0.10 * s0)) ** 2)
+    return pd.DataFrame({"strike": strikes, "mid": mids.round(2)})
+
+
+def compare(S_grid, puts, target):
+    print(f"Puts: {len(puts)}, grid points: {len(S_grid)}")
+
+    t_loop, loop = best_time(search_best_put_spread, S_grid, puts, target)
+    t_batch, batch = best_time(search_put_spreads_batched, S_grid, puts, target, top_k=TOP_K)
+
+    print(f"Loop search:    {t_loop * 1e3:9.2f} ms ({len(loop)} spreads)")
+    print(f"Batched search: {t_batch * 1e3:9.2f} ms (top {len(batch)} spreads)")
+    print(f"Speed-up:       {t_loop / t_batch:9.1f}x")
+
+    # Top errors must agree between both engines
+    diff = np.abs(loop["error"].to_numpy()[:TOP_K] - batch["error"].to_numpy())
+    print(f"Max |error diff| over top {TOP_K}: {diff.max():.2e}")
+    return loop, batch
+
+
+if __name__ == "__main__":
+    # Same inputs as Step 9
+    S_grid = np.load("data/step8_S_grid.npy")
+    target = np.load("data/step8_target_y.npy")
+    meta = pd.read_csv("data/step8_contract_meta.csv")
+    puts = meta[meta["type"] == "put"].reset_index(drop=True)
+
+    print("=== Step 8 chain ===")
+    loop, batch = compare(S_grid, puts, target)
+    print("\nBest spread (loop):")
+    print(loop.iloc[0])
+    print("\nBest spread (batched):")
+    print(batch.iloc[0])
+
+    # Step 8 grid runs from 0.60 to 1.40 x S0, so its mean is S0
+    s0 = float(S_grid.mean())
+    S_fine = build_price_grid(s0=s0, n=N_SYNTH_GRID)
+    target_fine = downside_target_payoff(S_fine, s0=s0)
+
+    print("\n=== Synthetic full chain ===")
+    compare(S_fine, synthetic_puts(s0, N_SYNTH_STRIKES), target_fine)
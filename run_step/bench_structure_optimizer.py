@@ -0,0 +1,114 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.tariff_strategy.trading.optimizer_inputs import build_design_matrix
+from src.tariff_strategy.trading.pricing import bs_call_price, bs_put_price
+from src.tariff_strategy.trading.put_spread_search import search_put_spreads_batched
+from src.tariff_strategy.trading.structure_optimizer import fit_structure
+from src.tariff_strategy.trading.target_payoff import build_price_grid, downside_target_payoff
+
+MAX_LEGS = 4
+N_REPEATS = 3
+
+# Synthetic full chains: calls + puts on one strike ladder, on a fine grid
+S0 = 400.0
+CHAIN_SIZES = (100, 200, 400, 800)
+GRID_POINTS = 1000
+TARGET_SCALE = 90.0    # target payoff in $ per share at the floor
+BUDGET = 1500.0        # net premium budget in dollars, below 1.5x the best spread
+
+# Exact MILP for comparison (seconds per solve, None = no reference run)
+REFERENCE_TIME_LIMIT = 10.0
+# Long local search for comparison (kicks, None = no reference run)
+REFERENCE_KICKS = 2000
+
+
+def best_time(fn, *args, **kwargs):
+    times = []
+    for _ in range(N_REPEATS):
+        t0 = time.perf_counter()
+        out = fn(*args, **kwargs)
+        times.append(time.perf_counter() - t0)
+    return min(times), out
+
+
+def synthetic_chain(s0: float, n_contracts: int) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Calls and puts on n_contracts / 2 strikes, Black-Scholes mids with a
+    put skew, and a bid/ask of 2 cents plus 2% of mid either side.
+    """
+    strikes = np.linspace(0.70 * s0, 1.20 * s0, n_contracts // 2).round(2)
+    T = 30 / 365
+    vol = 0.35 - 0.30 * (strikes / s0 - 1.0)
+
+    def side(mids, kind):
+        mids = mids.round(2)
+        half = 0.02 + 0.02 * mids
+        return pd.DataFrame({
+            "strike": strikes,
+            "mid": mids,
+            "contractSymbol": [f"{kind}{k:g}" for k in strikes],
+            "bid": np.maximum(mids - half, 0.0),
+            "ask": mids + half,
+        })
+
+    return side(bs_call_price(s0, strikes, T, vol, 0.0), "C"), side(bs_put_price(s0, strikes, T, vol, 0.0), "P")
+
+
+def compare(S_grid, X, y, buy, sell, budget, meta, X_lazy=None):
+    print(f"Contracts: {X.shape[1]}, grid points: {X.shape[0]}")
+
+    t_fit, fit = best_time(
+        fit_structure, X, y, buy, meta=meta, sell_cost=sell, budget=budget, max_legs=MAX_LEGS, integer=True
+    )
+    print(f"Default fit:    {t_fit * 1e3:9.2f} ms  mae {fit.mae:.4f}  premium ${fit.premium:,.0f}  ({fit.status})")
+    print(fit.legs[["type", "strike", "quantity"]].to_string(index=False))
+
+    if X_lazy is not None:
+        t_lazy, lazy = best_time(
+            fit_structure, X_lazy, y, buy, meta=meta, sell_cost=sell, budget=budget, max_legs=MAX_LEGS, integer=True
+        )
+        print(f"Lazy X fit:     {t_lazy * 1e3:9.2f} ms  mae {lazy.mae:.4f}")
+        t_lp, lp = best_time(fit_structure, X, y, buy, sell_cost=sell, budget=budget)
+        t_lazy_lp, lazy_lp = best_time(fit_structure, X_lazy, y, buy, sell_cost=sell, budget=budget)
+        print(f"LP, dense X:    {t_lp * 1e3:9.2f} ms  mae {lp.mae:.4f}")
+        print(f"LP, lazy X:     {t_lazy_lp * 1e3:9.2f} ms  mae {lazy_lp.mae:.4f}")
+
+    references = {}
+    if REFERENCE_TIME_LIMIT is not None:
+        references[f"MILP {REFERENCE_TIME_LIMIT:g}s limit"] = dict(time_limit=REFERENCE_TIME_LIMIT)
+    if REFERENCE_KICKS is not None:
+        references[f"{REFERENCE_KICKS} kicks"] = dict(n_kicks=REFERENCE_KICKS, search_time=None, time_limit=0)
+    for label, kwargs in references.items():
+        t0 = time.perf_counter()
+        ref = fit_structure(X, y, buy, meta=meta, sell_cost=sell, budget=budget, max_legs=MAX_LEGS, integer=True, **kwargs)
+        t_ref = time.perf_counter() - t0
+        print(f"{label + ':':15} {t_ref * 1e3:9.2f} ms  mae {ref.mae:.4f}  gap {fit.mae / ref.mae - 1:+.1%}  ({ref.status})")
+
+
+if __name__ == "__main__":
+    # Same inputs as Step 9: 17 contracts, budget of the best put spread
+    S_grid = np.load("data/step8_S_grid.npy")
+    target = np.load("data/step8_target_y.npy")
+    meta = pd.read_csv("data/step8_contract_meta.csv")
+    X = np.load("data/step8_payoff_X.npy")
+    c = np.load("data/step8_cost_c.npy")
+    best = search_put_spreads_batched(S_grid, meta[meta["type"] == "put"].reset_index(drop=True), target).iloc[0]
+
+    print("=== Step 8 chain ===")
+    print(f"Best put spread {best['K_long']:g}/{best['K_short']:g}, cost ${best['cost']:,.0f}")
+    compare(S_grid, X, target * (best["K_long"] - best["K_short"]), c, c, float(best["cost"]), meta)
+
+    S_grid = build_price_grid(s0=S0, n=GRID_POINTS)
+    target = downside_target_payoff(S_grid, s0=S0) * TARGET_SCALE
+    for n_contracts in CHAIN_SIZES:
+        calls, puts = synthetic_chain(S0, n_contracts)
+        X, meta = build_design_matrix(S_grid, calls, puts)
+        X_lazy, _ = build_design_matrix(S_grid, calls, puts, lazy=True)
+        buy = meta["ask"].to_numpy() * 100
+        sell = meta["bid"].to_numpy() * 100
+
+        print(f"\n=== Synthetic chain, {n_contracts} contracts ===")
+        compare(S_grid, X, target, buy, sell, BUDGET, meta, X_lazy)
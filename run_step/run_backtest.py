@@ -0,0 +1,22 @@
+from src.tariff_strategy.data.cache import MarketDataCache
+from src.tariff_strategy.data.market_data import fetch_price_history
+from src.tariff_strategy.pipeline.backtest import BacktestConfig, run_backtest
+
+TICKER = "SMH"
+CACHE = MarketDataCache("data/cache")
+PERIOD = "10y"
+
+
+if __name__ == "__main__":
+    prices = fetch_price_history(TICKER, period=PERIOD, cache=CACHE)
+
+    bt = run_backtest(prices, BacktestConfig(lookback=504, step=1))
+
+    print(f"Trades: {len(bt)} ({bt['date'].iloc[0]} to {bt['date'].iloc[-1]})")
+    print(f"Mean realised P&L:   ${bt['pnl_$'].mean():.2f}")
+    print(f"Mean ex-ante EV:     ${bt['ev_$'].mean():.2f}")
+    print(f"Realised hit rate:   {(bt['pnl_$'] > 0).mean():.2%}")
+    print(f"Mean ex-ante P(win): {bt['p_profit'].mean():.2%}")
+
+    bt.to_csv("data/backtest_put_spread.csv", index=False)
+    print("\nSaved: data/backtest_put_spread.csv")
@@ -0,0 +1,27 @@
+from src.tariff_strategy.data.cache import MarketDataCache
+from src.tariff_strategy.pipeline.tariff import DEFAULT_PARAMS, build_tariff_pipeline
+
+CACHE = MarketDataCache("data/cache")
+CHECKPOINT_DIR = None  # e.g. "data/pipeline" to write every step output to disk
+
+
+if __name__ == "__main__":
+    pipe = build_tariff_pipeline(cache=CACHE)
+    params = dict(DEFAULT_PARAMS)
+
+    out = pipe.run(params, checkpoint_dir=CHECKPOINT_DIR, verbose=True)
+
+    print(f"\nS0: {out['s0']:.2f}, expiry: {out['chosen_expiry']}")
+    print(f"mu_30: {out['calibration']['mu_base']:.4f}, sigma_30: {out['calibration']['sigma_base']:.4f}")
+    print("\nTop put spreads:")
+    print(out["put_spreads"].head())
+    print(f"\nBest structure with up to {params['max_legs']} legs:")
+    print(out["structure"])
+    print("\n=== Final Trade Summary (1x Put Spread) ===")
+    for k, v in out["trade"].items():
+        print(f"{k:>14}: {v:,.4f}")
+
+    # Only the simulation and trade scoring depend on n_sims, so only they re-run
+    params["n_sims"] = 200_000
+    out = pipe.run(params, verbose=True)
+    print(f"\nWith {params['n_sims']:,} paths: EV ${out['trade']['ev_$']:.2f}, P(profit) {out['trade']['p_profit']:.2%}")
@@ -2,17 +2,19 @@ import pandas as pd
 import matplotlib.pyplot as plt
 
 from src.tariff_strategy.data.market_data import fetch_price_history
+from src.tariff_strategy.data.cache import MarketDataCache
 from src.tariff_strategy.modeling.scenarios import tariff_scenarios
 from src.tariff_strategy.modeling.distribution import simulate_terminal_prices
 
 
 
 TICKER = "SMH"
+CACHE = MarketDataCache("data/cache")
 N_SIMS = 50_000
 
 
 if __name__ == "__main__":
-    prices = fetch_price_history(TICKER, period="6mo")
+    prices = fetch_price_history(TICKER, period="6mo", cache=CACHE)
     s0 = float(prices["Adj Close"].iloc[-1].iloc[0]) if hasattr(prices["Adj Close"].iloc[-1], "iloc") else float(prices["Adj Close"].iloc[-1])
     print(f"Using S0 (latest Adj Close): {s0:.2f}")
 
@@ -1,12 +1,14 @@
 import matplotlib.pyplot as plt
 
 from src.tariff_strategy.data.market_data import fetch_price_history
+from src.tariff_strategy.data.cache import MarketDataCache
 from src.tariff_strategy.modeling.scenarios import tariff_scenarios
 from src.tariff_strategy.modeling.distribution import simulate_terminal_prices
 from src.tariff_strategy.modeling.calibration import baseline_sigma_30d, baseline_mu_30d
 
 
 TICKER = "SMH"
+CACHE = MarketDataCache("data/cache")
 N_SIMS = 50_000
 
 
@@ -17,7 +19,7 @@ def latest_adj_close(prices):
 
 
 if __name__ == "__main__":
-    prices = fetch_price_history(TICKER, period="2y")
+    prices = fetch_price_history(TICKER, period="2y", cache=CACHE)
     s0 = latest_adj_close(prices)
 
     mu_base = baseline_mu_30d(prices, window=30, trim=0.10)
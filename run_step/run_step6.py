@@ -2,6 +2,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 
 from src.tariff_strategy.data.market_data import fetch_price_history
+from src.tariff_strategy.data.cache import MarketDataCache
 from src.tariff_strategy.trading.target_payoff import (
     build_price_grid,
     downside_target_payoff,
@@ -9,9 +10,10 @@ from src.tariff_strategy.trading.target_payoff import (
 )
 
 TICKER = "SMH"
+CACHE = MarketDataCache("data/cache")
 
 if __name__ == "__main__":
-    prices = fetch_price_history(TICKER, period="6mo")
+    prices = fetch_price_history(TICKER, period="6mo", cache=CACHE)
 
     # latest adjusted close (handle multi-index case)
     last = prices["Adj Close"].iloc[-1]
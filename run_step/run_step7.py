@@ -8,25 +8,27 @@ from src.tariff_strategy.data.market_data import (
     fetch_options_chain,
     clean_chain,
 )
+from src.tariff_strategy.data.cache import MarketDataCache
 from src.tariff_strategy.trading.target_payoff import build_price_grid
 from src.tariff_strategy.trading.payoff import call_payoff, put_payoff
 from src.tariff_strategy.trading.options_universe import filter_liquid_options
 
 TICKER = "SMH"
+CACHE = MarketDataCache("data/cache")
 TARGET_DAYS = 30
 
 if __name__ == "__main__":
     # Get S0 and price grid
-    prices = fetch_price_history(TICKER, period="6mo")
+    prices = fetch_price_history(TICKER, period="6mo", cache=CACHE)
     last = prices["Adj Close"].iloc[-1]
     s0 = float(last.iloc[0]) if hasattr(last, "iloc") else float(last)
 
     S_grid = build_price_grid(s0=s0, grid_min=0.60, grid_max=1.40, n=250)
 
     # Get expiry and options chain
-    expiries = list_option_expiries(TICKER)
+    expiries = list_option_expiries(TICKER, cache=CACHE)
     exp = nearest_expiry(expiries, target_days=TARGET_DAYS)
-    chain = clean_chain(fetch_options_chain(TICKER, exp))
+    chain = clean_chain(fetch_options_chain(TICKER, exp, cache=CACHE))
 
     calls = filter_liquid_options(chain.calls, max_spread=1.00, min_oi=50)
     puts = filter_liquid_options(chain.puts, max_spread=1.00, min_oi=50)
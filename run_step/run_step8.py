@@ -2,16 +2,18 @@ import numpy as np
 import pandas as pd
 
 from src.tariff_strategy.data.market_data import fetch_price_history
+from src.tariff_strategy.data.cache import MarketDataCache
 from src.tariff_strategy.trading.target_payoff import build_price_grid
 from src.tariff_strategy.trading.optimizer_inputs import build_design_matrix, cost_vector
 
 TICKER = "SMH"
+CACHE = MarketDataCache("data/cache")
 EXPIRY = "2026-02-13"  # use the one you printed in Step 7
 
 
 if __name__ == "__main__":
     # S_grid
-    prices = fetch_price_history(TICKER, period="6mo")
+    prices = fetch_price_history(TICKER, period="6mo", cache=CACHE)
     last = prices["Adj Close"].iloc[-1]
     s0 = float(last.iloc[0]) if hasattr(last, "iloc") else float(last)
 
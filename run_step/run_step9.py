@@ -2,18 +2,24 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
-from src.tariff_strategy.trading.put_spread_search import search_best_put_spread
+from src.tariff_strategy.trading.put_spread_search import search_put_spreads_batched
 from src.tariff_strategy.trading.payoff import put_payoff
+from src.tariff_strategy.trading.structure_optimizer import fit_structure
+
+MAX_LEGS = 4
 
 # Load Step 8 outputs
 S_grid = np.load("data/step8_S_grid.npy")
 target = np.load("data/step8_target_y.npy")
 meta = pd.read_csv("data/step8_contract_meta.csv")
 
+X = np.load("data/step8_payoff_X.npy")
+c = np.load("data/step8_cost_c.npy")
+
 # Restrict to puts only
 puts = meta[meta["type"] == "put"].reset_index(drop=True)
 
-results = search_best_put_spread(
+results = search_put_spreads_batched(
     S_grid=S_grid,
     puts=puts,
     target=target,
@@ -31,6 +37,20 @@ K_short = best["K_short"]
 width = K_long - K_short
 spread_payoff = (put_payoff(S_grid, K_long) - put_payoff(S_grid, K_short)) / width
 
+# Multi-leg fit over every call and put, sized so 1 unit of target = 1 spread,
+# with the same premium budget as the best two-leg spread
+fit = fit_structure(
+    X,
+    target * width,
+    c,
+    meta=meta,
+    budget=float(best["cost"]),
+    max_legs=MAX_LEGS,
+    integer=True,
+)
+print(f"\nBest structure with up to {MAX_LEGS} legs ({fit.status}):")
+print(fit.legs)
+print(f"Premium: ${fit.premium:.2f}, MSE vs target: {fit.mse:.4f}")
 
 plt.figure()
 plt.plot(S_grid, target, label="Target payoff", linewidth=2)
@@ -0,0 +1,46 @@
+import pandas as pd
+
+from src.tariff_strategy.data.cache import MarketDataCache
+from src.tariff_strategy.data.market_data import fetch_price_history
+from src.tariff_strategy.modeling.analytic import mixture_from_calibration
+from src.tariff_strategy.modeling.calibration import baseline_mu_30d, baseline_sigma_30d
+from src.tariff_strategy.modeling.scenarios import tariff_scenarios
+from src.tariff_strategy.pipeline.sweep import default_cases, run_sweep
+from src.tariff_strategy.pipeline.tariff import latest_adj_close
+from src.tariff_strategy.trading.target_payoff import adaptive_price_grid, downside_target_payoff
+
+TICKER = "SMH"
+CACHE = MarketDataCache("data/cache")
+
+# Use the result from Step 9
+K_LONG = 385.0
+K_SHORT = 350.0
+PREMIUM_PAID = 577.0  # dollars
+
+
+if __name__ == "__main__":
+    prices = fetch_price_history(TICKER, period="2y", cache=CACHE)
+    s0 = latest_adj_close(prices)
+    mu_base = baseline_mu_30d(prices)
+    sigma_base = baseline_sigma_30d(prices)
+
+    # Step 8 contract table, re-searched on a grid that follows the base-case mass
+    meta = pd.read_csv("data/step8_contract_meta.csv")
+    puts = meta[meta["type"] == "put"].reset_index(drop=True)
+    mixture = mixture_from_calibration(s0, tariff_scenarios(), mu_base, sigma_base)
+    S_grid = adaptive_price_grid(60, mixture=mixture, include=[0.85 * s0, s0])
+    target = downside_target_payoff(S_grid, s0=s0)
+
+    cases = default_cases(n_probabilities=200)
+    sweep = run_sweep(
+        s0, mu_base, sigma_base, cases, K_LONG, K_SHORT, PREMIUM_PAID,
+        puts=puts, S_grid=S_grid, target=target,
+        out_path="data/sweep_put_spread.npz",
+    )
+
+    print(f"Cases: {len(sweep):,}")
+    print(f"EV range:        ${sweep['ev_$'].min():.2f} to ${sweep['ev_$'].max():.2f}")
+    print(f"P(profit) range: {sweep['p_profit'].min():.2%} to {sweep['p_profit'].max():.2%}")
+    print(f"Same spread chosen in {sweep['same_choice'].mean():.1%} of cases")
+    print(sweep.groupby(["best_K_long", "best_K_short"]).size().rename("cases"))
+    print("\nSaved: data/sweep_put_spread.npz")
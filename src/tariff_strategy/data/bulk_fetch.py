@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional, Tuple, TypeVar, Union
+
+import pandas as pd
+
+from .cache import today_utc
+from .market_data import OptionsChain, fetch_options_chain, list_option_expiries
+
+ChainFetcher = Callable[[str, str], OptionsChain]
+ExpiryLister = Callable[[str], List[str]]
+T = TypeVar("T")
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter: at most `rate` call starts per second across all threads.
+    """
+
+    def __init__(self, rate: float):
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        self.interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def _limiter(rate: Union[float, RateLimiter, None]) -> Optional[RateLimiter]:
+    return rate if rate is None or isinstance(rate, RateLimiter) else RateLimiter(rate)
+
+
+def _with_retry(
+    call: Callable[..., T],
+    args: tuple,
+    limiter: Optional[RateLimiter],
+    retries: int,
+    backoff: float,
+) -> T:
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            limiter.wait()
+        try:
+            return call(*args)
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(backoff * 2 ** attempt)
+
+
+def chain_requests(
+    tickers: Iterable[str],
+    list_expiries: ExpiryLister = list_option_expiries,
+    max_days: Optional[int] = None,
+    rate: Union[float, RateLimiter, None] = 5.0,
+    retries: int = 2,
+    backoff: float = 0.5,
+) -> List[Tuple[str, str]]:
+    """
+    All (ticker, expiry) pairs listed for the tickers, optionally only expiries
+    within max_days from today. Past expiries are dropped.
+
+    Listings go through the same rate limit and retries as fetch_chains;
+    pass one RateLimiter as rate to both to share a single budget.
+    """
+    today = pd.Timestamp(today_utc())
+    limiter = _limiter(rate)
+    pairs = []
+    for ticker in tickers:
+        for expiry in _with_retry(list_expiries, (ticker,), limiter, retries, backoff):
+            days = (pd.Timestamp(expiry) - today).days
+            if days < 0 or (max_days is not None and days > max_days):
+                continue
+            pairs.append((ticker, expiry))
+    return pairs
+
+
+def _long_table(ticker: str, chain: OptionsChain) -> pd.DataFrame:
+    calls = chain.calls.assign(type="call")
+    puts = chain.puts.assign(type="put")
+    out = pd.concat([calls, puts], ignore_index=True)
+    out.insert(0, "ticker", ticker)
+    out.insert(1, "expiry", chain.expiry)
+    return out
+
+
+def fetch_chains(
+    pairs: Iterable[Tuple[str, str]],
+    fetch: ChainFetcher = fetch_options_chain,
+    max_workers: int = 8,
+    rate: Union[float, RateLimiter, None] = 5.0,
+    retries: int = 2,
+    backoff: float = 0.5,
+    skip_failed: bool = True,
+) -> pd.DataFrame:
+    """
+    Fetch many (ticker, expiry) chains concurrently and stack them in one table.
+
+    - fetch(ticker, expiry) -> OptionsChain is the data source; pass a
+      functools.partial of fetch_options_chain with a cache, or a local fake
+    - at most max_workers requests are in flight, and at most `rate` start
+      per second (None disables the limit, a RateLimiter is shared as is)
+    - failed requests are retried with exponential backoff; once retries are
+      used up they are skipped with a warning, or raised if skip_failed=False
+
+    Returns one long table with ticker, expiry and type ("call"/"put") columns
+    in front of the chain columns, in the order the pairs were given.
+    """
+    pairs = list(pairs)
+    limiter = _limiter(rate)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(_with_retry, fetch, (ticker, expiry), limiter, retries, backoff)
+            for ticker, expiry in pairs
+        ]
+
+        tables = []
+        for (ticker, expiry), fut in zip(pairs, futures):
+            try:
+                tables.append(_long_table(ticker, fut.result()))
+            except Exception as exc:
+                if not skip_failed:
+                    raise
+                warnings.warn(f"Skipping {ticker} {expiry}: {exc}")
+
+    if not tables:
+        raise ValueError("No option chains could be fetched.")
+    return pd.concat(tables, ignore_index=True)
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+class CacheMiss(KeyError):
+    """
+    Raised by an offline cache when the requested entry is not on disk.
+    """
+
+
+def today_utc() -> str:
+    """
+    Today's date (UTC) as an ISO string, the default as-of key.
+    """
+    return pd.Timestamp.now(tz="UTC").date().isoformat()
+
+
+def _safe(part: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]", "_", str(part))
+
+
+def _encode_column(col: pd.Series) -> tuple[dict, dict]:
+    """
+    Turn one column into plain numpy arrays plus a small JSON spec.
+    """
+    if pd.api.types.is_datetime64_any_dtype(col):
+        tz = None if getattr(col.dt, "tz", None) is None else str(col.dt.tz)
+        values = col.dt.tz_convert("UTC").dt.tz_localize(None) if tz else col
+        return {"kind": "datetime", "tz": tz}, {"v": values.to_numpy()}
+
+    if pd.api.types.is_bool_dtype(col) and not col.isna().any():
+        return {"kind": "plain"}, {"v": col.to_numpy(dtype=bool)}
+
+    if pd.api.types.is_numeric_dtype(col):
+        if isinstance(col.dtype, np.dtype):
+            return {"kind": "plain"}, {"v": col.to_numpy()}
+        return {"kind": "plain"}, {"v": col.to_numpy(dtype=float, na_value=np.nan)}
+
+    mask = col.isna().to_numpy()
+    text = col.astype(object).where(~mask, "").astype(str).to_numpy(dtype=str)
+    return {"kind": "str"}, {"v": text, "m": mask}
+
+
+def _decode_column(spec: dict, arrays: dict) -> pd.Series:
+    values = arrays["v"]
+    if spec["kind"] == "datetime":
+        s = pd.Series(values)
+        return s.dt.tz_localize("UTC").dt.tz_convert(spec["tz"]) if spec["tz"] else s
+    if spec["kind"] == "str":
+        s = pd.Series(values.astype(object))
+        return s.where(~arrays["m"], None)
+    return pd.Series(values)
+
+
+def save_frame(path: Union[str, Path], df: pd.DataFrame, extra: Optional[dict] = None) -> None:
+    """
+    Write a DataFrame to a columnar .npz file (one array per column, no pickle).
+
+    The index is not stored: callers keep data in columns (reset_index()).
+    Writes go through a temp file + os.replace so readers never see a partial file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    multi = isinstance(df.columns, pd.MultiIndex)
+    specs = []
+    arrays = {}
+    for i in range(df.shape[1]):
+        spec, cols = _encode_column(df.iloc[:, i])
+        specs.append(spec)
+        for name, arr in cols.items():
+            arrays[f"{name}{i}"] = arr
+
+    meta = {
+        "columns": [list(c) if multi else c for c in df.columns],
+        "multiindex": multi,
+        "column_names": list(df.columns.names),
+        "specs": specs,
+        "n_rows": len(df),
+        "extra": extra or {},
+    }
+    arrays["__meta__"] = np.frombuffer(json.dumps(meta, default=str).encode(), dtype=np.uint8)
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def load_frame(path: Union[str, Path]) -> tuple[pd.DataFrame, dict]:
+    """
+    Read a DataFrame written by save_frame. Returns (df, extra metadata).
+    """
+    with np.load(path, allow_pickle=False) as z:
+        meta = json.loads(z["__meta__"].tobytes().decode())
+        cols = []
+        for i, spec in enumerate(meta["specs"]):
+            arrays = {k: z[f"{k}{i}"] for k in ("v", "m") if f"{k}{i}" in z.files}
+            cols.append(_decode_column(spec, arrays))
+
+    if meta["multiindex"]:
+        columns = pd.MultiIndex.from_tuples([tuple(c) for c in meta["columns"]], names=meta["column_names"])
+    else:
+        columns = pd.Index(meta["columns"], name=meta["column_names"][0])
+
+    if cols:
+        df = pd.concat(cols, axis=1, ignore_index=True)
+        df.columns = columns
+    else:
+        df = pd.DataFrame(index=range(meta["n_rows"]), columns=columns)
+    return df, meta["extra"]
+
+
+class MarketDataCache:
+    """
+    On-disk cache for market data frames, keyed by (kind, ticker, key, as_of).
+
+    - kind is e.g. "prices", "calls", "puts", "expiries"
+    - key is the period ("2y") or expiry ("2026-02-13")
+    - as_of is the date the data describes, today (UTC) by default
+
+    Entries for today or later that are older than ttl_seconds are treated as
+    misses; data for a past date does not change, so those never expire.
+    When the directory grows past max_bytes the least recently used entries
+    are removed.
+    offline=True serves whatever is on disk regardless of age and raises
+    CacheMiss instead of letting callers go to the network.
+
+    Reads without an as_of, and every offline read, fall back to the newest
+    entry on disk for (kind, ticker, key), dated no later than as_of when
+    one is given, so a cache filled on an earlier day keeps serving;
+    get(..., fallback=True) does the same for online reads.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path] = "data/cache",
+        ttl_seconds: Optional[float] = 24 * 3600,
+        max_bytes: Optional[int] = 512 * 1024 ** 2,
+        offline: bool = False,
+    ):
+        self.root = Path(root)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.offline = offline
+
+    def path(self, kind: str, ticker: str, key: str, as_of: Optional[str] = None) -> Path:
+        as_of = as_of or today_utc()
+        return self.root / _safe(ticker) / f"{_safe(kind)}__{_safe(key)}__{_safe(as_of)}.npz"
+
+    def latest(self, kind: str, ticker: str, key: str, as_of: Optional[str] = None) -> Optional[Path]:
+        """
+        Path of the newest entry for (kind, ticker, key), as of `as_of` or
+        earlier when given; None when there is none.
+        """
+        folder = self.root / _safe(ticker)
+        prefix = f"{_safe(kind)}__{_safe(key)}__"
+        if not folder.exists():
+            return None
+        dates = sorted(p.name[len(prefix):-len(".npz")] for p in folder.glob(f"{prefix}*.npz"))
+        if as_of is not None:
+            dates = [d for d in dates if d <= _safe(as_of)]
+        return folder / f"{prefix}{dates[-1]}.npz" if dates else None
+
+    def get(
+        self,
+        kind: str,
+        ticker: str,
+        key: str,
+        as_of: Optional[str] = None,
+        fallback: bool = False,
+    ) -> Optional[pd.DataFrame]:
+        """
+        Cached frame or None (offline caches raise CacheMiss instead of returning None).
+        """
+        path = self.path(kind, ticker, key, as_of)
+        exact = path.exists()
+        if not exact and (self.offline or as_of is None or fallback):
+            path = self.latest(kind, ticker, key, as_of) or path
+        if not path.exists():
+            if self.offline:
+                raise CacheMiss(f"{kind} for {ticker} ({key}, as of {as_of or today_utc()}) not in cache {self.root}.")
+            return None
+
+        df, extra = load_frame(path)
+        age = time.time() - float(extra.get("written_at", 0.0))
+        current = as_of is None or as_of >= today_utc()
+        if not self.offline and current and self.ttl_seconds is not None and age > self.ttl_seconds:
+            if exact:  # an older day's entry is left for offline use
+                path.unlink(missing_ok=True)
+            return None
+
+        os.utime(path)  # mark as recently used for LRU eviction
+        return df
+
+    def put(self, kind: str, ticker: str, key: str, df: pd.DataFrame, as_of: Optional[str] = None) -> None:
+        save_frame(self.path(kind, ticker, key, as_of), df, extra={"written_at": time.time()})
+        self.evict()
+
+    def size_bytes(self) -> int:
+        return sum(p.stat().st_size for p in self.root.rglob("*.npz"))
+
+    def evict(self) -> None:
+        """
+        Drop least recently used entries until the cache fits in max_bytes.
+        """
+        if self.max_bytes is None or not self.root.exists():
+            return
+
+        entries = []
+        for p in self.root.rglob("*.npz"):
+            try:
+                st = p.stat()
+            except FileNotFoundError:  # removed by another writer meanwhile
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> None:
+        for p in self.root.rglob("*.npz"):
+            p.unlink(missing_ok=True)
@@ -0,0 +1,168 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .market_data import OptionsChain
+
+CALL = 0
+PUT = 1
+
+# rows of ChainArrays.values, in order
+FIELDS = ("strike", "bid", "ask", "mid", "spread", "volume", "open_interest", "iv")
+
+# yfinance column -> field
+_SOURCE = {
+    "strike": "strike",
+    "bid": "bid",
+    "ask": "ask",
+    "volume": "volume",
+    "open_interest": "openInterest",
+    "iv": "impliedVolatility",
+}
+
+
+def _column(df: pd.DataFrame, name: str) -> np.ndarray:
+    if name not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+
+
+@dataclass(frozen=True)
+class ChainArrays:
+    """
+    One expiry's calls and puts as a single (len(FIELDS), n) float block plus
+    a type code and contract symbols.
+
+    Rows are sorted by (type, strike), so calls() / puts() and the per-field
+    properties are zero-copy views. take() and filter_liquid() gather a
+    subset into one new block (a mask cannot be a view); pandas only appears
+    in from_chain / to_chain / meta.
+    """
+    expiry: str
+    values: np.ndarray       # (len(FIELDS), n), C-contiguous
+    type_code: np.ndarray    # (n,) int8, CALL or PUT
+    symbol: np.ndarray       # (n,) str
+
+    def __len__(self) -> int:
+        return self.values.shape[1]
+
+    def field(self, name: str) -> np.ndarray:
+        return self.values[FIELDS.index(name)]
+
+    strike = property(lambda self: self.field("strike"))
+    bid = property(lambda self: self.field("bid"))
+    ask = property(lambda self: self.field("ask"))
+    mid = property(lambda self: self.field("mid"))
+    spread = property(lambda self: self.field("spread"))
+    volume = property(lambda self: self.field("volume"))
+    open_interest = property(lambda self: self.field("open_interest"))
+    iv = property(lambda self: self.field("iv"))
+
+    @property
+    def is_call(self) -> np.ndarray:
+        return self.type_code == CALL
+
+    @classmethod
+    def from_chain(cls, chain: OptionsChain) -> "ChainArrays":
+        """
+        Build from a raw or cleaned OptionsChain; mid and spread follow
+        mid_price / clean_chain (mid falls back to lastPrice).
+        """
+        blocks, codes, symbols = [], [], []
+        for df, code in ((chain.calls, CALL), (chain.puts, PUT)):
+            cols = {field: _column(df, src) for field, src in _SOURCE.items()}
+            mid = _column(df, "mid") if "mid" in df.columns else 0.5 * (cols["bid"] + cols["ask"])
+            cols["mid"] = np.where(np.isnan(mid), _column(df, "lastPrice"), mid)
+            cols["spread"] = cols["ask"] - cols["bid"]
+            blocks.append(np.vstack([cols[f] for f in FIELDS]))
+            codes.append(np.full(len(df), code, dtype=np.int8))
+            sym = df["contractSymbol"] if "contractSymbol" in df.columns else pd.Series([""] * len(df))
+            symbols.append(sym.astype(str).to_numpy(dtype=str))
+
+        values = np.hstack(blocks)
+        type_code = np.concatenate(codes)
+        order = np.lexsort((values[0], type_code))
+        return cls(
+            expiry=chain.expiry,
+            values=np.ascontiguousarray(values[:, order]),
+            type_code=type_code[order],
+            symbol=np.concatenate(symbols)[order],
+        )
+
+    def _slice(self, start: int, stop: int) -> "ChainArrays":
+        return ChainArrays(
+            expiry=self.expiry,
+            values=self.values[:, start:stop],
+            type_code=self.type_code[start:stop],
+            symbol=self.symbol[start:stop],
+        )
+
+    def calls(self) -> "ChainArrays":
+        return self._slice(0, int(np.searchsorted(self.type_code, PUT)))
+
+    def puts(self) -> "ChainArrays":
+        return self._slice(int(np.searchsorted(self.type_code, PUT)), len(self))
+
+    def take(self, rows: np.ndarray) -> "ChainArrays":
+        """
+        Subset by boolean mask or sorted row indices (keeps the row order).
+        """
+        return ChainArrays(
+            expiry=self.expiry,
+            values=np.ascontiguousarray(self.values[:, rows]),
+            type_code=self.type_code[rows],
+            symbol=self.symbol[rows],
+        )
+
+    def liquid_mask(self, max_spread: float = 1.00, min_oi: int = 50) -> np.ndarray:
+        """
+        Same rule as filter_liquid_options: a mid and strike are required, a
+        missing spread or open interest does not disqualify.
+        """
+        spread, oi = self.spread, self.open_interest
+        return (
+            ~np.isnan(self.mid)
+            & ~np.isnan(self.strike)
+            & (np.isnan(spread) | (spread <= max_spread))
+            & (np.isnan(oi) | (oi >= min_oi))
+        )
+
+    def filter_liquid(self, max_spread: float = 1.00, min_oi: int = 50) -> "ChainArrays":
+        """
+        filter_liquid_options on both sides at once; a copy, like take().
+        """
+        return self.take(self.liquid_mask(max_spread=max_spread, min_oi=min_oi))
+
+    def meta(self) -> pd.DataFrame:
+        """
+        Contract table in build_design_matrix's meta layout (calls, then puts).
+        """
+        return pd.DataFrame({
+            "type": np.where(self.is_call, "call", "put"),
+            "strike": self.strike,
+            "mid": self.mid,
+            "symbol": self.symbol,
+            "bid": self.bid,
+            "ask": self.ask,
+            "spread": self.spread,
+            "volume": self.volume,
+            "openInterest": self.open_interest,
+        })
+
+    def to_chain(self, columns: Optional[tuple] = None) -> OptionsChain:
+        """
+        Back to an OptionsChain with yfinance/clean_chain column names.
+        """
+        names = {"open_interest": "openInterest", "iv": "impliedVolatility"}
+        columns = columns or FIELDS
+
+        def frame(part: "ChainArrays") -> pd.DataFrame:
+            df = pd.DataFrame({"contractSymbol": part.symbol})
+            for f in columns:
+                df[names.get(f, f)] = part.field(f)
+            return df
+
+        return OptionsChain(calls=frame(self.calls()), puts=frame(self.puts()), expiry=self.expiry)
@@ -5,6 +5,8 @@ from typing import List, Optional, Tuple
 import pandas as pd
 import yfinance as yf
 
+from .cache import MarketDataCache, today_utc
+
 
 @dataclass(frozen=True)
 class OptionsChain:
@@ -13,25 +15,78 @@ class OptionsChain:
     expiry: str
 
 
-def fetch_price_history(ticker: str, period: str = "2y") -> pd.DataFrame:
+def _cached(
+    cache: Optional[MarketDataCache],
+    kind: str,
+    ticker: str,
+    key: str,
+    as_of: Optional[str],
+) -> Optional[pd.DataFrame]:
+    """
+    Cached frame for a fetch, or None when it has to be downloaded.
+
+    A past as_of is served from the newest entry on or before it. With no
+    such entry a LookupError is raised: a download returns today's data,
+    which would be look-ahead for a historical date.
+    """
+    past = as_of is not None and as_of < today_utc()
+    if cache is not None:
+        cached = cache.get(kind, ticker, key, as_of, fallback=past)
+        if cached is not None:
+            return cached
+    if past:
+        raise LookupError(
+            f"No {kind} for {ticker} ({key}) cached on or before {as_of}; a download would return today's data."
+        )
+    return None
+
+
+def fetch_price_history(
+    ticker: str,
+    period: str = "2y",
+    cache: Optional[MarketDataCache] = None,
+    as_of: Optional[str] = None,
+) -> pd.DataFrame:
     """
     Fetch daily OHLCV price history using yfinance.
+    With a cache, (ticker, period, as_of) is served from disk when available
+    and fresh downloads are stored as of today. A past as_of is only served
+    from the cache (LookupError when it has nothing on or before that date).
     """
+    cached = _cached(cache, "prices", ticker, period, as_of)
+    if cached is not None:
+        return cached
+
     df = yf.download(ticker, period=period, interval="1d", auto_adjust=False, progress=False)
     if df.empty:
         raise ValueError(f"No price data returned for {ticker}.")
     df = df.reset_index()
+
+    if cache is not None:
+        cache.put("prices", ticker, period, df)
     return df
 
 
-def list_option_expiries(ticker: str) -> List[str]:
+def list_option_expiries(
+    ticker: str,
+    cache: Optional[MarketDataCache] = None,
+    as_of: Optional[str] = None,
+) -> List[str]:
     """
     Return available option expiries as ISO date strings.
+    A past as_of is only served from the cache, as in fetch_price_history.
     """
+    cached = _cached(cache, "expiries", ticker, "all", as_of)
+    if cached is not None:
+        return cached["expiry"].tolist()
+
     t = yf.Ticker(ticker)
     expiries = list(t.options)
     if not expiries:
         raise ValueError(f"No option expiries found for {ticker}.")
+
+    if cache is not None:
+        cache.put("expiries", ticker, "all", pd.DataFrame({"expiry": expiries}))
     return expiries
 
 
@@ -51,10 +106,23 @@ def nearest_expiry(expiries: List[str], target_days: int = 30) -> str:
 
 
 
-def fetch_options_chain(ticker: str, expiry: str) -> OptionsChain:
+def fetch_options_chain(
+    ticker: str,
+    expiry: str,
+    cache: Optional[MarketDataCache] = None,
+    as_of: Optional[str] = None,
+) -> OptionsChain:
     """
     Fetch calls and puts for a specific expiry.
+    With a cache, (ticker, expiry, as_of) is served from disk when available
+    and fresh downloads are stored as of today. A past as_of is only served
+    from the cache, as in fetch_price_history.
     """
+    calls = _cached(cache, "calls", ticker, expiry, as_of)
+    puts = _cached(cache, "puts", ticker, expiry, as_of)
+    if calls is not None and puts is not None:
+        return OptionsChain(calls=calls, puts=puts, expiry=expiry)
+
     t = yf.Ticker(ticker)
     chain = t.option_chain(expiry)
     calls = chain.calls.copy()
@@ -63,6 +131,9 @@ def fetch_options_chain(ticker: str, expiry: str) -> OptionsChain:
     if calls.empty or puts.empty:
         raise ValueError(f"Empty options chain for {ticker} at expiry {expiry}.")
 
+    if cache is not None:
+        cache.put("calls", ticker, expiry, calls)
+        cache.put("puts", ticker, expiry, puts)
     return OptionsChain(calls=calls, puts=puts, expiry=expiry)
 
 
@@ -1,24 +1,26 @@
-from market_data import (
+from src.tariff_strategy.data.market_data import (
     fetch_price_history,
     list_option_expiries,
     nearest_expiry,
     fetch_options_chain,
     clean_chain,
 )
+from src.tariff_strategy.data.cache import MarketDataCache
 
 TICKER = "SMH"
+CACHE = MarketDataCache("data/cache")
 TARGET_DAYS = 30
 
 if __name__ == "__main__":
-    prices = fetch_price_history(TICKER, period="2y")
+    prices = fetch_price_history(TICKER, period="2y", cache=CACHE)
     print("Prices head:")
     print(prices.head(), "\n")
 
-    expiries = list_option_expiries(TICKER)
+    expiries = list_option_expiries(TICKER, cache=CACHE)
     exp = nearest_expiry(expiries, target_days=TARGET_DAYS)
     print(f"Chosen expiry near {TARGET_DAYS}d: {exp}\n")
 
-    chain = fetch_options_chain(TICKER, exp)
+    chain = fetch_options_chain(TICKER, exp, cache=CACHE)
     chain = clean_chain(chain)
 
     print("Calls sample:")
@@ -0,0 +1,82 @@
+from __future__ import annotations
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr
+
+from .distribution import scenario_params
+
+
+@dataclass(frozen=True)
+class LognormalMixture:
+    """
+    S_T = s0 * exp(R), R ~ N(mu_j, sigma_j^2) with probability p_j.
+
+    p / mu / sigma may also be (n_cases, n_scenarios) tables, which makes
+    every method return one value per case (inputs broadcast against the
+    leading axis), so many parameter sets are scored in one call.
+    """
+    s0: float
+    p: np.ndarray
+    mu: np.ndarray
+    sigma: np.ndarray
+
+    def _d(self, x) -> np.ndarray:
+        # standardised log-price, trailing axis = scenario
+        x = np.asarray(x, dtype=float)[..., None]
+        with np.errstate(divide="ignore"):
+            return (np.log(x / self.s0) - self.mu) / self.sigma
+
+    def cdf(self, x) -> np.ndarray:
+        return np.sum(ndtr(self._d(x)) * self.p, axis=-1)
+
+    def pdf(self, x) -> np.ndarray:
+        x = np.asarray(x, dtype=float)
+        d = self._d(x)
+        dens = np.exp(-0.5 * d ** 2) / (np.sqrt(2 * np.pi) * self.sigma)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(x > 0, np.sum(dens * self.p, axis=-1) / x, 0.0)
+
+    def moment(self, n: int):
+        """
+        E[S_T^n].
+        """
+        m = np.sum(self.p * self.s0 ** n * np.exp(n * self.mu + 0.5 * n ** 2 * self.sigma ** 2), axis=-1)
+        return float(m) if np.ndim(m) == 0 else m
+
+    def partial_moment(self, n: int, lo, hi) -> np.ndarray:
+        """
+        E[S_T^n 1{lo < S_T < hi}], broadcasting over lo/hi (0 and np.inf allowed).
+        """
+        scale = self.s0 ** n * np.exp(n * self.mu + 0.5 * n ** 2 * self.sigma ** 2)
+        shift = n * self.sigma
+        mass = ndtr(self._d(hi) - shift) - ndtr(self._d(lo) - shift)
+        return np.sum(mass * scale * self.p, axis=-1)
+
+    def put_expectation(self, K) -> np.ndarray:
+        """
+        E[max(K - S_T, 0)] per share, vectorised over strikes.
+        """
+        K = np.asarray(K, dtype=float)
+        return K * self.partial_moment(0, 0.0, K) - self.partial_moment(1, 0.0, K)
+
+    def call_expectation(self, K) -> np.ndarray:
+        """
+        E[max(S_T - K, 0)] per share, vectorised over strikes.
+        """
+        K = np.asarray(K, dtype=float)
+        return self.partial_moment(1, K, np.inf) - K * self.partial_moment(0, K, np.inf)
+
+
+def mixture_from_calibration(
+    s0: float,
+    scenarios: pd.DataFrame,
+    mu_base: float,
+    sigma_base: float,
+) -> LognormalMixture:
+    """
+    The exact terminal-price law that simulate_terminal_prices samples from.
+    """
+    mu, sigma = scenario_params(scenarios, mu_base=mu_base, sigma_base=sigma_base)
+    return LognormalMixture(s0=float(s0), p=scenarios["p"].to_numpy(dtype=float), mu=mu, sigma=sigma)
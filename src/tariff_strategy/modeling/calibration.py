@@ -1,18 +1,29 @@
 from __future__ import annotations
+import warnings
+from collections import deque
+from typing import Optional
 import numpy as np
 import pandas as pd
 
+from .order_stats import OrderStatisticTree
+
+
+def adj_close(prices: pd.DataFrame) -> pd.Series:
+    """
+    The 'Adj Close' column as a float Series.
+    """
+    # yfinance sometimes returns multi-index columns; handle both cases
+    if isinstance(prices.columns, pd.MultiIndex):
+        return prices["Adj Close"].iloc[:, 0].astype(float)
+    return prices["Adj Close"].astype(float)
+
 
 def compute_daily_log_returns(prices: pd.DataFrame) -> pd.Series:
     """
     Expects a DataFrame that includes an 'Adj Close' column (from yfinance download).
     Returns daily log returns.
     """
-    # yfinance sometimes returns multi-index columns; handle both cases
-    if isinstance(prices.columns, pd.MultiIndex):
-        adj = prices["Adj Close"].iloc[:, 0].astype(float)
-    else:
-        adj = prices["Adj Close"].astype(float)
+    adj = adj_close(prices)
 
     r = np.log(adj).diff().dropna()
     r.name = "log_return"
@@ -69,3 +80,217 @@ def baseline_mu_30d(prices: pd.DataFrame, window: int = 30, trim: float = 0.10)
 
     trimmed = mu_sorted.iloc[k : n - k]
     return float(trimmed.mean())
+
+
+def price_panel(prices: pd.DataFrame) -> pd.DataFrame:
+    """
+    Wide (dates x tickers) adjusted-close panel.
+
+    Accepts a yfinance multi-ticker download (MultiIndex columns with an
+    'Adj Close' level, optionally a 'Date' column) or an already-wide panel.
+    """
+    if isinstance(prices.columns, pd.MultiIndex) and "Adj Close" in prices.columns.get_level_values(0):
+        panel = prices["Adj Close"]
+        if "Date" in prices.columns.get_level_values(0):
+            dates = prices["Date"]
+            dates = dates.iloc[:, 0] if isinstance(dates, pd.DataFrame) else dates
+            panel = panel.set_axis(pd.Index(dates, name="Date"), axis=0)
+    else:
+        panel = prices.set_index("Date") if "Date" in prices.columns else prices
+    return panel.astype(float)
+
+
+def rolling_panel_30d(panel: pd.DataFrame, window: int = 30) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Rolling sigma_30 and mu_30 for every ticker at once.
+
+    Returns two (n_dates - window, n_tickers) arrays aligned with the return
+    dates panel.index[window:]. A window is NaN unless all of its returns
+    exist, so tickers with shorter histories simply start later.
+    """
+    P = panel.to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = np.diff(np.log(P), axis=0)
+
+    valid = np.isfinite(r)
+    n_valid = np.maximum(valid.sum(axis=0), 1)
+    # centre each column first so the cumulative sums of squares stay accurate
+    centre = np.where(valid, r, 0.0).sum(axis=0) / n_valid
+    x = np.where(valid, r - centre, 0.0)
+
+    def window_sum(a: np.ndarray) -> np.ndarray:
+        c = np.cumsum(a, axis=0)
+        c = np.vstack([np.zeros((1, a.shape[1])), c])
+        return c[window:] - c[:-window]
+
+    count = window_sum(valid.astype(float))
+    s1 = window_sum(x)
+    s2 = window_sum(x * x)
+
+    full = count == window
+    var = np.maximum(s2 - s1 ** 2 / window, 0.0) / (window - 1)
+    sigma_30 = np.where(full, np.sqrt(var) * np.sqrt(window), np.nan)
+    mu_30 = np.where(full, s1 + window * centre, np.nan)
+    return sigma_30, mu_30
+
+
+def calibrate_universe(panel: pd.DataFrame, window: int = 30, trim: float = 0.10) -> pd.DataFrame:
+    """
+    baseline_sigma_30d / baseline_mu_30d (and the latest rolling values) for
+    every ticker of a wide price panel in one vectorised pass.
+
+    Returns a tidy table with one row per ticker.
+    """
+    if len(panel) <= window:
+        raise ValueError("Price panel is shorter than the rolling window.")
+    sig, mu = rolling_panel_30d(panel, window=window)
+
+    n = np.isfinite(mu).sum(axis=0)
+    with warnings.catch_warnings():
+        # tickers without a single full window get NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        sigma_base = np.nanmedian(sig, axis=0)
+        median_mu = np.nanmedian(mu, axis=0)
+
+    # trimmed mean per column: NaNs sort to the end, then gather the
+    # cumulative sums at k and n - k
+    k = (n * trim).astype(int)
+    cs = np.vstack([np.zeros((1, mu.shape[1])), np.cumsum(np.nan_to_num(np.sort(mu, axis=0)), axis=0)])
+    cols = np.arange(mu.shape[1])
+    with np.errstate(all="ignore"):
+        trimmed = (cs[n - k, cols] - cs[k, cols]) / (n - 2 * k)
+
+    return pd.DataFrame({
+        "ticker": panel.columns.astype(str),
+        "n_rolling": n,
+        "sigma_30": sig[-1],
+        "mu_30": mu[-1],
+        "sigma_base": sigma_base,
+        # small sample fallback, as in baseline_mu_30d
+        "mu_base": np.where(n < 50, median_mu, trimmed),
+    })
+
+
+class IncrementalCalibrator:
+    """
+    Stateful version of baseline_sigma_30d / baseline_mu_30d fed one bar at a time.
+
+    Each update costs O(log n): the 30-day rolling std and sum slide in O(1)
+    and the rolling sigma_30 / mu_30 values are kept in order-statistic trees
+    for the running median and trimmed mean.
+
+    lookback is the number of price bars in the calibration sample (the
+    rolling values of older bars are evicted), like fetching period="2y"
+    every time; None keeps the whole history.
+    """
+
+    # exact re-sum of the return window every this many bars, to stop float drift
+    REFRESH_EVERY = 1_000
+
+    def __init__(self, window: int = 30, trim: float = 0.10, lookback: Optional[int] = None):
+        if lookback is not None and lookback <= window:
+            raise ValueError("lookback must be longer than the rolling window.")
+        self.window = window
+        self.trim = trim
+        self.max_values = None if lookback is None else lookback - window
+
+        self._last_price: Optional[float] = None
+        self._returns: deque = deque()
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._n_bars = 0
+
+        self._sig_values: deque = deque()
+        self._mu_values: deque = deque()
+        self._sig_tree = OrderStatisticTree()
+        self._mu_tree = OrderStatisticTree()
+
+    @classmethod
+    def from_prices(cls, prices: pd.DataFrame, **kwargs) -> "IncrementalCalibrator":
+        cal = cls(**kwargs)
+        for price in adj_close(prices).to_numpy():
+            cal.update(price)
+        return cal
+
+    def update(self, price: float) -> None:
+        """
+        Feed the next adjusted close.
+        """
+        price = float(price)
+        last, self._last_price = self._last_price, price
+        if last is None or not np.isfinite(price) or not np.isfinite(last):
+            return
+
+        x = float(np.log(price / last))
+        self._n_bars += 1
+        self._returns.append(x)
+
+        if len(self._returns) <= self.window:
+            n = len(self._returns)
+            d = x - self._mean
+            self._mean += d / n
+            self._m2 += d * (x - self._mean)
+        else:
+            y = self._returns.popleft()
+            old_mean = self._mean
+            self._mean += (x - y) / self.window
+            self._m2 += (x - y) * (x - self._mean + y - old_mean)
+
+        if self._n_bars % self.REFRESH_EVERY == 0:
+            arr = np.fromiter(self._returns, dtype=float)
+            self._mean = float(arr.mean())
+            self._m2 = float(((arr - self._mean) ** 2).sum())
+
+        if len(self._returns) == self.window:
+            self._push(self.sigma_30, self.mu_30)
+
+    def _push(self, sig: float, mu: float) -> None:
+        self._sig_values.append(sig)
+        self._mu_values.append(mu)
+        self._sig_tree.insert(sig)
+        self._mu_tree.insert(mu)
+        if self.max_values is not None and len(self._sig_values) > self.max_values:
+            self._sig_tree.remove(self._sig_values.popleft())
+            self._mu_tree.remove(self._mu_values.popleft())
+
+    @property
+    def n_values(self) -> int:
+        """
+        Rolling values currently in the calibration sample.
+        """
+        return len(self._sig_values)
+
+    @property
+    def sigma_30(self) -> float:
+        """
+        Latest rolling sigma_30 (std of the last `window` daily returns * sqrt(window)).
+        """
+        if len(self._returns) < self.window:
+            return float("nan")
+        return float(np.sqrt(max(self._m2, 0.0) / (self.window - 1)) * np.sqrt(self.window))
+
+    @property
+    def mu_30(self) -> float:
+        """
+        Latest rolling mu_30 (sum of the last `window` daily log returns).
+        """
+        if len(self._returns) < self.window:
+            return float("nan")
+        return float(self._mean * self.window)
+
+    @property
+    def sigma_base(self) -> float:
+        """
+        Median rolling sigma_30, as baseline_sigma_30d.
+        """
+        return self._sig_tree.median()
+
+    @property
+    def mu_base(self) -> float:
+        """
+        Trimmed mean of rolling mu_30 (median below 50 values), as baseline_mu_30d.
+        """
+        if len(self._mu_tree) < 50:
+            # small sample fallback
+            return self._mu_tree.median()
+        return self._mu_tree.trimmed_mean(self.trim)
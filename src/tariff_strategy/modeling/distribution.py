@@ -1,10 +1,119 @@
 from __future__ import annotations
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Union
 import numpy as np
 import pandas as pd
 
 from .mapping import params_from_calibration
 
 
+@dataclass(frozen=True)
+class TerminalSample:
+    scenarios: pd.DataFrame  # scenario table; codes index its rows
+    codes: np.ndarray        # scenario row per path (small integer dtype)
+    log_return: np.ndarray   # 30-day log return per path
+    S_T: np.ndarray          # terminal price per path
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Per-path DataFrame view: scenario columns, log_return and S_T.
+        """
+        out = pd.DataFrame({c: self.scenarios[c].to_numpy()[self.codes] for c in self.scenarios.columns})
+        out["log_return"] = self.log_return
+        out["S_T"] = self.S_T
+        return out
+
+
+def scenario_params(
+    scenarios: pd.DataFrame,
+    mu_base: float,
+    sigma_base: float,
+    sigma_mult: Optional[Dict[int, float]] = None,
+    mu_penalty: Optional[Dict[int, float]] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Per-scenario (mu, sigma) arrays aligned with the rows of the scenario table.
+    """
+    params = [
+        params_from_calibration(
+            int(sev), mu_base=mu_base, sigma_base=sigma_base, sigma_mult=sigma_mult, mu_penalty=mu_penalty
+        )
+        for sev in scenarios["severity"].to_numpy()
+    ]
+    mu = np.array([p.mu for p in params], dtype=float)
+    sigma = np.array([p.sigma for p in params], dtype=float)
+    return mu, sigma
+
+
+def mixture_streams(seed: Union[int, np.random.SeedSequence]) -> tuple[np.random.Generator, np.random.Generator]:
+    """
+    Two independent generators spawned from one SeedSequence: the first
+    draws scenario uniforms, the second the return normals. Each stream can
+    then be consumed in chunks and still match a single batch draw.
+    """
+    ss = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    # children 0 and 1 of ss, built directly so the caller's sequence is not advanced
+    children = [
+        np.random.SeedSequence(ss.entropy, spawn_key=ss.spawn_key + (k,), pool_size=ss.pool_size) for k in range(2)
+    ]
+    return np.random.default_rng(children[0]), np.random.default_rng(children[1])
+
+
+def scenario_codes(rng: np.random.Generator, probs: np.ndarray, n: int) -> np.ndarray:
+    """
+    n scenario codes drawn by inverting the scenario CDF at n uniforms.
+    """
+    cdf = np.cumsum(probs, dtype=float)
+    cdf /= cdf[-1]
+    return cdf.searchsorted(rng.random(n), side="right").astype(np.min_scalar_type(len(probs) - 1))
+
+
+def sample_terminal_prices(
+    s0: float,
+    scenarios: pd.DataFrame,
+    mu_base: float,
+    sigma_base: float,
+    n_sims: int = 50_000,
+    seed: Union[int, np.random.SeedSequence] = 42,
+    ordering: str = "path",
+) -> TerminalSample:
+    """
+    Vectorised mixture sampler behind simulate_terminal_prices.
+
+    Scenario mu/sigma are looked up once, scenarios are drawn as integer codes
+    and all returns come from one standard-normal draw.
+
+    ordering decides how the draws are made:
+    - "path": codes and normals come from the two mixture_streams, normals
+      in path order; iter_terminal_prices reproduces this chunk by chunk
+      for any chunk size
+    - "severity": one generator, normals grouped by severity (path order
+      within a group), which reproduces the per-severity draws of the
+      original loop exactly
+    """
+    if ordering not in ("severity", "path"):
+        raise ValueError(f"Unknown ordering: {ordering}")
+
+    probs = scenarios["p"].to_numpy(dtype=float)
+    mu, sigma = scenario_params(scenarios, mu_base=mu_base, sigma_base=sigma_base)
+
+    if ordering == "path":
+        rng_u, rng_z = mixture_streams(seed)
+        codes = scenario_codes(rng_u, probs, n_sims)
+        r = mu[codes] + sigma[codes] * rng_z.standard_normal(n_sims)
+    else:
+        rng = np.random.default_rng(seed)
+        codes = rng.choice(len(scenarios), size=n_sims, p=probs).astype(np.min_scalar_type(len(scenarios) - 1))
+        z = rng.standard_normal(n_sims)
+        severity = scenarios["severity"].to_numpy()
+        order = np.argsort(severity[codes], kind="stable")
+        c = codes[order]
+        r = np.empty(n_sims, dtype=float)
+        r[order] = mu[c] + sigma[c] * z
+
+    return TerminalSample(scenarios=scenarios.reset_index(drop=True), codes=codes, log_return=r, S_T=s0 * np.exp(r))
+
+
 def simulate_terminal_prices(
     s0: float,
     scenarios: pd.DataFrame,
@@ -16,24 +125,102 @@ def simulate_terminal_prices(
     """
     Simulate 30-day terminal prices via a mixture of lognormal returns
     using calibrated baseline mu and sigma.
+    Path ordering, so iter_terminal_prices streams the same paths.
+    """
+    return sample_terminal_prices(
+        s0=s0,
+        scenarios=scenarios,
+        mu_base=mu_base,
+        sigma_base=sigma_base,
+        n_sims=n_sims,
+        seed=seed,
+    ).to_frame()
+
+
+@dataclass(frozen=True)
+class MCEstimate:
+    estimate: float  # Monte Carlo estimate of E[payoff(S_T)]
+    stderr: float    # standard error of the estimate
+    n_paths: int     # simulated terminal prices used
+
+    def paths_for(self, target_stderr: float) -> int:
+        """
+        Paths needed (same settings) to bring the standard error down to target_stderr.
+        """
+        return int(np.ceil(self.n_paths * (self.stderr / target_stderr) ** 2))
+
+
+def _stratum_sizes(probs: np.ndarray, n: int) -> np.ndarray:
+    """
+    Proportional allocation of n paths to scenarios (largest remainder, >= 2 each).
+    """
+    raw = probs * n
+    sizes = np.floor(raw).astype(int)
+    sizes[np.argsort(sizes - raw)[: n - sizes.sum()]] += 1
+    return np.maximum(sizes, 2)
+
+
+def estimate_expectation(
+    payoff: Callable[[np.ndarray], np.ndarray],
+    s0: float,
+    scenarios: pd.DataFrame,
+    mu_base: float,
+    sigma_base: float,
+    n_sims: int = 50_000,
+    seed: int = 42,
+    antithetic: bool = False,
+    stratified: bool = False,
+    control_variate: bool = False,
+) -> MCEstimate:
+    """
+    E[payoff(S_T)] under the scenario mixture, with optional variance reduction.
+
+    - antithetic: every normal z is paired with -z (same scenario); the pair
+      average is the sampling unit
+    - stratified: each scenario gets p_j * n_sims paths instead of a
+      multinomial draw and the strata means are weighted by the exact p_j
+    - control_variate: uses S_T - s0 * exp(mu_j + sigma_j^2 / 2), whose mean
+      is known to be 0, with the optimal coefficient fitted per stratum
+
+    payoff maps an array of S_T to an array of values, e.g.
+    lambda S: put_spread_payoff_dollars(S, 385.0, 350.0, 577.0).
     """
     rng = np.random.default_rng(seed)
 
-    probs = scenarios["p"].to_numpy()
-    idx = rng.choice(len(scenarios), size=n_sims, p=probs)
+    probs = scenarios["p"].to_numpy(dtype=float)
+    mu, sigma = scenario_params(scenarios, mu_base=mu_base, sigma_base=sigma_base)
+    cond_mean = s0 * np.exp(mu + 0.5 * sigma ** 2)
+
+    # sampling units: single paths, or antithetic pairs (two paths each)
+    n_units = (n_sims + 1) // 2 if antithetic else n_sims
+
+    if stratified:
+        codes = np.repeat(np.arange(len(scenarios)), _stratum_sizes(probs, n_units))
+    else:
+        codes = rng.choice(len(scenarios), size=n_units, p=probs)
+
+    z = rng.standard_normal(len(codes))
+    z = np.stack([z, -z]) if antithetic else z[None, :]  # (paths per unit, n_units)
 
-    chosen = scenarios.iloc[idx].reset_index(drop=True)
-    severities = chosen["severity"].to_numpy()
+    st = s0 * np.exp(mu[codes] + sigma[codes] * z)
+    y = np.asarray(payoff(st.ravel()), dtype=float).reshape(st.shape).mean(axis=0)
+    c = (st - cond_mean[codes]).mean(axis=0)
+    n_paths = st.size
 
-    r = np.empty(n_sims, dtype=float)
-    for sev in np.unique(severities):
-        mask = severities == sev
-        params = params_from_calibration(int(sev), mu_base=mu_base, sigma_base=sigma_base)
-        r[mask] = rng.normal(loc=params.mu, scale=params.sigma, size=mask.sum())
+    groups = [np.flatnonzero(codes == j) for j in range(len(scenarios))] if stratified else [np.arange(len(codes))]
+    weights = probs if stratified else np.ones(1)
 
-    st = s0 * np.exp(r)
+    est = 0.0
+    var = 0.0
+    for w, idx in zip(weights, groups):
+        yg = y[idx]
+        if control_variate and len(idx) > 2:
+            cg = c[idx]
+            var_c = cg.var(ddof=1)
+            if var_c > 0:
+                beta = np.cov(yg, cg, ddof=1)[0, 1] / var_c
+                yg = yg - beta * cg
+        est += w * yg.mean()
+        var += w ** 2 * yg.var(ddof=1) / len(idx)
 
-    out = chosen.copy()
-    out["log_return"] = r
-    out["S_T"] = st
-    return out
+    return MCEstimate(estimate=float(est), stderr=float(np.sqrt(var)), n_paths=int(n_paths))
@@ -1,5 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from typing import Dict, Optional
 
 
 @dataclass(frozen=True)
@@ -8,23 +9,35 @@ class ScenarioParams:
     sigma: float  # volatility of log-return over 30 days
 
 
-def params_from_calibration(severity: int, mu_base: float, sigma_base: float) -> ScenarioParams:
+# sigma increases with severity (uncertainty / event risk)
+SIGMA_MULT = {0: 1.00, 1: 1.20, 2: 1.60, 3: 2.10}
+
+# drift penalties in log-return space over 30 days
+MU_PENALTY = {0: 0.00, 1: -0.01, 2: -0.04, 3: -0.07}
+
+
+def params_from_calibration(
+    severity: int,
+    mu_base: float,
+    sigma_base: float,
+    sigma_mult: Optional[Dict[int, float]] = None,
+    mu_penalty: Optional[Dict[int, float]] = None,
+) -> ScenarioParams:
     """
     Scenario parameters using calibrated baseline mu and sigma.
 
     - sigma increases with severity (uncertainty / event risk)
     - mu is baseline drift plus a severity penalty (tariffs are expected to hurt)
-    """
-    sigma_mult = {0: 1.00, 1: 1.20, 2: 1.60, 3: 2.10}
 
-    # drift penalties in log-return space over 30 days
-    mu_penalty = {0: 0.00, 1: -0.01, 2: -0.04, 3: -0.07}
+    sigma_mult / mu_penalty override the default SIGMA_MULT / MU_PENALTY tables.
+    """
+    sigma_mult = SIGMA_MULT if sigma_mult is None else sigma_mult
+    mu_penalty = MU_PENALTY if mu_penalty is None else mu_penalty
 
-    if severity not in sigma_mult:
+    if severity not in sigma_mult or severity not in mu_penalty:
         raise ValueError(f"Unknown severity: {severity}")
 
     mu = mu_base + mu_penalty[severity]
     sigma = sigma_base * sigma_mult[severity]
 
     return ScenarioParams(mu=mu, sigma=sigma)
-
@@ -0,0 +1,235 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .distribution import scenario_params
+from .parallel import run_blocks
+
+
+def return_correlation(panel: pd.DataFrame, shrinkage: float = 0.0) -> pd.DataFrame:
+    """
+    Correlation of daily log returns for every ticker of a wide price panel
+    (price_panel output).
+
+    Each pair uses the dates on which both tickers have a return, from one
+    masked matrix product. shrinkage pulls the matrix towards the identity
+    (useful with hundreds of names and short histories).
+    """
+    P = panel.to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = np.diff(np.log(P), axis=0)
+
+    valid = np.isfinite(r).astype(float)
+    x = np.where(valid > 0, r, 0.0)
+    n = valid.T @ valid
+    if (n < 2).any():
+        raise ValueError("Every pair of tickers needs at least two common returns.")
+
+    # pairwise means, co-moments and variances over the common dates
+    s = x.T @ valid                  # s[i, j] = sum of r_i where r_j exists
+    cross = x.T @ x
+    sq = (x ** 2).T @ valid
+    cov = cross - s * s.T / n
+    var_i = sq - s ** 2 / n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = cov / np.sqrt(var_i * var_i.T)
+    corr = np.nan_to_num(corr)
+    np.fill_diagonal(corr, 1.0)
+
+    if shrinkage:
+        corr = (1.0 - shrinkage) * corr + shrinkage * np.eye(len(corr))
+    tickers = panel.columns.astype(str)
+    return pd.DataFrame(corr, index=tickers, columns=tickers)
+
+
+def correlation_factor(corr, floor: float = 1e-8) -> np.ndarray:
+    """
+    Lower Cholesky factor L of a correlation matrix (L @ L.T = corr).
+
+    Pairwise estimates need not be positive definite; then the eigenvalues
+    are floored and the result rescaled to a unit diagonal first.
+    """
+    C = np.asarray(corr, dtype=float)
+    try:
+        return np.linalg.cholesky(C)
+    except np.linalg.LinAlgError:
+        vals, vecs = np.linalg.eigh(C)
+        C = (vecs * np.maximum(vals, floor)) @ vecs.T
+        d = np.sqrt(np.diag(C))
+        return np.linalg.cholesky(C / np.outer(d, d))
+
+
+@dataclass(frozen=True)
+class PortfolioSample:
+    codes: np.ndarray          # scenario row per path (shared by every asset)
+    portfolio_pnl: np.ndarray  # $ P&L of the stock holdings per path
+    hedge_pnl: np.ndarray      # $ P&L of the hedge per path
+    hedge_S_T: np.ndarray      # terminal price of the hedge underlying
+
+    @property
+    def total_pnl(self) -> np.ndarray:
+        return self.portfolio_pnl + self.hedge_pnl
+
+    def hedge_ratio(self) -> float:
+        """
+        Number of hedges that minimises the variance of the hedged book.
+        """
+        c = np.cov(self.portfolio_pnl, self.hedge_pnl)
+        return float(-c[0, 1] / c[1, 1]) if c[1, 1] > 0 else 0.0
+
+    def summary(self, alpha: float = 0.05, hedges: float = 1.0) -> pd.DataFrame:
+        """
+        EV, std, P(loss), VaR and CVaR at alpha for the holdings alone, the
+        hedge alone and the book with `hedges` hedges on.
+        """
+        rows = {}
+        for name, pnl in (
+            ("portfolio", self.portfolio_pnl),
+            ("hedge", hedges * self.hedge_pnl),
+            ("hedged", self.portfolio_pnl + hedges * self.hedge_pnl),
+        ):
+            var = np.quantile(pnl, alpha)
+            rows[name] = {
+                "ev_$": pnl.mean(),
+                "std_$": pnl.std(),
+                "p_loss": np.mean(pnl < 0),
+                f"var{alpha:g}_$": var,
+                f"cvar{alpha:g}_$": pnl[pnl <= var].mean(),
+            }
+        return pd.DataFrame(rows).T
+
+
+def asset_scenario_params(
+    scenarios: pd.DataFrame,
+    mu_base: np.ndarray,
+    sigma_base: np.ndarray,
+    tariff_beta: Optional[np.ndarray] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (n_scenarios, n_assets) mu and sigma: every asset keeps its own baseline,
+    scaled by the scenario's SIGMA_MULT, and takes tariff_beta times the
+    scenario's MU_PENALTY (beta 1 by default, i.e. the single-asset mapping).
+    """
+    penalty, mult = scenario_params(scenarios, mu_base=0.0, sigma_base=1.0)
+    mu_base = np.asarray(mu_base, dtype=float)
+    beta = np.ones_like(mu_base) if tariff_beta is None else np.asarray(tariff_beta, dtype=float)
+    mu = mu_base[None, :] + penalty[:, None] * beta[None, :]
+    sigma = mult[:, None] * np.asarray(sigma_base, dtype=float)[None, :]
+    return mu, sigma
+
+
+def portfolio_block(
+    n: int,
+    seed_seq: np.random.SeedSequence,
+    s0: np.ndarray,
+    probs: np.ndarray,
+    mu: np.ndarray,
+    sigma: np.ndarray,
+    chol: np.ndarray,
+    shares: np.ndarray,
+    hedge_index: int,
+    hedge_payoff: Callable[[np.ndarray], np.ndarray],
+    chunk_size: int,
+    dtype: type,
+) -> PortfolioSample:
+    """
+    One block of paths for run_blocks.
+
+    Paths are generated chunk_size at a time: an (m, n_assets) normal draw
+    times L.T gives the correlated shocks, the scenario's mu / sigma rows are
+    gathered per path, and the holdings P&L is one matrix-vector product.
+    """
+    rng = np.random.default_rng(seed_seq)
+    code_dtype = np.min_scalar_type(len(probs) - 1)
+    codes = rng.choice(len(probs), size=n, p=probs).astype(code_dtype)
+
+    Lt = chol.T.astype(dtype)
+    mu, sigma = mu.astype(dtype), sigma.astype(dtype)
+    dollars = (s0 * shares).astype(dtype)  # P&L per unit of exp(r) - 1
+
+    port = np.empty(n)
+    hedge_S = np.empty(n)
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        c = codes[start:stop]
+        z = rng.standard_normal((stop - start, len(s0)), dtype=dtype) @ Lt
+        r = mu[c] + sigma[c] * z
+        port[start:stop] = np.expm1(r) @ dollars
+        hedge_S[start:stop] = s0[hedge_index] * np.exp(r[:, hedge_index].astype(float))
+
+    return PortfolioSample(
+        codes=codes,
+        portfolio_pnl=port,
+        hedge_pnl=np.asarray(hedge_payoff(hedge_S), dtype=float),
+        hedge_S_T=hedge_S,
+    )
+
+
+def simulate_portfolio(
+    s0: np.ndarray,
+    scenarios: pd.DataFrame,
+    mu_base: np.ndarray,
+    sigma_base: np.ndarray,
+    corr,
+    shares: np.ndarray,
+    hedge_index: int,
+    hedge_payoff: Callable[[np.ndarray], np.ndarray],
+    tariff_beta: Optional[np.ndarray] = None,
+    n_sims: int = 50_000,
+    seed: int = 42,
+    block_size: int = 1_000_000,
+    chunk_size: int = 65_536,
+    n_workers: Optional[int] = 1,
+    dtype: type = np.float64,
+) -> PortfolioSample:
+    """
+    Joint 30-day simulation of a stock book and its hedge.
+
+    - one tariff scenario per path, shared by every asset
+    - asset i's log return is mu[j, i] + sigma[j, i] * (L z)_i with L the
+      Cholesky factor of corr (e.g. return_correlation of the universe)
+    - portfolio_pnl = sum_i shares_i * (S_T_i - s0_i); the hedge is written
+      on asset hedge_index (e.g. SMH) and hedge_payoff maps its S_T to the
+      hedge's $ P&L per path, e.g.
+      lambda S: put_spread_payoff_dollars(S, 385.0, 350.0, 577.0)
+
+    s0, mu_base, sigma_base, shares and tariff_beta are per asset, in the
+    order of corr (calibrate_universe gives mu_base / sigma_base). Blocks go
+    through run_blocks, so results depend on (n_sims, seed, block_size) and
+    not on n_workers; with n_workers > 1 hedge_payoff must be picklable
+    (a functools.partial, not a lambda). chunk_size bounds the normal draws
+    at chunk_size * n_assets numbers, dtype=np.float32 halves that.
+    """
+    s0 = np.asarray(s0, dtype=float)
+    shares = np.asarray(shares, dtype=float)
+    chol = correlation_factor(corr)
+    if chol.shape[0] != len(s0) or len(shares) != len(s0):
+        raise ValueError("s0, shares and corr must cover the same assets.")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive.")
+
+    mu, sigma = asset_scenario_params(scenarios, mu_base, sigma_base, tariff_beta=tariff_beta)
+    fn = partial(
+        portfolio_block,
+        s0=s0,
+        probs=scenarios["p"].to_numpy(dtype=float),
+        mu=mu,
+        sigma=sigma,
+        chol=chol,
+        shares=shares,
+        hedge_index=hedge_index,
+        hedge_payoff=hedge_payoff,
+        chunk_size=chunk_size,
+        dtype=dtype,
+    )
+    blocks = run_blocks(fn, n_sims=n_sims, seed=seed, block_size=block_size, n_workers=n_workers)
+    return PortfolioSample(
+        codes=np.concatenate([b.codes for b in blocks]),
+        portfolio_pnl=np.concatenate([b.portfolio_pnl for b in blocks]),
+        hedge_pnl=np.concatenate([b.hedge_pnl for b in blocks]),
+        hedge_S_T=np.concatenate([b.hedge_S_T for b in blocks]),
+    )
@@ -0,0 +1,143 @@
+from __future__ import annotations
+import random
+from typing import Optional
+
+
+class _Node:
+    __slots__ = ("key", "prio", "left", "right", "size", "total")
+
+    def __init__(self, key: float, prio: float):
+        self.key = key
+        self.prio = prio
+        self.left: Optional[_Node] = None
+        self.right: Optional[_Node] = None
+        self.size = 1
+        self.total = key
+
+
+def _size(node: Optional[_Node]) -> int:
+    return node.size if node is not None else 0
+
+
+def _total(node: Optional[_Node]) -> float:
+    return node.total if node is not None else 0.0
+
+
+def _pull(node: _Node) -> _Node:
+    # sums are rebuilt from the children, so inserts/removes never accumulate drift
+    node.size = 1 + _size(node.left) + _size(node.right)
+    node.total = node.key + _total(node.left) + _total(node.right)
+    return node
+
+
+def _split(node: Optional[_Node], key: float, inclusive: bool):
+    """
+    Split into (keys < key, keys >= key), or (keys <= key, keys > key) if inclusive.
+    """
+    if node is None:
+        return None, None
+    goes_left = node.key <= key if inclusive else node.key < key
+    if goes_left:
+        left, right = _split(node.right, key, inclusive)
+        node.right = left
+        return _pull(node), right
+    left, right = _split(node.left, key, inclusive)
+    node.left = right
+    return left, _pull(node)
+
+
+def _merge(a: Optional[_Node], b: Optional[_Node]) -> Optional[_Node]:
+    # every key in a is <= every key in b
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.prio > b.prio:
+        a.right = _merge(a.right, b)
+        return _pull(a)
+    b.left = _merge(a, b.left)
+    return _pull(b)
+
+
+class OrderStatisticTree:
+    """
+    Multiset of floats (treap) with O(log n) expected insert, remove, k-th
+    smallest and sum of the k smallest values, enough for running medians and
+    trimmed means over a sliding sample.
+    """
+
+    def __init__(self, seed: int = 0):
+        self._root: Optional[_Node] = None
+        self._rng = random.Random(seed)
+
+    def __len__(self) -> int:
+        return _size(self._root)
+
+    def insert(self, x: float) -> None:
+        x = float(x)
+        left, right = _split(self._root, x, inclusive=False)
+        self._root = _merge(_merge(left, _Node(x, self._rng.random())), right)
+
+    def remove(self, x: float) -> None:
+        """
+        Remove one occurrence of x (KeyError if absent).
+        """
+        x = float(x)
+        left, rest = _split(self._root, x, inclusive=False)
+        equal, right = _split(rest, x, inclusive=True)
+        if equal is None:
+            self._root = _merge(left, right)
+            raise KeyError(x)
+        equal = _merge(equal.left, equal.right)
+        self._root = _merge(_merge(left, equal), right)
+
+    def kth(self, k: int) -> float:
+        """
+        k-th smallest value, 0-based.
+        """
+        if not 0 <= k < len(self):
+            raise IndexError(k)
+        node = self._root
+        while True:
+            n_left = _size(node.left)
+            if k < n_left:
+                node = node.left
+            elif k == n_left:
+                return node.key
+            else:
+                k -= n_left + 1
+                node = node.right
+
+    def sum_smallest(self, k: int) -> float:
+        """
+        Sum of the k smallest values.
+        """
+        k = max(0, min(k, len(self)))
+        node, acc = self._root, 0.0
+        while node is not None and k > 0:
+            n_left = _size(node.left)
+            if k <= n_left:
+                node = node.left
+            else:
+                acc += _total(node.left) + node.key
+                k -= n_left + 1
+                node = node.right
+        return acc
+
+    def median(self) -> float:
+        n = len(self)
+        if n == 0:
+            return float("nan")
+        if n % 2:
+            return self.kth(n // 2)
+        return 0.5 * (self.kth(n // 2 - 1) + self.kth(n // 2))
+
+    def trimmed_mean(self, trim: float) -> float:
+        """
+        Mean after dropping int(n * trim) values at each end.
+        """
+        n = len(self)
+        k = int(n * trim)
+        if n - 2 * k <= 0:
+            return float("nan")
+        return (self.sum_smallest(n - k) - self.sum_smallest(k)) / (n - 2 * k)
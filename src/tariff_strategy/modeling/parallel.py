@@ -0,0 +1,97 @@
+from __future__ import annotations
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, List, Optional, TypeVar
+
+import numpy as np
+import pandas as pd
+
+from .distribution import TerminalSample, sample_terminal_prices
+
+T = TypeVar("T")
+
+
+def block_sizes(n_sims: int, block_size: int) -> List[int]:
+    """
+    Split n_sims into fixed-size blocks (the last one may be shorter).
+    """
+    if n_sims <= 0:
+        raise ValueError("n_sims must be positive.")
+    if block_size <= 0:
+        raise ValueError("block_size must be positive.")
+    full, rest = divmod(n_sims, block_size)
+    return [block_size] * full + ([rest] if rest else [])
+
+
+def run_blocks(
+    fn: Callable[[int, np.random.SeedSequence], T],
+    n_sims: int,
+    seed: int = 42,
+    block_size: int = 1_000_000,
+    n_workers: Optional[int] = None,
+) -> List[T]:
+    """
+    Run fn(n_paths, seed_seq) for every block of work, in a process pool.
+
+    Block b always gets SeedSequence(seed).spawn(n_blocks)[b] and results come
+    back in block order, so the output depends on (n_sims, seed, block_size)
+    only and never on n_workers. fn must be picklable (a module-level
+    function or a functools.partial of one). n_workers=1 runs in-process;
+    None uses every available core.
+    """
+    sizes = block_sizes(n_sims, block_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    n_workers = n_workers or os.cpu_count() or 1
+
+    if n_workers == 1 or len(sizes) == 1:
+        return [fn(n, ss) for n, ss in zip(sizes, seeds)]
+
+    with ProcessPoolExecutor(max_workers=min(n_workers, len(sizes))) as pool:
+        return list(pool.map(fn, sizes, seeds))
+
+
+def sample_block(
+    n: int,
+    seed_seq: np.random.SeedSequence,
+    s0: float,
+    scenarios: pd.DataFrame,
+    mu_base: float,
+    sigma_base: float,
+) -> TerminalSample:
+    """
+    One block of paths for run_blocks (path ordering, block-specific seed stream).
+    """
+    return sample_terminal_prices(
+        s0=s0,
+        scenarios=scenarios,
+        mu_base=mu_base,
+        sigma_base=sigma_base,
+        n_sims=n,
+        seed=seed_seq,
+        ordering="path",
+    )
+
+
+def sample_terminal_prices_parallel(
+    s0: float,
+    scenarios: pd.DataFrame,
+    mu_base: float,
+    sigma_base: float,
+    n_sims: int = 50_000,
+    seed: int = 42,
+    block_size: int = 1_000_000,
+    n_workers: Optional[int] = None,
+) -> TerminalSample:
+    """
+    Multi-process sample_terminal_prices: independent SeedSequence streams per
+    block, concatenated in block order (identical for any n_workers).
+    """
+    fn = partial(sample_block, s0=s0, scenarios=scenarios, mu_base=mu_base, sigma_base=sigma_base)
+    blocks = run_blocks(fn, n_sims=n_sims, seed=seed, block_size=block_size, n_workers=n_workers)
+    return TerminalSample(
+        scenarios=blocks[0].scenarios,
+        codes=np.concatenate([b.codes for b in blocks]),
+        log_return=np.concatenate([b.log_return for b in blocks]),
+        S_T=np.concatenate([b.S_T for b in blocks]),
+    )
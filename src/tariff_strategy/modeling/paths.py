@@ -0,0 +1,133 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from .distribution import TerminalSample, scenario_params
+from .parallel import block_sizes
+
+
+@dataclass(frozen=True)
+class PricePaths:
+    """
+    Daily log-price paths under the scenario mixture.
+
+    log_S is time-major, (n_steps + 1, n_paths) with row 0 = 0, so each step
+    is one contiguous row; float32 keeps 1M paths x 30 steps at ~124 MB.
+    """
+    s0: float
+    scenarios: pd.DataFrame  # scenario table; codes index its rows
+    codes: np.ndarray        # scenario row per path
+    log_S: np.ndarray        # log(S_t / s0)
+
+    @property
+    def n_steps(self) -> int:
+        return self.log_S.shape[0] - 1
+
+    @property
+    def n_paths(self) -> int:
+        return self.log_S.shape[1]
+
+    def prices(self, step: int, rows=slice(None)) -> np.ndarray:
+        """
+        S at a step (float64), optionally for a subset of paths.
+        """
+        return self.s0 * np.exp(self.log_S[step, rows].astype(float))
+
+    @property
+    def S_T(self) -> np.ndarray:
+        return self.prices(self.n_steps)
+
+    def terminal_sample(self) -> TerminalSample:
+        log_return = self.log_S[-1].astype(float)
+        return TerminalSample(scenarios=self.scenarios, codes=self.codes, log_return=log_return, S_T=self.S_T)
+
+
+def _fill_paths(
+    out: np.ndarray,
+    codes_out: np.ndarray,
+    seed_seq: np.random.SeedSequence,
+    probs: np.ndarray,
+    drift: np.ndarray,
+    vol: np.ndarray,
+) -> None:
+    # one block: scenario per path, then one normal row per step
+    rng = np.random.default_rng(seed_seq)
+    m = out.shape[1]
+    codes = rng.choice(len(probs), size=m, p=probs)
+    codes_out[:] = codes
+    d = drift[codes].astype(out.dtype)
+    v = vol[codes].astype(out.dtype)
+    out[0] = 0
+    for t in range(1, out.shape[0]):
+        np.add(out[t - 1], d, out=out[t])
+        out[t] += v * rng.standard_normal(m, dtype=out.dtype)
+
+
+def _step_params(scenarios: pd.DataFrame, mu_base: float, sigma_base: float, n_steps: int):
+    mu, sigma = scenario_params(scenarios, mu_base=mu_base, sigma_base=sigma_base)
+    return mu / n_steps, sigma / np.sqrt(n_steps)
+
+
+def iter_paths(
+    s0: float,
+    scenarios: pd.DataFrame,
+    mu_base: float,
+    sigma_base: float,
+    n_paths: int = 50_000,
+    n_steps: int = 30,
+    seed: int = 42,
+    block_size: int = 250_000,
+    dtype: type = np.float32,
+) -> Iterator[PricePaths]:
+    """
+    simulate_paths one block at a time, for path counts that should not be
+    held in memory at once. Concatenating the blocks gives simulate_paths
+    with the same (n_paths, seed, block_size).
+    """
+    drift, vol = _step_params(scenarios, mu_base, sigma_base, n_steps)
+    probs = scenarios["p"].to_numpy(dtype=float)
+    scen = scenarios.reset_index(drop=True)
+    code_dtype = np.min_scalar_type(len(scenarios) - 1)
+
+    sizes = block_sizes(n_paths, block_size)
+    for m, ss in zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))):
+        log_S = np.empty((n_steps + 1, m), dtype=dtype)
+        codes = np.empty(m, dtype=code_dtype)
+        _fill_paths(log_S, codes, ss, probs, drift, vol)
+        yield PricePaths(s0=float(s0), scenarios=scen, codes=codes, log_S=log_S)
+
+
+def simulate_paths(
+    s0: float,
+    scenarios: pd.DataFrame,
+    mu_base: float,
+    sigma_base: float,
+    n_paths: int = 50_000,
+    n_steps: int = 30,
+    seed: int = 42,
+    block_size: int = 250_000,
+    dtype: type = np.float32,
+) -> PricePaths:
+    """
+    Daily-step version of sample_terminal_prices.
+
+    Each path draws one tariff scenario and walks n_steps Gaussian steps
+    with drift mu_j / n_steps and vol sigma_j / sqrt(n_steps), so S_T has
+    exactly the terminal mixture law while early exits can be studied along
+    the way. Blocks have their own SeedSequence streams (as in run_blocks)
+    and are written straight into one preallocated array.
+    """
+    drift, vol = _step_params(scenarios, mu_base, sigma_base, n_steps)
+    probs = scenarios["p"].to_numpy(dtype=float)
+
+    log_S = np.empty((n_steps + 1, n_paths), dtype=dtype)
+    codes = np.empty(n_paths, dtype=np.min_scalar_type(len(scenarios) - 1))
+    sizes = block_sizes(n_paths, block_size)
+    start = 0
+    for m, ss in zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))):
+        _fill_paths(log_S[:, start:start + m], codes[start:start + m], ss, probs, drift, vol)
+        start += m
+    return PricePaths(s0=float(s0), scenarios=scenarios.reset_index(drop=True), codes=codes, log_S=log_S)
@@ -0,0 +1,307 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, Union
+
+import numpy as np
+import pandas as pd
+from scipy.special import stdtr
+from scipy.stats import poisson
+
+from .analytic import LognormalMixture
+from .distribution import TerminalSample, mixture_streams, scenario_codes, scenario_params
+
+
+class _Expectations:
+    """
+    moment / put / call expectations from partial_moment, for the mixtures
+    below (same methods as LognormalMixture).
+    """
+
+    def moment(self, n: int):
+        m = self.partial_moment(n, 0.0, np.inf)
+        return float(m) if np.ndim(m) == 0 else m
+
+    def put_expectation(self, K) -> np.ndarray:
+        K = np.asarray(K, dtype=float)
+        return K * self.partial_moment(0, 0.0, K) - self.partial_moment(1, 0.0, K)
+
+    def call_expectation(self, K) -> np.ndarray:
+        K = np.asarray(K, dtype=float)
+        return self.partial_moment(1, K, np.inf) - K * self.partial_moment(0, K, np.inf)
+
+
+@dataclass(frozen=True)
+class AtomMixture(_Expectations):
+    """
+    S_T = s0 * exp(R) with R on a finite set of atoms (sorted log returns).
+
+    Partial moments are differences of cumulative sums of w * exp(n R) found
+    by binary search, so every query is O(log n_atoms) and exact for the
+    atoms. mu / sigma are the per-scenario mean and std of R (used to
+    bracket the law, e.g. by adaptive_price_grid).
+    """
+    s0: float
+    atoms: np.ndarray    # sorted log returns
+    weights: np.ndarray  # probabilities, summing to 1
+    mu: np.ndarray
+    sigma: np.ndarray
+    _cum: Dict[int, np.ndarray] = field(default_factory=dict, repr=False, compare=False)
+
+    def _cumulative(self, n: int) -> np.ndarray:
+        if n not in self._cum:
+            # scaled by the largest term so exp(n R) cannot overflow
+            e = n * self.atoms
+            top = e.max()
+            c = np.cumsum(self.weights * np.exp(e - top))
+            self._cum[n] = np.concatenate([[0.0], c]) * np.exp(top) * self.s0 ** n
+        return self._cum[n]
+
+    def _log(self, x) -> np.ndarray:
+        x = np.asarray(x, dtype=float)
+        with np.errstate(divide="ignore"):
+            return np.log(x / self.s0)
+
+    def cdf(self, x) -> np.ndarray:
+        return self._cumulative(0)[np.searchsorted(self.atoms, self._log(x), side="right")]
+
+    def partial_moment(self, n: int, lo, hi) -> np.ndarray:
+        """
+        E[S_T^n 1{lo < S_T < hi}], broadcasting over lo/hi (0 and np.inf allowed).
+        """
+        c = self._cumulative(n)
+        a = np.searchsorted(self.atoms, self._log(lo), side="right")
+        b = np.searchsorted(self.atoms, self._log(hi), side="left")
+        return np.where(b > a, c[b] - c[np.minimum(a, b)], 0.0)
+
+
+@dataclass(frozen=True)
+class MixtureSum(_Expectations):
+    """
+    Sum of mixtures whose probabilities already add up to 1 together, e.g.
+    scenarios that follow different return laws.
+    """
+    parts: tuple
+
+    @property
+    def s0(self) -> float:
+        return self.parts[0].s0
+
+    @property
+    def mu(self) -> np.ndarray:
+        return np.concatenate([np.ravel(m.mu) for m in self.parts])
+
+    @property
+    def sigma(self) -> np.ndarray:
+        return np.concatenate([np.ravel(m.sigma) for m in self.parts])
+
+    def cdf(self, x) -> np.ndarray:
+        return sum(m.cdf(x) for m in self.parts)
+
+    def partial_moment(self, n: int, lo, hi) -> np.ndarray:
+        return sum(m.partial_moment(n, lo, hi) for m in self.parts)
+
+
+def _location_scale_atoms(
+    s0: float,
+    p: np.ndarray,
+    mu: np.ndarray,
+    sigma: np.ndarray,
+    eps: np.ndarray,
+    mass: np.ndarray,
+) -> AtomMixture:
+    # scenario j puts mass p_j * mass_i on mu_j + sigma_j * eps_i
+    r = (mu[:, None] + sigma[:, None] * eps[None, :]).ravel()
+    w = (p[:, None] * mass[None, :]).ravel()
+    order = np.argsort(r, kind="stable")
+    return AtomMixture(s0=float(s0), atoms=r[order], weights=w[order], mu=mu, sigma=sigma)
+
+
+@dataclass(frozen=True)
+class GaussianLaw:
+    """
+    R ~ N(mu, sigma^2): the model behind sample_terminal_prices.
+    """
+
+    def sample(self, rng: np.random.Generator, mu: np.ndarray, sigma: np.ndarray) -> np.ndarray:
+        return mu + sigma * rng.standard_normal(len(mu))
+
+    def mixture(self, s0: float, p: np.ndarray, mu: np.ndarray, sigma: np.ndarray) -> LognormalMixture:
+        return LognormalMixture(s0=float(s0), p=p, mu=mu, sigma=sigma)
+
+
+@dataclass(frozen=True)
+class StudentTLaw:
+    """
+    R = mu + sigma * sqrt((df - 2) / df) * T_df, i.e. a Student-t with the
+    scenario's mean and variance.
+
+    The t has no exponential moments, so E[S_T] would be infinite; the law
+    is truncated at |R - mu| <= width * sigma, where the samplers and the
+    mixture agree. The mixture discretises the t on n_atoms cells with
+    exact cell probabilities (stdtr).
+    """
+    df: float = 4.0
+    width: float = 12.0
+    n_atoms: int = 4001
+
+    def __post_init__(self):
+        if self.df <= 2:
+            raise ValueError("df must exceed 2 for a finite variance.")
+
+    @property
+    def _scale(self) -> float:
+        return float(np.sqrt((self.df - 2.0) / self.df))
+
+    def sample(self, rng: np.random.Generator, mu: np.ndarray, sigma: np.ndarray) -> np.ndarray:
+        bound = self.width / self._scale
+        t = rng.standard_t(self.df, len(mu))
+        out = np.abs(t) > bound
+        while out.any():  # redraw the (rare) truncated tail
+            t[out] = rng.standard_t(self.df, int(out.sum()))
+            out = np.abs(t) > bound
+        return mu + sigma * self._scale * t
+
+    def mixture(self, s0: float, p: np.ndarray, mu: np.ndarray, sigma: np.ndarray) -> AtomMixture:
+        edges = np.linspace(-self.width, self.width, self.n_atoms + 1)
+        mass = np.diff(stdtr(self.df, edges / self._scale))
+        eps = 0.5 * (edges[1:] + edges[:-1])
+        return _location_scale_atoms(s0, p, mu, sigma, eps, mass / mass.sum())
+
+
+@dataclass(frozen=True)
+class MertonJumpLaw:
+    """
+    Diffusion plus N ~ Poisson(intensity) jumps of size N(jump_mean, jump_std^2)
+    over the 30 days, e.g. tariff headlines gapping the price down.
+
+    The diffusion is set so R keeps the scenario's mean and variance:
+    drift mu - intensity * jump_mean, variance sigma^2 minus the jump
+    variance (which must be smaller). Given N = k, R is normal, so the
+    mixture is a LognormalMixture over (scenario, k), with k cut where the
+    Poisson tail drops below `tail`.
+    """
+    intensity: float = 0.5
+    jump_mean: float = -0.05
+    jump_std: float = 0.04
+    tail: float = 1e-12
+
+    def _diffusion(self, mu: np.ndarray, sigma: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        jump_var = self.intensity * (self.jump_mean ** 2 + self.jump_std ** 2)
+        if np.any(sigma ** 2 <= jump_var):
+            raise ValueError("Jump variance exceeds the scenario variance.")
+        return mu - self.intensity * self.jump_mean, np.sqrt(sigma ** 2 - jump_var)
+
+    def sample(self, rng: np.random.Generator, mu: np.ndarray, sigma: np.ndarray) -> np.ndarray:
+        drift, diff = self._diffusion(mu, sigma)
+        n = len(mu)
+        k = rng.poisson(self.intensity, n)
+        z = rng.standard_normal((2, n))
+        return drift + diff * z[0] + k * self.jump_mean + np.sqrt(k) * self.jump_std * z[1]
+
+    def mixture(self, s0: float, p: np.ndarray, mu: np.ndarray, sigma: np.ndarray) -> LognormalMixture:
+        drift, diff = self._diffusion(mu, sigma)
+        k = np.arange(int(poisson.isf(self.tail, self.intensity)) + 1)
+        pk = poisson.pmf(k, self.intensity)
+        pk /= pk.sum()
+        return LognormalMixture(
+            s0=float(s0),
+            p=(p[:, None] * pk[None, :]).ravel(),
+            mu=(drift[:, None] + k[None, :] * self.jump_mean).ravel(),
+            sigma=np.sqrt(diff[:, None] ** 2 + k[None, :] * self.jump_std ** 2).ravel(),
+        )
+
+
+@dataclass(frozen=True)
+class EmpiricalLaw:
+    """
+    R = mu + sigma * z with z bootstrapped from standardised historical
+    30-day log returns, keeping their skew and fat tails.
+    """
+    z: np.ndarray  # standardised residuals: mean 0, std 1
+
+    @classmethod
+    def from_returns(cls, returns: Union[pd.Series, np.ndarray]) -> "EmpiricalLaw":
+        """
+        From rolling 30-day log returns, e.g. rolling_mu_30d(log_returns).
+        """
+        r = np.asarray(returns, dtype=float)
+        r = r[np.isfinite(r)]
+        if len(r) < 2:
+            raise ValueError("Need at least two historical returns.")
+        return cls(z=(r - r.mean()) / r.std())
+
+    def sample(self, rng: np.random.Generator, mu: np.ndarray, sigma: np.ndarray) -> np.ndarray:
+        return mu + sigma * self.z[rng.integers(len(self.z), size=len(mu))]
+
+    def mixture(self, s0: float, p: np.ndarray, mu: np.ndarray, sigma: np.ndarray) -> AtomMixture:
+        return _location_scale_atoms(s0, p, mu, sigma, self.z, np.full(len(self.z), 1.0 / len(self.z)))
+
+
+ReturnLaw = Union[GaussianLaw, StudentTLaw, MertonJumpLaw, EmpiricalLaw]
+
+
+def _law_groups(scenarios: pd.DataFrame, law) -> list:
+    # (law, row indices) pairs; law may map severity -> law
+    if not isinstance(law, dict):
+        return [(law, np.arange(len(scenarios)))]
+    severity = scenarios["severity"].to_numpy()
+    missing = set(severity.tolist()) - set(law)
+    if missing:
+        raise ValueError(f"No return law for severities: {sorted(missing)}")
+    groups = {}
+    for i, sev in enumerate(severity):
+        groups.setdefault(id(law[sev]), (law[sev], []))[1].append(i)
+    return [(lw, np.array(rows)) for lw, rows in groups.values()]
+
+
+def law_mixture(
+    s0: float,
+    scenarios: pd.DataFrame,
+    mu_base: float,
+    sigma_base: float,
+    law: Union[ReturnLaw, Dict[int, ReturnLaw]] = GaussianLaw(),
+):
+    """
+    Terminal-price law of the scenario mixture when each scenario's return
+    follows `law` (one law, or severity -> law) with the scenario's mu and
+    sigma. The result has the LognormalMixture interface (cdf,
+    partial_moment, put/call_expectation, mu / sigma), so density_weights,
+    adaptive_price_grid, put_spread_pnl_analytic and put_spread_frontier
+    take it unchanged.
+    """
+    p = scenarios["p"].to_numpy(dtype=float)
+    mu, sigma = scenario_params(scenarios, mu_base=mu_base, sigma_base=sigma_base)
+    parts = [lw.mixture(s0, p[rows], mu[rows], sigma[rows]) for lw, rows in _law_groups(scenarios, law)]
+    return parts[0] if len(parts) == 1 else MixtureSum(parts=tuple(parts))
+
+
+def sample_terminal_prices_law(
+    s0: float,
+    scenarios: pd.DataFrame,
+    mu_base: float,
+    sigma_base: float,
+    law: Union[ReturnLaw, Dict[int, ReturnLaw]] = GaussianLaw(),
+    n_sims: int = 50_000,
+    seed: int = 42,
+) -> TerminalSample:
+    """
+    sample_terminal_prices with a pluggable return law: scenarios are drawn
+    as integer codes, then each law samples the returns of its scenarios'
+    paths in one vectorised call. Both use the same mixture_streams, so with
+    GaussianLaw this reproduces sample_terminal_prices (path ordering) exactly.
+    """
+    rng_u, rng = mixture_streams(seed)
+
+    codes = scenario_codes(rng_u, scenarios["p"].to_numpy(dtype=float), n_sims)
+    mu, sigma = scenario_params(scenarios, mu_base=mu_base, sigma_base=sigma_base)
+
+    groups = _law_groups(scenarios, law)
+    if len(groups) == 1:
+        r = groups[0][0].sample(rng, mu[codes], sigma[codes])
+    else:
+        r = np.empty(n_sims, dtype=float)
+        for lw, rows in groups:
+            idx = np.flatnonzero(np.isin(codes, rows))
+            r[idx] = lw.sample(rng, mu[codes[idx]], sigma[codes[idx]])
+
+    return TerminalSample(scenarios=scenarios.reset_index(drop=True), codes=codes, log_return=r, S_T=s0 * np.exp(r))
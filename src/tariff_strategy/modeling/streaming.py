@@ -0,0 +1,179 @@
+from __future__ import annotations
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from .distribution import TerminalSample, mixture_streams, scenario_codes, scenario_params
+
+
+def iter_terminal_prices(
+    s0: float,
+    scenarios: pd.DataFrame,
+    mu_base: float,
+    sigma_base: float,
+    n_sims: int = 50_000,
+    seed: int = 42,
+    chunk_size: int = 1_000_000,
+) -> Iterator[TerminalSample]:
+    """
+    Generate the paths of simulate_terminal_prices / sample_terminal_prices
+    (path ordering) in chunks.
+
+    The batch sampler draws the scenario uniforms and the normals from two
+    separate mixture_streams; here each stream is consumed one chunk at a
+    time, so concatenating the chunks gives exactly the batch paths for the
+    same seed, whatever chunk_size.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive.")
+
+    rng_u, rng_z = mixture_streams(seed)
+    probs = scenarios["p"].to_numpy(dtype=float)
+
+    mu, sigma = scenario_params(scenarios, mu_base=mu_base, sigma_base=sigma_base)
+    scen = scenarios.reset_index(drop=True)
+
+    done = 0
+    while done < n_sims:
+        m = min(chunk_size, n_sims - done)
+        codes = scenario_codes(rng_u, probs, m)
+        r = mu[codes] + sigma[codes] * rng_z.standard_normal(m)
+        yield TerminalSample(scenarios=scen, codes=codes, log_return=r, S_T=s0 * np.exp(r))
+        done += m
+
+
+class RunningMoments:
+    """
+    Count, mean, variance, min and max updated one chunk at a time
+    (Chan et al. pairwise merge of per-chunk moments).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, x: np.ndarray) -> None:
+        x = np.asarray(x, dtype=float).ravel()
+        if x.size == 0:
+            return
+        mean = float(x.mean())
+        self._combine(x.size, mean, float(((x - mean) ** 2).sum()), float(x.min()), float(x.max()))
+
+    def merge(self, other: "RunningMoments") -> None:
+        if other.count:
+            self._combine(other.count, other.mean, other.m2, other.min, other.max)
+
+    def _combine(self, n: int, mean: float, m2: float, lo: float, hi: float) -> None:
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta ** 2 * self.count * n / total
+        self.count = total
+        self.min = min(self.min, lo)
+        self.max = max(self.max, hi)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else np.nan
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.variance))
+
+    @property
+    def stderr(self) -> float:
+        return float(self.std / np.sqrt(self.count)) if self.count > 0 else np.nan
+
+
+class StreamingHistogram:
+    """
+    Fixed-edge histogram used as a quantile sketch.
+
+    Counts are exact and independent of how the data is chunked; quantiles
+    are interpolated linearly inside a bin, so their error is at most one bin
+    width for values inside [edges[0], edges[-1]].
+    """
+
+    def __init__(self, edges: np.ndarray):
+        self.edges = np.asarray(edges, dtype=float)
+        if self.edges.ndim != 1 or len(self.edges) < 2 or np.any(np.diff(self.edges) <= 0):
+            raise ValueError("edges must be a strictly increasing 1-D array with at least 2 values.")
+        self.counts = np.zeros(len(self.edges) - 1, dtype=np.int64)
+        self.below = 0
+        self.above = 0
+
+    @classmethod
+    def linear(cls, lo: float, hi: float, bins: int = 200) -> "StreamingHistogram":
+        return cls(np.linspace(lo, hi, bins + 1))
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum()) + self.below + self.above
+
+    def update(self, x: np.ndarray) -> None:
+        x = np.asarray(x, dtype=float).ravel()
+        self.below += int(np.count_nonzero(x < self.edges[0]))
+        self.above += int(np.count_nonzero(x > self.edges[-1]))
+        self.counts += np.histogram(x, bins=self.edges)[0]
+
+    def merge(self, other: "StreamingHistogram") -> None:
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Cannot merge histograms with different edges.")
+        self.counts += other.counts
+        self.below += other.below
+        self.above += other.above
+
+    def quantile(self, q) -> np.ndarray:
+        """
+        Approximate quantiles; values outside the edges clamp to the end edges.
+        """
+        q = np.atleast_1d(np.asarray(q, dtype=float))
+        cum = np.concatenate([[self.below], self.below + np.cumsum(self.counts)]).astype(float)
+        return np.interp(q * self.total, cum, self.edges)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({"lo": self.edges[:-1], "hi": self.edges[1:], "count": self.counts})
+
+
+class PnLAccumulator:
+    """
+    Online summary of a P&L sample: moments, P(P&L > 0) and a histogram.
+    """
+
+    def __init__(self, hist: StreamingHistogram):
+        self.moments = RunningMoments()
+        self.hist = hist
+        self.n_profit = 0
+
+    def update(self, pnl: np.ndarray) -> None:
+        self.moments.update(pnl)
+        self.hist.update(pnl)
+        self.n_profit += int(np.count_nonzero(np.asarray(pnl) > 0))
+
+    def merge(self, other: "PnLAccumulator") -> None:
+        self.moments.merge(other.moments)
+        self.hist.merge(other.hist)
+        self.n_profit += other.n_profit
+
+    @property
+    def p_profit(self) -> float:
+        return self.n_profit / self.moments.count if self.moments.count else np.nan
+
+    def summary(self, quantiles: Optional[np.ndarray] = None) -> dict:
+        quantiles = np.array([0.01, 0.05, 0.50, 0.95, 0.99]) if quantiles is None else np.asarray(quantiles)
+        out = {
+            "n_paths": self.moments.count,
+            "ev_$": self.moments.mean,
+            "std_$": self.moments.std,
+            "stderr_$": self.moments.stderr,
+            "p_profit": self.p_profit,
+            "min_$": self.moments.min,
+            "max_$": self.moments.max,
+        }
+        for q, v in zip(quantiles, self.hist.quantile(quantiles)):
+            out[f"q{q:g}_$"] = float(v)
+        return out
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..modeling.analytic import mixture_from_calibration
+from ..modeling.calibration import IncrementalCalibrator, adj_close
+from ..modeling.scenarios import tariff_scenarios
+from ..trading.analytic_pnl import put_spread_pnl_analytic
+from ..trading.pricing import bs_put_price
+from ..trading.put_spread_search import search_put_spreads_batched
+from ..trading.target_payoff import build_price_grid, downside_target_payoff
+from ..trading.trade_summary import put_spread_payoff_dollars
+
+TRADING_DAYS = 252
+
+
+@dataclass(frozen=True)
+class BacktestConfig:
+    lookback: int = 504          # price bars per calibration sample (~2y, like period="2y")
+    window: int = 30             # rolling window / hedge horizon in trading days
+    trim: float = 0.10
+    step: int = 1                # trade every `step` bars
+    grid_min: float = 0.60
+    grid_max: float = 1.40
+    n_grid: int = 250
+    floor: float = 0.85
+    cap: float = 1.00
+    strike_min: float = 0.75     # modelled put chain, as multiples of S0
+    strike_max: float = 1.05
+    strike_step: float = 0.0125
+    vol_markup: float = 1.0      # implied / historical vol used to price the chain
+    rate: float = 0.0
+    scenarios: pd.DataFrame = field(default_factory=tariff_scenarios)
+
+
+@dataclass(frozen=True)
+class CalibrationState:
+    """
+    Baselines for every bar, from one IncrementalCalibrator pass over the
+    whole history; each as-of date only looks them up, so the rolling
+    values are never re-sorted per date (O(log lookback) per bar overall).
+    """
+    dates: np.ndarray       # bar dates
+    adj: np.ndarray         # adjusted close per bar
+    mu_base: np.ndarray     # baseline_mu_30d on the `lookback` bars ending at each bar
+    sigma_base: np.ndarray  # baseline_sigma_30d on the same sample
+
+    @classmethod
+    def from_prices(
+        cls,
+        prices: pd.DataFrame,
+        window: int = 30,
+        lookback: int = 504,
+        trim: float = 0.10,
+    ) -> "CalibrationState":
+        adj = adj_close(prices).to_numpy()
+        n = len(adj)
+        mu = np.full(n, np.nan)
+        sig = np.full(n, np.nan)
+        cal = IncrementalCalibrator(window=window, trim=trim, lookback=lookback)
+        for t, price in enumerate(adj):
+            cal.update(price)
+            if cal.n_values:
+                mu[t], sig[t] = cal.mu_base, cal.sigma_base
+
+        dates = prices["Date"].to_numpy().ravel() if "Date" in prices.columns else np.arange(n)
+        return cls(dates=dates, adj=adj, mu_base=mu, sigma_base=sig)
+
+    def calibrate(self, t: int) -> tuple[float, float]:
+        """
+        (mu_base, sigma_base) exactly as baseline_mu_30d / baseline_sigma_30d
+        give them on the `lookback` bars ending at bar t.
+        """
+        return float(self.mu_base[t]), float(self.sigma_base[t])
+
+
+def _backtest_dates(state: CalibrationState, ts: List[int], cfg: BacktestConfig) -> List[dict]:
+    rows = []
+    horizon_years = cfg.window / TRADING_DAYS
+    for t in ts:
+        mu_base, sigma_base = state.calibrate(t)
+        s0 = float(state.adj[t])
+
+        S_grid = build_price_grid(s0=s0, grid_min=cfg.grid_min, grid_max=cfg.grid_max, n=cfg.n_grid)
+        target = downside_target_payoff(S_grid, s0=s0, floor=cfg.floor, cap=cfg.cap)
+
+        strikes = np.arange(cfg.strike_min, cfg.strike_max + 1e-12, cfg.strike_step) * s0
+        sigma_ann = cfg.vol_markup * sigma_base / np.sqrt(horizon_years)
+        mids = bs_put_price(s0, strikes, horizon_years, sigma_ann, cfg.rate)
+        puts = pd.DataFrame({"strike": strikes, "mid": mids})
+
+        best = search_put_spreads_batched(S_grid, puts, target, top_k=1).iloc[0]
+        K_long, K_short, premium = float(best["K_long"]), float(best["K_short"]), float(best["cost"])
+
+        mixture = mixture_from_calibration(s0, cfg.scenarios, mu_base, sigma_base)
+        ex_ante = put_spread_pnl_analytic(mixture, K_long, K_short, premium).iloc[0]
+
+        s_T = float(state.adj[t + cfg.window])
+        rows.append({
+            "date": state.dates[t],
+            "s0": s0,
+            "mu_base": mu_base,
+            "sigma_base": sigma_base,
+            "K_long": K_long,
+            "K_short": K_short,
+            "premium_$": premium,
+            "ev_$": float(ex_ante["ev_$"]),
+            "p_profit": float(ex_ante["p_profit"]),
+            "S_T": s_T,
+            "pnl_$": float(put_spread_payoff_dollars(np.array([s_T]), K_long, K_short, premium)[0]),
+        })
+    return rows
+
+
+def run_backtest(
+    prices: pd.DataFrame,
+    config: Optional[BacktestConfig] = None,
+    n_workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Replay calibration -> spread selection -> expiry P&L over historical dates.
+
+    At every step-th bar with a full lookback sample behind it and `window`
+    bars ahead, the engine recalibrates mu/sigma on the trailing sample,
+    prices a modelled put chain with Black-Scholes at the calibrated vol
+    (historical chains are not available), picks the best spread with
+    search_put_spreads_batched and marks it at the realised price `window`
+    bars later. The ex-ante EV and P(profit) come from the closed-form
+    mixture evaluator.
+
+    Dates are split across a process pool (n_workers=1 runs in-process);
+    rows come back in date order either way.
+    """
+    cfg = config or BacktestConfig()
+    state = CalibrationState.from_prices(prices, window=cfg.window, lookback=cfg.lookback, trim=cfg.trim)
+
+    first = cfg.lookback - 1
+    last = len(state.adj) - 1 - cfg.window
+    ts = list(range(first, last + 1, cfg.step))
+    if not ts:
+        raise ValueError("Price history too short for the requested lookback and horizon.")
+
+    n_workers = n_workers or os.cpu_count() or 1
+    chunks = [c.tolist() for c in np.array_split(np.array(ts), min(len(ts), n_workers * 4)) if len(c)]
+
+    fn = partial(_backtest_dates, state, cfg=cfg)
+    if n_workers == 1:
+        rows = [row for chunk in chunks for row in fn(chunk)]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            rows = [row for part in pool.map(fn, chunks) for row in part]
+
+    return pd.DataFrame(rows)
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from ..data.cache import save_frame
+
+
+@dataclass(frozen=True)
+class Step:
+    name: str
+    fn: Callable[..., Any]          # called with one keyword argument per dep
+    deps: Tuple[str, ...] = ()      # names of other steps or of run parameters
+
+
+def _hash_into(h: Any, value: Any) -> None:
+    if isinstance(value, np.ndarray):
+        h.update(str((value.dtype, value.shape)).encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (pd.DataFrame, pd.Series)):
+        h.update(repr(list(value.columns) if isinstance(value, pd.DataFrame) else value.name).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, dict):
+        h.update(b"{")
+        for k, v in value.items():
+            h.update(f"{k!r}:".encode())
+            _hash_into(h, v)
+        h.update(b"}")
+    elif isinstance(value, (list, tuple)):
+        h.update(f"{type(value).__name__}[".encode())
+        for v in value:
+            _hash_into(h, v)
+            h.update(b",")
+        h.update(b"]")
+    else:
+        h.update(repr(value).encode())
+
+
+def _fingerprint(value: Any) -> str:
+    """
+    Stable content hash for a run parameter. Dicts, lists and tuples are
+    walked, so arrays and frames inside them are hashed in full rather than
+    through their (truncated) repr.
+    """
+    h = hashlib.sha1()
+    _hash_into(h, value)
+    return h.hexdigest()
+
+
+def save_value(path: Union[str, Path], value: Any) -> None:
+    """
+    Checkpoint one step output: arrays as .npy, frames as columnar .npz,
+    dicts holding arrays/frames as a folder (one entry per key), anything
+    else (scalars, dicts of scalars) as JSON.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    containers = (dict, np.ndarray, pd.Series, pd.DataFrame)
+    if isinstance(value, dict) and any(isinstance(v, containers) for v in value.values()):
+        for k, v in value.items():
+            save_value(path / str(k), v)
+    elif isinstance(value, np.ndarray):
+        np.save(path.with_suffix(".npy"), value)
+    elif isinstance(value, pd.Series):
+        save_frame(path.with_suffix(".npz"), value.to_frame().reset_index())
+    elif isinstance(value, pd.DataFrame):
+        save_frame(path.with_suffix(".npz"), value.reset_index(drop=True))
+    else:
+        path.with_suffix(".json").write_text(json.dumps(value, default=float, indent=2))
+
+
+@dataclass
+class Pipeline:
+    """
+    Steps run as a DAG in one process, passing outputs in memory.
+
+    Each step's fingerprint hashes its own name, the run parameters it uses
+    and its upstream fingerprints. run() only re-executes steps whose
+    fingerprint changed since the previous run on this Pipeline object, and
+    only writes outputs to disk when a checkpoint_dir is given.
+    """
+    steps: Dict[str, Step] = field(default_factory=dict)
+    _outputs: Dict[str, Any] = field(default_factory=dict, repr=False)
+    _fingerprints: Dict[str, str] = field(default_factory=dict, repr=False)
+
+    def add(self, name: str, fn: Callable[..., Any], deps: Iterable[str] = ()) -> "Pipeline":
+        if name in self.steps:
+            raise ValueError(f"Duplicate step: {name}")
+        self.steps[name] = Step(name=name, fn=fn, deps=tuple(deps))
+        return self
+
+    def order(self, targets: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Topological order of the steps needed for targets (all steps by default).
+        """
+        order: List[str] = []
+        state: Dict[str, str] = {}
+
+        def visit(name: str) -> None:
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "active":
+                raise ValueError(f"Cycle in pipeline at step: {name}")
+            state[name] = "active"
+            for dep in self.steps[name].deps:
+                if dep in self.steps:
+                    visit(dep)
+            state[name] = "done"
+            order.append(name)
+
+        for name in (targets if targets is not None else self.steps):
+            if name not in self.steps:
+                raise ValueError(f"Unknown step: {name}")
+            visit(name)
+        return order
+
+    def run(
+        self,
+        params: Dict[str, Any],
+        targets: Optional[Iterable[str]] = None,
+        checkpoint_dir: Optional[Union[str, Path]] = None,
+        verbose: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Run (or reuse) the steps needed for targets and return their outputs by name.
+        """
+        order = self.order(targets)
+        executed = []
+
+        for name in order:
+            step = self.steps[name]
+            h = hashlib.sha1(name.encode())
+            for dep in step.deps:
+                if dep in self.steps:
+                    h.update(f"{dep}={self._fingerprints[dep]}".encode())
+                elif dep in params:
+                    h.update(f"{dep}={_fingerprint(params[dep])}".encode())
+                else:
+                    raise ValueError(f"Step '{name}' needs '{dep}', which is neither a step nor a parameter.")
+            fp = h.hexdigest()
+
+            if self._fingerprints.get(name) == fp and name in self._outputs:
+                continue
+
+            kwargs = {dep: self._outputs[dep] if dep in self.steps else params[dep] for dep in step.deps}
+            self._outputs[name] = step.fn(**kwargs)
+            self._fingerprints[name] = fp
+            executed.append(name)
+
+        if checkpoint_dir is not None:
+            for name in order:
+                save_value(Path(checkpoint_dir) / name, self._outputs[name])
+
+        if verbose:
+            print(f"Executed steps: {', '.join(executed) if executed else '(none, all cached)'}")
+
+        return {name: self._outputs[name] for name in order}
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """
+        Forget one step's output (or all of them) so the next run recomputes it.
+        """
+        if name is None:
+            self._outputs.clear()
+            self._fingerprints.clear()
+        else:
+            self._outputs.pop(name, None)
+            self._fingerprints.pop(name, None)
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from ..data.cache import save_frame
+from ..modeling.analytic import LognormalMixture
+from ..modeling.mapping import MU_PENALTY, SIGMA_MULT
+from ..modeling.scenarios import tariff_scenarios
+from ..trading.analytic_pnl import put_spread_pnl_analytic
+from ..trading.put_spread_search import search_put_spreads_batched
+from ..trading.target_payoff import density_weights
+from ..trading.trade_summary import put_spread_payoff_dollars
+
+
+@dataclass(frozen=True)
+class SweepCases:
+    """
+    Parameter sets to sweep, one row per case and one column per scenario
+    row of the scenario table.
+    """
+    p: np.ndarray            # (n_cases, n_scenarios) scenario probabilities
+    sigma_mult: np.ndarray   # (n_cases, n_scenarios)
+    mu_penalty: np.ndarray   # (n_cases, n_scenarios)
+
+    def __len__(self) -> int:
+        return self.p.shape[0]
+
+    @classmethod
+    def product(
+        cls,
+        p: np.ndarray,
+        sigma_mult: np.ndarray,
+        mu_penalty: np.ndarray,
+    ) -> "SweepCases":
+        """
+        Every combination of the given probability vectors and tables
+        (each a 2-D array with one row per alternative).
+        """
+        p, sm, mp = (np.atleast_2d(np.asarray(a, dtype=float)) for a in (p, sigma_mult, mu_penalty))
+        if not (p.shape[1] == sm.shape[1] == mp.shape[1]):
+            raise ValueError("All tables need one column per scenario.")
+        if np.any(np.abs(p.sum(axis=1) - 1.0) > 1e-9):
+            raise ValueError("Scenario probabilities must sum to 1.")
+        i, j, k = (a.ravel() for a in np.meshgrid(np.arange(len(p)), np.arange(len(sm)), np.arange(len(mp)), indexing="ij"))
+        return cls(p=p[i], sigma_mult=sm[j], mu_penalty=mp[k])
+
+    def take(self, rows: np.ndarray) -> "SweepCases":
+        return SweepCases(p=self.p[rows], sigma_mult=self.sigma_mult[rows], mu_penalty=self.mu_penalty[rows])
+
+    def to_frame(self) -> pd.DataFrame:
+        cols = {}
+        for name in ("p", "sigma_mult", "mu_penalty"):
+            values = getattr(self, name)
+            for j in range(values.shape[1]):
+                cols[f"{name}_{j}"] = values[:, j]
+        return pd.DataFrame(cols)
+
+
+def base_tables(scenarios: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (p, sigma_mult, mu_penalty) rows of the current model, aligned with the
+    scenario table.
+    """
+    sev = scenarios["severity"].to_numpy(dtype=int)
+    return (
+        scenarios["p"].to_numpy(dtype=float),
+        np.array([SIGMA_MULT[s] for s in sev]),
+        np.array([MU_PENALTY[s] for s in sev]),
+    )
+
+
+def dirichlet_probabilities(
+    base_p: np.ndarray,
+    n: int,
+    concentration: float = 50.0,
+    seed: int = 0,
+) -> np.ndarray:
+    """
+    base_p followed by n - 1 Dirichlet perturbations centred on it; larger
+    concentration keeps them closer to base_p.
+    """
+    base_p = np.asarray(base_p, dtype=float)
+    rng = np.random.default_rng(seed)
+    draws = rng.dirichlet(concentration * base_p, size=max(n - 1, 0))
+    return np.vstack([base_p, draws])
+
+
+def scaled_tables(base: np.ndarray, factors: Sequence[float], relative_to: float = 0.0) -> np.ndarray:
+    """
+    One row per factor: relative_to + f * (base - relative_to), e.g.
+    sigma multipliers scaled around 1 or drift penalties scaled around 0.
+    """
+    base = np.asarray(base, dtype=float)
+    f = np.asarray(factors, dtype=float)[:, None]
+    return relative_to + f * (base[None, :] - relative_to)
+
+
+def _case_mixture(s0: float, cases: SweepCases, mu_base: float, sigma_base: float) -> LognormalMixture:
+    # one batched mixture: parameters are (n_cases, n_scenarios) tables
+    return LognormalMixture(
+        s0=s0,
+        p=cases.p,
+        mu=mu_base + cases.mu_penalty,
+        sigma=sigma_base * cases.sigma_mult,
+    )
+
+
+def _sweep_chunk(
+    cases: SweepCases,
+    s0: float,
+    mu_base: float,
+    sigma_base: float,
+    K_long: float,
+    K_short: float,
+    premium: float,
+    puts: Optional[pd.DataFrame],
+    S_grid: Optional[np.ndarray],
+    target: Optional[np.ndarray],
+    method: str,
+    n_sims: int,
+    seed: int,
+) -> pd.DataFrame:
+    n = len(cases)
+    out = cases.to_frame()
+
+    if method == "analytic":
+        mix = _case_mixture(s0, cases, mu_base, sigma_base)
+        res = put_spread_pnl_analytic(mix, np.full(n, K_long), K_short, premium)
+        out["ev_$"] = res["ev_$"].to_numpy()
+        out["std_$"] = res["std_$"].to_numpy()
+        out["p_profit"] = res["p_profit"].to_numpy()
+    elif method == "mc":
+        # common random numbers: every case reuses the same uniforms (scenario
+        # choice) and normals, so differences between cases are not noise
+        rng = np.random.default_rng(seed)
+        u = rng.random(n_sims)
+        z = rng.standard_normal(n_sims)
+        ev, std, pp = np.empty(n), np.empty(n), np.empty(n)
+        for c in range(n):
+            codes = np.minimum(np.searchsorted(np.cumsum(cases.p[c]), u, side="right"), cases.p.shape[1] - 1)
+            log_r = mu_base + cases.mu_penalty[c, codes] + sigma_base * cases.sigma_mult[c, codes] * z
+            pnl = put_spread_payoff_dollars(s0 * np.exp(log_r), K_long, K_short, premium)
+            ev[c], std[c], pp[c] = pnl.mean(), pnl.std(ddof=1), np.mean(pnl > 0)
+        out["ev_$"], out["std_$"], out["p_profit"] = ev, std, pp
+    else:
+        raise ValueError("method must be 'analytic' or 'mc'.")
+
+    if puts is not None:
+        # re-optimise: best spread under each case's probability-weighted objective
+        best = []
+        for c in range(n):
+            mix_c = LognormalMixture(
+                s0=s0,
+                p=cases.p[c],
+                mu=mu_base + cases.mu_penalty[c],
+                sigma=sigma_base * cases.sigma_mult[c],
+            )
+            top = search_put_spreads_batched(
+                S_grid, puts, target, top_k=1, weights=density_weights(S_grid, mixture=mix_c)
+            ).iloc[0]
+            ex = put_spread_pnl_analytic(mix_c, top["K_long"], top["K_short"], top["cost"]).iloc[0]
+            best.append((top["K_long"], top["K_short"], top["cost"], ex["ev_$"], ex["p_profit"]))
+        best = np.array(best, dtype=float).reshape(n, 5)
+        out["best_K_long"] = best[:, 0]
+        out["best_K_short"] = best[:, 1]
+        out["best_premium_$"] = best[:, 2]
+        out["best_ev_$"] = best[:, 3]
+        out["best_p_profit"] = best[:, 4]
+        out["same_choice"] = (best[:, 0] == K_long) & (best[:, 1] == K_short)
+
+    return out
+
+
+def run_sweep(
+    s0: float,
+    mu_base: float,
+    sigma_base: float,
+    cases: SweepCases,
+    K_long: float,
+    K_short: float,
+    premium: float,
+    puts: Optional[pd.DataFrame] = None,
+    S_grid: Optional[np.ndarray] = None,
+    target: Optional[np.ndarray] = None,
+    method: str = "analytic",
+    n_sims: int = 50_000,
+    seed: int = 42,
+    n_workers: Optional[int] = None,
+    chunk_size: int = 256,
+    out_path: Optional[Union[str, Path]] = None,
+) -> pd.DataFrame:
+    """
+    Score the chosen put spread (premium in dollars) under every case, and
+    optionally re-pick the best spread per case.
+
+    - method="analytic" uses the closed-form mixture evaluator, all cases of
+      a chunk in one batched call; method="mc" simulates n_sims paths per
+      case with common random numbers (same seed for every case)
+    - with puts, S_grid and target, every case also re-runs the
+      probability-weighted spread search and reports the new choice, its
+      ex-ante EV / P(profit) and whether it matches the chosen spread
+    - cases are split in chunks over a process pool (n_workers=1 runs
+      in-process); rows come back in case order either way
+    - out_path writes the table as a columnar .npz (save_frame)
+    """
+    if puts is not None and (S_grid is None or target is None):
+        raise ValueError("Re-optimising needs S_grid and target along with puts.")
+
+    n_workers = n_workers or os.cpu_count() or 1
+    chunks = [cases.take(np.arange(i, min(i + chunk_size, len(cases)))) for i in range(0, len(cases), chunk_size)]
+    fn = partial(
+        _sweep_chunk,
+        s0=s0,
+        mu_base=mu_base,
+        sigma_base=sigma_base,
+        K_long=K_long,
+        K_short=K_short,
+        premium=premium,
+        puts=puts,
+        S_grid=S_grid,
+        target=target,
+        method=method,
+        n_sims=n_sims,
+        seed=seed,
+    )
+    if n_workers == 1 or len(chunks) == 1:
+        parts = [fn(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            parts = list(pool.map(fn, chunks))
+
+    out = pd.concat(parts, ignore_index=True)
+    out.insert(0, "case", np.arange(len(out)))
+    if out_path is not None:
+        save_frame(out_path, out)
+    return out
+
+
+def default_cases(
+    n_probabilities: int = 200,
+    factors: Sequence[float] = (0.5, 0.75, 1.0, 1.25, 1.5),
+    concentration: float = 50.0,
+    seed: int = 0,
+    scenarios: Optional[pd.DataFrame] = None,
+) -> SweepCases:
+    """
+    Dirichlet probability vectors around the current scenario table crossed
+    with the sigma_mult / mu_penalty tables scaled by each factor.
+    """
+    scenarios = tariff_scenarios() if scenarios is None else scenarios
+    p, sm, mp = base_tables(scenarios)
+    return SweepCases.product(
+        dirichlet_probabilities(p, n_probabilities, concentration=concentration, seed=seed),
+        scaled_tables(sm, factors, relative_to=1.0),
+        scaled_tables(mp, factors, relative_to=0.0),
+    )
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..data.cache import MarketDataCache
+from ..data.chain_arrays import ChainArrays
+from ..data.market_data import (
+    clean_chain,
+    fetch_options_chain,
+    fetch_price_history,
+    list_option_expiries,
+    nearest_expiry,
+)
+from ..modeling.calibration import baseline_mu_30d, baseline_sigma_30d
+from ..modeling.distribution import simulate_terminal_prices
+from ..modeling.scenarios import tariff_scenarios
+from ..trading.optimizer_inputs import cost_vector, design_matrix_from_arrays
+from ..trading.put_spread_search import search_put_spreads_batched
+from ..trading.structure_optimizer import fit_structure
+from ..trading.target_payoff import build_price_grid, downside_target_payoff
+from ..trading.trade_summary import put_spread_metrics, put_spread_payoff_dollars
+from .dag import Pipeline
+
+# Same settings as run_step2 ... run_step10
+DEFAULT_PARAMS: Dict[str, Any] = {
+    "ticker": "SMH",
+    "period": "2y",
+    "as_of": None,          # cache key date, None = today
+    "window": 30,
+    "trim": 0.10,
+    "n_sims": 50_000,
+    "seed": 42,
+    "grid_min": 0.60,
+    "grid_max": 1.40,
+    "n_grid": 250,
+    "floor": 0.85,
+    "cap": 1.00,
+    "target_days": 30,
+    "expiry": None,         # fixed expiry, None = nearest to target_days
+    "max_spread": 1.00,
+    "min_oi": 50,
+    "top_k": 100,
+    "max_legs": 4,
+}
+
+
+def latest_adj_close(prices: pd.DataFrame) -> float:
+    # handle possible multi-index column case
+    last = prices["Adj Close"].iloc[-1]
+    return float(last.iloc[0]) if hasattr(last, "iloc") else float(last)
+
+
+def build_tariff_pipeline(cache: Optional[MarketDataCache] = None) -> Pipeline:
+    """
+    The Step 2 - Step 10 workflow as one in-memory DAG.
+
+    Step outputs:
+    - prices, s0, calibration {mu_base, sigma_base}, scenarios, sims
+    - S_grid, target, chosen_expiry, chain (liquid ChainArrays), design {X, meta, cost}
+    - put_spreads (ranked), structure (best whole-contract fit with up to
+      max_legs legs on the design matrix, at the best spread's width and cost)
+    - trade (best spread metrics, EV and P(profit) under sims)
+    """
+    pipe = Pipeline()
+
+    pipe.add(
+        "prices",
+        lambda ticker, period, as_of: fetch_price_history(ticker, period=period, cache=cache, as_of=as_of),
+        deps=("ticker", "period", "as_of"),
+    )
+    pipe.add("s0", latest_adj_close, deps=("prices",))
+    pipe.add(
+        "calibration",
+        lambda prices, window, trim: {
+            "mu_base": baseline_mu_30d(prices, window=window, trim=trim),
+            "sigma_base": baseline_sigma_30d(prices, window=window),
+        },
+        deps=("prices", "window", "trim"),
+    )
+    pipe.add("scenarios", tariff_scenarios)
+    pipe.add(
+        "sims",
+        lambda s0, scenarios, calibration, n_sims, seed: simulate_terminal_prices(
+            s0=s0,
+            scenarios=scenarios,
+            mu_base=calibration["mu_base"],
+            sigma_base=calibration["sigma_base"],
+            n_sims=n_sims,
+            seed=seed,
+        ),
+        deps=("s0", "scenarios", "calibration", "n_sims", "seed"),
+    )
+
+    pipe.add(
+        "S_grid",
+        lambda s0, grid_min, grid_max, n_grid: build_price_grid(s0=s0, grid_min=grid_min, grid_max=grid_max, n=n_grid),
+        deps=("s0", "grid_min", "grid_max", "n_grid"),
+    )
+    pipe.add(
+        "target",
+        lambda S_grid, s0, floor, cap: downside_target_payoff(S=S_grid, s0=s0, floor=floor, cap=cap),
+        deps=("S_grid", "s0", "floor", "cap"),
+    )
+
+    def _chosen_expiry(ticker, target_days, expiry, as_of):
+        if expiry is not None:
+            return expiry
+        return nearest_expiry(list_option_expiries(ticker, cache=cache, as_of=as_of), target_days=target_days)
+
+    def _chain(ticker, chosen_expiry, as_of, max_spread, min_oi):
+        chain = clean_chain(fetch_options_chain(ticker, chosen_expiry, cache=cache, as_of=as_of))
+        return ChainArrays.from_chain(chain).filter_liquid(max_spread=max_spread, min_oi=min_oi)
+
+    def _design(S_grid, chain):
+        X, meta = design_matrix_from_arrays(S_grid, chain)
+        return {"X": X, "meta": meta, "cost": cost_vector(meta)}
+
+    def _put_spreads(S_grid, chain, target, top_k):
+        return search_put_spreads_batched(S_grid=S_grid, puts=chain, target=target, top_k=top_k)
+
+    def _structure(design, target, put_spreads, max_legs):
+        best = put_spreads.iloc[0]
+        return fit_structure(
+            design["X"],
+            target * float(best["K_long"] - best["K_short"]),
+            design["cost"],
+            meta=design["meta"],
+            budget=float(best["cost"]),
+            max_legs=max_legs,
+            integer=True,
+        ).legs
+
+    def _trade(put_spreads, sims):
+        best = put_spreads.iloc[0]
+        K_long, K_short, premium = float(best["K_long"]), float(best["K_short"]), float(best["cost"])
+        pnl = put_spread_payoff_dollars(sims["S_T"].to_numpy(dtype=float), K_long, K_short, premium)
+        return {
+            "K_long": K_long,
+            "K_short": K_short,
+            **put_spread_metrics(K_long, K_short, premium),
+            "ev_$": float(np.mean(pnl)),
+            "p_profit": float(np.mean(pnl > 0)),
+        }
+
+    pipe.add("chosen_expiry", _chosen_expiry, deps=("ticker", "target_days", "expiry", "as_of"))
+    pipe.add("chain", _chain, deps=("ticker", "chosen_expiry", "as_of", "max_spread", "min_oi"))
+    pipe.add("design", _design, deps=("S_grid", "chain"))
+    pipe.add("put_spreads", _put_spreads, deps=("S_grid", "chain", "target", "top_k"))
+    pipe.add("structure", _structure, deps=("design", "target", "put_spreads", "max_legs"))
+    pipe.add("trade", _trade, deps=("put_spreads", "sims"))
+    return pipe
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from ..modeling.analytic import LognormalMixture
+
+
+def put_spread_pnl_analytic(
+    mixture: LognormalMixture,
+    K_long,
+    K_short,
+    premium_paid,
+    multiplier: int = 100,
+) -> pd.DataFrame:
+    """
+    Exact EV, std and P(P&L > 0) of debit put spreads under a lognormal mixture.
+
+    Inputs broadcast, so thousands of (K_long, K_short, premium) candidates are
+    scored in one call; premium_paid is in dollars per spread, as in
+    put_spread_payoff_dollars.
+    """
+    K_long, K_short, premium = np.broadcast_arrays(
+        np.asarray(K_long, dtype=float),
+        np.asarray(K_short, dtype=float),
+        np.asarray(premium_paid, dtype=float),
+    )
+    width = K_long - K_short
+
+    # payoff per share: width below K_short, K_long - S in between, 0 above K_long
+    m0_low = mixture.partial_moment(0, 0.0, K_short)
+    m0_mid = mixture.partial_moment(0, K_short, K_long)
+    m1_mid = mixture.partial_moment(1, K_short, K_long)
+    m2_mid = mixture.partial_moment(2, K_short, K_long)
+
+    payoff_mean = width * m0_low + K_long * m0_mid - m1_mid
+    payoff_sq = width ** 2 * m0_low + K_long ** 2 * m0_mid - 2 * K_long * m1_mid + m2_mid
+
+    ev = multiplier * payoff_mean - premium
+    var = multiplier ** 2 * (payoff_sq - payoff_mean ** 2)
+
+    # P&L decreases in S_T, so it is positive below the breakeven
+    breakeven = K_long - premium / multiplier
+    p_profit = np.where(
+        breakeven <= K_short,
+        0.0,
+        np.where(breakeven > K_long, 1.0, mixture.cdf(np.clip(breakeven, K_short, K_long))),
+    )
+
+    return pd.DataFrame({
+        "K_long": K_long.ravel(),
+        "K_short": K_short.ravel(),
+        "premium_$": premium.ravel(),
+        "ev_$": ev.ravel(),
+        "std_$": np.sqrt(np.maximum(var, 0.0)).ravel(),
+        "p_profit": p_profit.ravel(),
+        "breakeven": breakeven.ravel(),
+    })
+
+
+def structure_pnl_analytic(
+    mixture: LognormalMixture,
+    strikes: np.ndarray,
+    is_call: np.ndarray,
+    weights: np.ndarray,
+    premium: np.ndarray,
+    multiplier: int = 100,
+) -> pd.DataFrame:
+    """
+    Exact EV, std and P(P&L > 0) for many multi-leg structures at once.
+
+    - strikes / is_call describe the contracts (e.g. meta["strike"] and
+      meta["type"] == "call" from build_design_matrix)
+    - weights has shape (n_structures, n_contracts): signed quantities
+    - premium has shape (n_structures,): net dollars paid (cost_vector @ w)
+
+    Every structure's P&L is linear in S_T between consecutive strikes, so
+    EV and E[P&L^2] are sums of lognormal partial moments per segment and
+    P(P&L > 0) is the mixture probability of the sub-interval of each
+    segment where the line is positive.
+    """
+    strikes = np.asarray(strikes, dtype=float)
+    is_call = np.asarray(is_call, dtype=bool)
+    W = np.atleast_2d(np.asarray(weights, dtype=float))
+    premium = np.broadcast_to(np.asarray(premium, dtype=float), (W.shape[0],))
+
+    knots = np.unique(strikes)
+    lo = np.concatenate([[0.0], knots])
+    hi = np.concatenate([knots, [np.inf]])
+
+    # per contract and segment: payoff = a + b * S (segments never straddle a strike)
+    above = lo[None, :] >= strikes[:, None]
+    a = np.where(is_call[:, None], np.where(above, -strikes[:, None], 0.0), np.where(above, 0.0, strikes[:, None]))
+    b = np.where(is_call[:, None], np.where(above, 1.0, 0.0), np.where(above, 0.0, -1.0))
+
+    A = multiplier * (W @ a) - premium[:, None]  # (n_structures, n_segments)
+    B = multiplier * (W @ b)
+
+    m0 = mixture.partial_moment(0, lo, hi)
+    m1 = mixture.partial_moment(1, lo, hi)
+    m2 = mixture.partial_moment(2, lo, hi)
+
+    ev = (A * m0 + B * m1).sum(axis=1)
+    second = (A ** 2 * m0 + 2 * A * B * m1 + B ** 2 * m2).sum(axis=1)
+
+    # where A + B S > 0 inside each segment
+    with np.errstate(divide="ignore", invalid="ignore"):
+        root = -A / B
+    lo_b = np.broadcast_to(lo, A.shape)
+    hi_b = np.broadcast_to(hi, A.shape)
+    pos_lo = np.maximum(np.where(B > 0, np.maximum(lo_b, root), lo_b), 0.0)
+    pos_hi = np.maximum(np.where(B < 0, np.minimum(hi_b, root), hi_b), 0.0)
+    flat_empty = (B == 0) & (A <= 0)
+    mass = np.where(
+        (pos_hi > pos_lo) & ~flat_empty,
+        mixture.cdf(pos_hi) - mixture.cdf(pos_lo),
+        0.0,
+    )
+
+    return pd.DataFrame({
+        "premium_$": premium,
+        "ev_$": ev,
+        "std_$": np.sqrt(np.maximum(second - ev ** 2, 0.0)),
+        "p_profit": mass.sum(axis=1),
+    })
@@ -0,0 +1,88 @@
+from __future__ import annotations
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+def _meta_column(meta: pd.DataFrame, name: str) -> np.ndarray:
+    if name not in meta.columns:
+        return np.full(len(meta), np.nan)
+    return pd.to_numeric(meta[name], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+
+
+@dataclass(frozen=True)
+class ExecutionModel:
+    """
+    Per-share fill prices for listed options:
+
+        buy  = mid + spread_share * spread / 2 + slippage(q)
+        sell = mid - spread_share * spread / 2 - slippage(q)   (floored at 0)
+
+    slippage(q) = impact * spread * sqrt(q / depth), with the depth in
+    contracts taken from open interest and volume. Missing bid/ask fall back
+    to a spread of missing_spread * mid, missing OI/volume to min_depth.
+    """
+    spread_share: float = 0.5      # share of the half-spread paid (1 = cross to bid/ask)
+    impact: float = 0.25           # square-root slippage, in units of the quoted spread
+    depth_oi: float = 0.05         # contracts of depth per contract of open interest
+    depth_volume: float = 0.25     # contracts of depth per contract traded today
+    missing_spread: float = 0.10   # assumed spread / mid when bid/ask are missing
+    min_depth: float = 1.0
+
+    def spread(self, meta: pd.DataFrame) -> np.ndarray:
+        mid = _meta_column(meta, "mid")
+        spread = _meta_column(meta, "spread")
+        quoted = _meta_column(meta, "ask") - _meta_column(meta, "bid")
+        spread = np.where(np.isnan(spread), quoted, spread)
+        return np.where(np.isnan(spread) | (spread < 0), self.missing_spread * mid, spread)
+
+    def depth(self, meta: pd.DataFrame) -> np.ndarray:
+        oi = np.nan_to_num(_meta_column(meta, "openInterest"))
+        vol = np.nan_to_num(_meta_column(meta, "volume"))
+        return np.maximum(self.depth_oi * oi + self.depth_volume * vol, self.min_depth)
+
+    def prices(self, meta: pd.DataFrame, quantity=1.0) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (buy, sell) per-share fill prices for |quantity| contracts of every
+        meta row; quantity broadcasts, e.g. an (n_structures, n_contracts)
+        weight matrix gives one price per structure and leg.
+        """
+        mid = _meta_column(meta, "mid")
+        spread = self.spread(meta)
+        q = np.abs(np.asarray(quantity, dtype=float))
+        slip = self.impact * spread * np.sqrt(q / self.depth(meta))
+        half = self.spread_share * 0.5 * spread
+        return mid + half + slip, np.maximum(mid - half - slip, 0.0)
+
+
+def execution_costs(
+    meta: pd.DataFrame,
+    model: ExecutionModel,
+    quantity: float = 1.0,
+    contract_multiplier: int = 100,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Dollar cost to buy and proceeds to sell one contract of every meta row
+    when trading `quantity` contracts: the execution-aware counterpart of
+    cost_vector, for fit_structure's cost / sell_cost.
+    """
+    buy, sell = model.prices(meta, quantity)
+    return buy * contract_multiplier, sell * contract_multiplier
+
+
+def structure_execution_cost(
+    meta: pd.DataFrame,
+    weights: np.ndarray,
+    model: ExecutionModel,
+    contract_multiplier: int = 100,
+) -> np.ndarray:
+    """
+    Net dollars paid for each structure (rows of weights, signed contracts
+    per meta row), with every leg filled at its size-dependent price. One
+    broadcast over the weight matrix, however many structures there are.
+    """
+    W = np.atleast_2d(np.asarray(weights, dtype=float))
+    buy, sell = model.prices(meta, W)
+    paid = np.where(W > 0, W * buy, W * sell)  # sells have W < 0: proceeds
+    return paid.sum(axis=1) * contract_multiplier
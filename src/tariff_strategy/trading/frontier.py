@@ -0,0 +1,176 @@
+from __future__ import annotations
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..modeling.analytic import LognormalMixture
+from .analytic_pnl import put_spread_pnl_analytic
+from .execution import ExecutionModel
+from .put_spread_search import search_put_spreads_batched
+
+# objective column -> "min" or "max"
+DEFAULT_OBJECTIVES: Dict[str, str] = {
+    "cost": "min",
+    "error": "min",
+    "ev_$": "max",
+    "p_profit": "max",
+}
+
+
+def _dominated_by(A: np.ndarray, B: np.ndarray, block: int = 1 << 16) -> np.ndarray:
+    """
+    For every row of B: is some row of A <= it in all columns.
+
+    One column is a min, two a running-minimum sweep over A sorted by the
+    first column. With more, the rows are split at the median distinct value
+    of the first column (Bentley's multidimensional divide and conquer):
+    each half is solved on its own, and the low A rows can only dominate
+    high B rows, which they already beat on that column, so that cross test
+    drops it. Small problems are compared as one broadcast block.
+    """
+    out = np.zeros(len(B), dtype=bool)
+    if len(A) == 0 or len(B) == 0:
+        return out
+    k = A.shape[1]
+    if k == 1:
+        return B[:, 0] >= A[:, 0].min()
+    if k == 2:
+        order = np.argsort(A[:, 0], kind="stable")
+        run_min = np.minimum.accumulate(A[order, 1])
+        idx = np.searchsorted(A[order, 0], B[:, 0], side="right")
+        hit = idx > 0
+        out[hit] = run_min[idx[hit] - 1] <= B[hit, 1]
+        return out
+    if len(A) * len(B) <= block:
+        d = np.ones((len(A), len(B)), dtype=bool)
+        for j in range(k):
+            d &= A[:, j, None] <= B[None, :, j]
+        return d.any(axis=0)
+
+    values = np.unique(np.concatenate([A[:, 0], B[:, 0]]))
+    if len(values) == 1:
+        return _dominated_by(A[:, 1:], B[:, 1:], block)
+    x = values[len(values) // 2]
+    a_lo, b_lo = A[:, 0] < x, B[:, 0] < x
+    out[b_lo] = _dominated_by(A[a_lo], B[b_lo], block)
+    hi = np.flatnonzero(~b_lo)
+    res = _dominated_by(A[~a_lo], B[hi], block)
+    rest = ~res
+    res[rest] = _dominated_by(A[a_lo, 1:], B[hi[rest], 1:], block)
+    out[hi] = res
+    return out
+
+
+def _front(U: np.ndarray, leaf: int = 128) -> np.ndarray:
+    """
+    Frontier row indices of lexicographically sorted, distinct rows.
+
+    A row can only be dominated by rows before it, so the frontier of U is
+    the frontier of its first half plus the second half's frontier rows that
+    no first-half frontier row dominates (Kung's divide and conquer). The
+    first half never loses on column 0, so that test runs on the remaining
+    columns with _dominated_by: O(n log^2 n) for three objectives and one
+    more log factor per extra objective, instead of comparing every pair.
+    """
+    n = len(U)
+    if n <= leaf:
+        d = np.ones((n, n), dtype=bool)
+        for k in range(U.shape[1]):
+            d &= U[:, k, None] <= U[None, :, k]
+        np.fill_diagonal(d, False)
+        return np.flatnonzero(~d.any(axis=0))
+    h = n // 2
+    a = _front(U[:h], leaf)
+    b = _front(U[h:], leaf) + h
+    return np.concatenate([a, b[~_dominated_by(U[a, 1:], U[b, 1:])]])
+
+
+def pareto_mask(values: np.ndarray, maximize: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Boolean mask of the non-dominated rows of an (n, m) objective table
+    (minimised, except columns flagged in maximize). Identical rows do not
+    dominate each other, so duplicates of a frontier point are all kept.
+
+    Points are sorted lexicographically and deduplicated, so no point can be
+    dominated by one that comes after it: two objectives need a single
+    running-minimum sweep, more use a divide-and-conquer merge (_front),
+    O(n log^(m-1) n) even when most points are on the frontier.
+    """
+    V = np.array(values, dtype=float, ndmin=2)
+    n, m = V.shape
+    if n == 0:
+        return np.zeros(0, dtype=bool)
+    if maximize is not None:
+        V[:, np.asarray(maximize, dtype=bool)] *= -1.0
+    if np.isnan(V).any():
+        raise ValueError("Objective values must not contain NaN.")
+
+    # sort lexicographically and collapse identical rows
+    order = np.lexsort(V.T[::-1])
+    Vs = V[order]
+    new_row = np.concatenate([[True], np.any(Vs[1:] != Vs[:-1], axis=1)])
+    U = Vs[new_row]
+    group = np.cumsum(new_row) - 1  # unique row of each sorted row
+    on_front = np.zeros(len(U), dtype=bool)
+
+    if m == 1:
+        on_front[0] = True
+    elif m == 2:
+        # rows sorted by (col0, col1): a row survives iff its col1 beats every earlier col1
+        prev_min = np.concatenate([[np.inf], np.minimum.accumulate(U[:-1, 1])])
+        on_front = U[:, 1] < prev_min
+    else:
+        on_front[_front(U)] = True
+
+    mask = np.empty(n, dtype=bool)
+    mask[order] = on_front[group]
+    return mask
+
+
+def efficient_frontier(
+    candidates: pd.DataFrame,
+    objectives: Optional[Dict[str, str]] = None,
+) -> pd.DataFrame:
+    """
+    Non-dominated rows of a candidate table under the given objectives
+    (column -> "min"/"max", DEFAULT_OBJECTIVES by default), sorted by the
+    first objective.
+    """
+    objectives = objectives or DEFAULT_OBJECTIVES
+    bad = {k: v for k, v in objectives.items() if v not in ("min", "max")}
+    if bad:
+        raise ValueError(f"Objectives must be 'min' or 'max': {bad}")
+
+    cols = list(objectives)
+    mask = pareto_mask(
+        candidates[cols].to_numpy(dtype=float),
+        maximize=np.array([objectives[c] == "max" for c in cols]),
+    )
+    front = candidates.loc[mask]
+    return front.sort_values(cols, ascending=[objectives[c] == "min" for c in cols], kind="stable").reset_index(drop=True)
+
+
+def put_spread_frontier(
+    S_grid: np.ndarray,
+    puts: pd.DataFrame,
+    target: np.ndarray,
+    mixture: LognormalMixture,
+    weights: Optional[np.ndarray] = None,
+    objectives: Optional[Dict[str, str]] = None,
+    execution: Optional[ExecutionModel] = None,
+) -> pd.DataFrame:
+    """
+    Premium / tracking-error / EV / P(profit) frontier over every debit put
+    spread of a chain: all pairs are scored by search_put_spreads_batched,
+    EV and P(profit) come from the closed-form mixture evaluator, and the
+    non-dominated set is returned sorted by premium. With an ExecutionModel
+    premiums (and so EV) are at fill prices rather than mid.
+    """
+    spreads = search_put_spreads_batched(S_grid, puts, target, top_k=None, weights=weights, execution=execution)
+    # zero or negative mids differences are stale quotes, not free hedges
+    spreads = spreads[spreads["cost"] > 0].reset_index(drop=True)
+    pnl = put_spread_pnl_analytic(mixture, spreads["K_long"], spreads["K_short"], spreads["cost"])
+    spreads["ev_$"] = pnl["ev_$"].to_numpy()
+    spreads["p_profit"] = pnl["p_profit"].to_numpy()
+    return efficient_frontier(spreads, objectives)
@@ -1,42 +1,70 @@
 from __future__ import annotations
+from typing import Union
 import numpy as np
 import pandas as pd
 
-from .payoff import call_payoff, put_payoff
+from ..data.chain_arrays import ChainArrays
+from .payoff import HingePayoffMatrix, call_payoff_matrix, put_payoff_matrix
+
+LIQUIDITY_COLUMNS = ("bid", "ask", "spread", "volume", "openInterest")
 
 
 def build_design_matrix(
     S_grid: np.ndarray,
     calls: pd.DataFrame,
     puts: pd.DataFrame,
-) -> tuple[np.ndarray, pd.DataFrame]:
+    lazy: bool = False,
+) -> tuple[Union[np.ndarray, HingePayoffMatrix], pd.DataFrame]:
     """
     Returns:
-    - X: payoff matrix with shape (n_grid, n_contracts)
+    - X: payoff matrix with shape (n_grid, n_contracts); with lazy=True a
+      HingePayoffMatrix supporting X @ w, X.T @ r and X[rows, cols] without
+      allocating the dense matrix, which fit_structure accepts as is
     - meta: DataFrame with contract info aligned to columns of X
     """
-    call_K = calls["strike"].to_numpy(dtype=float)
-    put_K = puts["strike"].to_numpy(dtype=float)
-
-    call_cols = []
-    call_meta = []
-    for i, K in enumerate(call_K):
-        call_cols.append(call_payoff(S_grid, K))
-        call_meta.append(
-            {"type": "call", "strike": float(K), "mid": float(calls["mid"].iloc[i]), "symbol": calls["contractSymbol"].iloc[i]}
-        )
-
-    put_cols = []
-    put_meta = []
-    for i, K in enumerate(put_K):
-        put_cols.append(put_payoff(S_grid, K))
-        put_meta.append(
-            {"type": "put", "strike": float(K), "mid": float(puts["mid"].iloc[i]), "symbol": puts["contractSymbol"].iloc[i]}
-        )
+    def _meta(kind: str, df: pd.DataFrame) -> pd.DataFrame:
+        out = pd.DataFrame({
+            "type": kind,
+            "strike": df["strike"].to_numpy(dtype=float),
+            "mid": df["mid"].to_numpy(dtype=float),
+            "symbol": df["contractSymbol"].to_numpy(),
+        })
+        # quote and liquidity columns, when the chain has them (execution costs)
+        for col in LIQUIDITY_COLUMNS:
+            if col in df.columns:
+                out[col] = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        return out
+
+    meta = pd.concat([_meta("call", calls), _meta("put", puts)], ignore_index=True)
+
+    if lazy:
+        return HingePayoffMatrix(S_grid, meta["strike"].to_numpy(), (meta["type"] == "call").to_numpy()), meta
 
     # X should be (n_grid, n_contracts)
-    X = np.column_stack(call_cols + put_cols)
-    meta = pd.DataFrame(call_meta + put_meta)
+    X = np.hstack([
+        call_payoff_matrix(S_grid, calls["strike"].to_numpy(dtype=float)),
+        put_payoff_matrix(S_grid, puts["strike"].to_numpy(dtype=float)),
+    ])
+    return X, meta
+
+
+def design_matrix_from_arrays(
+    S_grid: np.ndarray,
+    chain: ChainArrays,
+    lazy: bool = False,
+) -> tuple[Union[np.ndarray, HingePayoffMatrix], pd.DataFrame]:
+    """
+    build_design_matrix for a ChainArrays: its rows are already calls then
+    puts by strike, so X and meta come straight from the arrays.
+    """
+    meta = chain.meta()
+    if lazy:
+        return HingePayoffMatrix(S_grid, chain.strike, chain.is_call), meta
+
+    X = np.hstack([
+        call_payoff_matrix(S_grid, chain.calls().strike),
+        put_payoff_matrix(S_grid, chain.puts().strike),
+    ])
     return X, meta
 
 
@@ -0,0 +1,156 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ..modeling.paths import PricePaths
+from .pricing import bs_put_price
+
+# RuleOutcome.reason codes
+HELD, STOP_LOSS, TAKE_PROFIT, BARRIER_DOWN, BARRIER_UP = range(5)
+REASONS = ("held", "stop_loss", "take_profit", "barrier_down", "barrier_up")
+
+
+@dataclass(frozen=True)
+class ExitRule:
+    """
+    Early-exit rules for a debit put spread, checked once a day from
+    min_step on (first trigger wins, in the order listed):
+
+    - stop_loss: close when the spread is worth <= (1 - stop_loss) * premium
+    - take_profit: close when it is worth >= (1 + take_profit) * premium
+    - barrier_down / barrier_up: close when S crosses the level
+
+    With roll_on_barrier a barrier hit closes the spread and reopens it at
+    the same moneyness to the new spot (strikes scaled by S_t / s0), paying
+    its model value; the rolled spread is held to expiry. The roll is a
+    same-expiry re-strike: the new spread keeps the remaining life, it is
+    not rolled out to a later tenor.
+    """
+    stop_loss: Optional[float] = None
+    take_profit: Optional[float] = None
+    barrier_down: Optional[float] = None
+    barrier_up: Optional[float] = None
+    roll_on_barrier: bool = False
+    min_step: int = 1
+
+
+@dataclass(frozen=True)
+class RuleOutcome:
+    exit_step: np.ndarray  # step the position was closed or rolled (n_steps when held)
+    reason: np.ndarray     # REASONS index per path
+    pnl: np.ndarray        # $ P&L per path with the rule
+    hold_pnl: np.ndarray   # $ P&L per path held to expiry
+
+    @classmethod
+    def concat(cls, outcomes: Sequence["RuleOutcome"]) -> "RuleOutcome":
+        """
+        Join the outcomes of several iter_paths blocks.
+        """
+        return cls(*(np.concatenate([getattr(o, f) for o in outcomes]) for f in cls.__dataclass_fields__))
+
+    def summary(self) -> pd.DataFrame:
+        """
+        EV, std and P(P&L > 0) with and without the rule, plus how often
+        each exit reason fired.
+        """
+        out = pd.DataFrame({
+            "ev_$": [self.pnl.mean(), self.hold_pnl.mean()],
+            "std_$": [self.pnl.std(), self.hold_pnl.std()],
+            "p_profit": [np.mean(self.pnl > 0), np.mean(self.hold_pnl > 0)],
+        }, index=["rule", "hold"])
+        freq = np.bincount(self.reason, minlength=len(REASONS)) / len(self.reason)
+        for name, f in zip(REASONS, freq):
+            out[f"p_{name}"] = [f, np.nan]
+        return out
+
+
+def evaluate_put_spread_rules(
+    paths: PricePaths,
+    K_long: float,
+    K_short: float,
+    premium_paid: float,
+    rule: ExitRule,
+    sigma,
+    horizon_years: float = 30 / 365,
+    r: float = 0.0,
+    multiplier: int = 100,
+) -> RuleOutcome:
+    """
+    P&L of one debit put spread along every path with an ExitRule applied.
+
+    The spread is marked each day with Black-Scholes at the remaining life
+    horizon_years * (1 - t / n_steps); sigma is the marking vol, one value or
+    (sigma_long, sigma_short). Only paths still open are repriced, one
+    vectorised call per step, so memory stays at a few arrays of n_paths;
+    premium_paid is dollars per spread, as in put_spread_payoff_dollars.
+    """
+    sig_l, sig_s = np.broadcast_to(np.asarray(sigma, dtype=float), (2,))
+    n, n_steps = paths.n_paths, paths.n_steps
+    prem = premium_paid / multiplier
+
+    def value(S, kl, ks, T):
+        return bs_put_price(S, kl, T, sig_l, r) - bs_put_price(S, ks, T, sig_s, r)
+
+    open_ = np.ones(n, dtype=bool)
+    exit_step = np.full(n, n_steps, dtype=np.int16)
+    reason = np.full(n, HELD, dtype=np.int8)
+    proceeds = np.zeros(n)  # per share, received when closing (net of any roll cost)
+    kl = np.full(n, float(K_long))
+    ks = np.full(n, float(K_short))
+
+    marks = rule.stop_loss is not None or rule.take_profit is not None
+    barriers = rule.barrier_down is not None or rule.barrier_up is not None
+    for t in range(max(rule.min_step, 1), n_steps if marks or barriers else 0):
+        idx = np.flatnonzero(open_)
+        if len(idx) == 0:
+            break
+        S = paths.prices(t, idx)
+        T_rem = horizon_years * (1.0 - t / n_steps)
+        # barrier-only rules price the spread just for the paths that exit
+        V = value(S, kl[idx], ks[idx], T_rem) if marks else None
+
+        hit = np.full(len(idx), HELD, dtype=np.int8)
+        checks = (
+            (STOP_LOSS, None if rule.stop_loss is None else V <= (1.0 - rule.stop_loss) * prem),
+            (TAKE_PROFIT, None if rule.take_profit is None else V >= (1.0 + rule.take_profit) * prem),
+            (BARRIER_DOWN, None if rule.barrier_down is None else S <= rule.barrier_down),
+            (BARRIER_UP, None if rule.barrier_up is None else S >= rule.barrier_up),
+        )
+        for code, cond in reversed(checks):  # earlier checks overwrite later ones
+            if cond is not None:
+                hit[cond] = code
+        fired = hit != HELD
+        if not fired.any():
+            continue
+
+        rows = idx[fired]
+        exit_step[rows] = t
+        reason[rows] = hit[fired]
+        proceeds[rows] = V[fired] if marks else value(S[fired], kl[rows], ks[rows], T_rem)
+        open_[rows] = False
+
+        if rule.roll_on_barrier:
+            roll = fired & ((hit == BARRIER_DOWN) | (hit == BARRIER_UP))
+            rr = idx[roll]
+            scale = S[roll] / paths.s0
+            kl[rr] = K_long * scale
+            ks[rr] = K_short * scale
+            # the rolled spread is settled at expiry below, with no further rules
+            proceeds[rr] -= value(S[roll], kl[rr], ks[rr], T_rem)
+
+    S_T = paths.S_T
+    payoff = np.maximum(kl - S_T, 0.0) - np.maximum(ks - S_T, 0.0)
+    hold = np.maximum(K_long - S_T, 0.0) - np.maximum(K_short - S_T, 0.0)
+    rolled = np.isin(reason, (BARRIER_DOWN, BARRIER_UP)) if rule.roll_on_barrier else np.zeros(n, dtype=bool)
+    at_expiry = (reason == HELD) | rolled
+    final = proceeds + np.where(at_expiry, payoff, 0.0)
+
+    return RuleOutcome(
+        exit_step=exit_step,
+        reason=reason,
+        pnl=final * multiplier - premium_paid,
+        hold_pnl=hold * multiplier - premium_paid,
+    )
@@ -8,3 +8,133 @@ def call_payoff(S: np.ndarray, K: float) -> np.ndarray:
 
 def put_payoff(S: np.ndarray, K: float) -> np.ndarray:
     return np.maximum(K - S, 0.0)
+
+
+def call_payoff_matrix(S: np.ndarray, strikes: np.ndarray) -> np.ndarray:
+    """
+    Call payoffs for many strikes at once, shape (len(S), len(strikes)).
+    """
+    S = np.asarray(S, dtype=float)
+    K = np.asarray(strikes, dtype=float)
+    return np.maximum(S[:, None] - K[None, :], 0.0)
+
+
+def put_payoff_matrix(S: np.ndarray, strikes: np.ndarray) -> np.ndarray:
+    """
+    Put payoffs for many strikes at once, shape (len(S), len(strikes)).
+    """
+    S = np.asarray(S, dtype=float)
+    K = np.asarray(strikes, dtype=float)
+    return np.maximum(K[None, :] - S[:, None], 0.0)
+
+
+def _exclusive_cumsum(a: np.ndarray) -> np.ndarray:
+    # c[i] = a[0] + ... + a[i-1] along axis 0, with c[0] = 0
+    return np.concatenate([np.zeros((1,) + a.shape[1:]), np.cumsum(a, axis=0)])
+
+
+class HingePayoffMatrix:
+    """
+    Implicit (len(S), len(strikes)) matrix of call/put payoffs.
+
+    Every column is a hinge max(S - K, 0) or max(K - S, 0), so products with
+    it reduce to prefix sums over sorted strikes (X @ w) or sorted grid
+    points (X.T @ r): O((n_grid + n_contracts) log) time and memory, never
+    the dense matrix. Slicing rows and columns, X[rows, cols], returns
+    another lazy matrix.
+    """
+
+    def __init__(self, S: np.ndarray, strikes: np.ndarray, is_call: np.ndarray):
+        self.S = np.asarray(S, dtype=float)
+        self.strikes = np.asarray(strikes, dtype=float)
+        self.is_call = np.broadcast_to(np.asarray(is_call, dtype=bool), self.strikes.shape)
+        self._S_order = np.argsort(self.S, kind="stable")
+        self._S_sorted = self.S[self._S_order]
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self.S), len(self.strikes)
+
+    def __getitem__(self, key) -> "HingePayoffMatrix":
+        if not (isinstance(key, tuple) and len(key) == 2):
+            raise IndexError("Index as X[rows, cols]; use X[:, cols] for columns only.")
+        rows, cols = ([k] if isinstance(k, (int, np.integer)) else k for k in key)
+        return HingePayoffMatrix(self.S[rows], self.strikes[cols], self.is_call[cols])
+
+    def toarray(self) -> np.ndarray:
+        return np.where(
+            self.is_call[None, :],
+            call_payoff_matrix(self.S, self.strikes),
+            put_payoff_matrix(self.S, self.strikes),
+        )
+
+    def matvec(self, w: np.ndarray) -> np.ndarray:
+        """
+        X @ w for w of shape (n_contracts,) or (n_contracts, k).
+        """
+        w = np.asarray(w, dtype=float)
+        W = w.reshape(len(self.strikes), -1)
+        out = np.zeros((len(self.S), W.shape[1]))
+        S = self.S[:, None]
+
+        for call in (True, False):
+            sel = self.is_call == call
+            if not sel.any():
+                continue
+            K = self.strikes[sel]
+            order = np.argsort(K, kind="stable")
+            K, Wk = K[order], W[sel][order]
+            a = _exclusive_cumsum(Wk)               # sum of w over the first i strikes
+            b = _exclusive_cumsum(Wk * K[:, None])  # sum of w * K over the same
+            n_below = np.searchsorted(K, self.S, side="left")
+            if call:
+                # sum over K < S of w (S - K)
+                out += S * a[n_below] - b[n_below]
+            else:
+                # sum over K >= S of w (K - S) (K == S contributes 0 either way)
+                out += (b[-1] - b[n_below]) - S * (a[-1] - a[n_below])
+        return out.reshape((len(self.S),) + w.shape[1:])
+
+    def rmatvec(self, r: np.ndarray) -> np.ndarray:
+        """
+        X.T @ r for r of shape (n_grid,) or (n_grid, k).
+        """
+        r = np.asarray(r, dtype=float)
+        R = r.reshape(len(self.S), -1)[self._S_order]
+        S = self._S_sorted
+        a = _exclusive_cumsum(R)
+        b = _exclusive_cumsum(R * S[:, None])
+        n_below = np.searchsorted(S, self.strikes, side="left")
+        K = self.strikes[:, None]
+        # calls: sum over S > K of r (S - K); puts: sum over S < K of r (K - S)
+        calls = (b[-1] - b[n_below]) - K * (a[-1] - a[n_below])
+        puts = K * a[n_below] - b[n_below]
+        out = np.where(self.is_call[:, None], calls, puts)
+        return out.reshape((len(self.strikes),) + r.shape[1:])
+
+    def __matmul__(self, w: np.ndarray) -> np.ndarray:
+        return self.matvec(w)
+
+    @property
+    def T(self) -> "_TransposedHinge":
+        return _TransposedHinge(self)
+
+    def as_linear_operator(self):
+        """
+        scipy LinearOperator view, for iterative solvers such as lsqr.
+        """
+        from scipy.sparse.linalg import LinearOperator
+
+        return LinearOperator(self.shape, matvec=self.matvec, rmatvec=self.rmatvec, matmat=self.matvec, dtype=float)
+
+
+class _TransposedHinge:
+    def __init__(self, X: HingePayoffMatrix):
+        self.X = X
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.X.shape[::-1]
+
+    def __matmul__(self, r: np.ndarray) -> np.ndarray:
+        return self.X.rmatvec(r)
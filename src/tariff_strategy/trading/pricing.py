@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import numpy as np
+from scipy.special import ndtr
+
+
+def _d1_d2(S, K, T, sigma, r):
+    S, K, T, sigma = (np.asarray(x, dtype=float) for x in (S, K, T, sigma))
+    vol = sigma * np.sqrt(T)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / vol
+    return d1, d1 - vol
+
+
+def bs_call_price(S, K, T, sigma, r: float = 0.0) -> np.ndarray:
+    """
+    Black-Scholes call price per share, broadcasting over all inputs.
+    T in years, sigma annualised.
+    """
+    d1, d2 = _d1_d2(S, K, T, sigma, r)
+    price = S * ndtr(d1) - K * np.exp(-r * np.asarray(T, dtype=float)) * ndtr(d2)
+    intrinsic = np.maximum(np.asarray(S, dtype=float) - K * np.exp(-r * np.asarray(T, dtype=float)), 0.0)
+    return np.where(np.isfinite(d1), price, intrinsic)
+
+
+def bs_put_price(S, K, T, sigma, r: float = 0.0) -> np.ndarray:
+    """
+    Black-Scholes put price per share, broadcasting over all inputs.
+    T in years, sigma annualised.
+    """
+    d1, d2 = _d1_d2(S, K, T, sigma, r)
+    disc = np.exp(-r * np.asarray(T, dtype=float))
+    price = K * disc * ndtr(-d2) - S * ndtr(-d1)
+    intrinsic = np.maximum(K * disc - np.asarray(S, dtype=float), 0.0)
+    return np.where(np.isfinite(d1), price, intrinsic)
+
+
+def bs_vega(S, K, T, sigma, r: float = 0.0) -> np.ndarray:
+    """
+    dPrice/dsigma per share (same for calls and puts).
+    """
+    d1, _ = _d1_d2(S, K, T, sigma, r)
+    vega = np.asarray(S, dtype=float) * np.exp(-0.5 * d1 ** 2) / np.sqrt(2 * np.pi) * np.sqrt(np.asarray(T, dtype=float))
+    return np.where(np.isfinite(d1), vega, 0.0)
+
+
+def implied_vol(
+    price,
+    S,
+    K,
+    T,
+    is_call,
+    r: float = 0.0,
+    tol: float = 1e-8,
+    max_iter: int = 100,
+    sigma_lo: float = 1e-4,
+    sigma_hi: float = 5.0,
+) -> np.ndarray:
+    """
+    Black-Scholes implied vol for whole chains at once.
+
+    Newton steps on sigma, falling back to bisection whenever a step leaves
+    the current bracket or vega is too small to trust; only unconverged
+    contracts are iterated; tol is in vol units. Prices outside the
+    no-arbitrage bounds (or vols outside [sigma_lo, sigma_hi]) give NaN.
+    """
+    price, S, K, T, is_call = np.broadcast_arrays(
+        np.asarray(price, dtype=float),
+        np.asarray(S, dtype=float),
+        np.asarray(K, dtype=float),
+        np.asarray(T, dtype=float),
+        np.asarray(is_call, dtype=bool),
+    )
+    shape = price.shape
+    price, S, K, T, is_call = (a.ravel() for a in (price, S, K, T, is_call))
+
+    disc_K = K * np.exp(-r * T)
+    lower = np.where(is_call, np.maximum(S - disc_K, 0.0), np.maximum(disc_K - S, 0.0))
+    upper = np.where(is_call, S, disc_K)
+    ok = np.isfinite(price) & (T > 0) & (K > 0) & (price > lower) & (price < upper)
+
+    def model(i, sigma):
+        return np.where(
+            is_call[i],
+            bs_call_price(S[i], K[i], T[i], sigma, r),
+            bs_put_price(S[i], K[i], T[i], sigma, r),
+        )
+
+    out = np.full(price.shape, np.nan)
+    idx = np.flatnonzero(ok)
+    lo = np.full(idx.size, sigma_lo)
+    hi = np.full(idx.size, sigma_hi)
+    # start at the inflection point of price in sigma, where Newton is monotone
+    sigma = np.clip(np.sqrt(2 * np.abs(np.log(S[idx] / K[idx]) + r * T[idx]) / T[idx]), 0.05, 1.0)
+
+    for _ in range(max_iter):
+        if idx.size == 0:
+            break
+        diff = model(idx, sigma) - price[idx]
+        vega = bs_vega(S[idx], K[idx], T[idx], sigma, r)
+        # converged once the next Newton step would be below tol
+        done = np.abs(diff) <= tol * vega
+        out[idx[done]] = sigma[done]
+
+        hi = np.where(diff > 0, sigma, hi)
+        lo = np.where(diff < 0, sigma, lo)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = sigma - diff / vega
+        bisect = ~np.isfinite(step) | (step <= lo) | (step >= hi)
+        sigma = np.where(bisect, 0.5 * (lo + hi), step)
+
+        # bracket collapsed first (vega ~ 0): accept the midpoint unless it
+        # sits on a bound (price not attainable in range)
+        collapsed = ~done & (hi - lo <= tol)
+        mid = 0.5 * (lo + hi)
+        accept = collapsed & (mid > sigma_lo * (1 + 1e-6)) & (mid < sigma_hi * (1 - 1e-6))
+        out[idx[accept]] = mid[accept]
+
+        keep = ~done & ~collapsed
+        idx, lo, hi, sigma = idx[keep], lo[keep], hi[keep], sigma[keep]
+
+    # still open after max_iter: best estimate, same bound rule
+    inside = (sigma > sigma_lo * (1 + 1e-6)) & (sigma < sigma_hi * (1 - 1e-6))
+    out[idx[inside]] = sigma[inside]
+    return out.reshape(shape)
+
+
+def bs_greeks(S, K, T, sigma, is_call, r: float = 0.0) -> dict:
+    """
+    Price, delta, gamma, vega and theta per share, broadcasting over all
+    inputs. vega is per 1.00 of vol, theta is dV/dt per year (negative for
+    long options). At expiry the values are intrinsic and the Greeks vanish
+    apart from the delta step.
+    """
+    is_call = np.asarray(is_call, dtype=bool)
+    S_, K_, T_, sigma_ = (np.asarray(x, dtype=float) for x in (S, K, T, sigma))
+    d1, d2 = _d1_d2(S, K, T, sigma, r)
+    live = np.isfinite(d1)
+    d1 = np.where(live, d1, np.where(S_ > K_, np.inf, -np.inf))
+    d2 = np.where(live, d2, d1)
+
+    disc_K = K_ * np.exp(-r * T_)
+    pdf = np.exp(-0.5 * d1 ** 2) / np.sqrt(2 * np.pi)
+    sqrt_T = np.sqrt(T_)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gamma = np.where(live, pdf / (S_ * sigma_ * sqrt_T), 0.0)
+        decay = np.where(live, -S_ * pdf * sigma_ / (2 * sqrt_T), 0.0)
+
+    call = S_ * ndtr(d1) - disc_K * ndtr(d2)
+    put = disc_K * ndtr(-d2) - S_ * ndtr(-d1)
+    return {
+        "price": np.where(is_call, call, put),
+        "delta": np.where(is_call, ndtr(d1), ndtr(d1) - 1.0),
+        "gamma": gamma,
+        "vega": np.where(live, S_ * pdf * sqrt_T, 0.0),
+        "theta": np.where(live, np.where(is_call, decay - r * disc_K * ndtr(d2), decay + r * disc_K * ndtr(-d2)), 0.0),
+    }
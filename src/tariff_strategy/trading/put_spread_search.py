@@ -2,7 +2,9 @@ from __future__ import annotations
 import numpy as np
 import pandas as pd
 
-from .payoff import put_payoff
+from ..data.chain_arrays import ChainArrays
+from .execution import ExecutionModel
+from .payoff import put_payoff, put_payoff_matrix
 
 
 def evaluate_put_spread(
@@ -10,10 +12,12 @@ def evaluate_put_spread(
     K_long: float,
     K_short: float,
     target: np.ndarray,
+    weights: np.ndarray | None = None,
 ) -> float:
     """
     Compute squared error between SCALED put spread payoff and target payoff.
     Scaling makes max payoff = 1 so it's comparable to the target curve.
+    weights (e.g. density_weights) turn the mean into a probability-weighted one.
     """
     width = K_long - K_short
     if width <= 0:
@@ -22,31 +26,43 @@ def evaluate_put_spread(
     payoff = put_payoff(S_grid, K_long) - put_payoff(S_grid, K_short)
     payoff_scaled = payoff / width
 
-    error = np.mean((payoff_scaled - target) ** 2)
+    error = np.average((payoff_scaled - target) ** 2, weights=weights)
     return error
 
 
 
 def search_best_put_spread(
     S_grid: np.ndarray,
-    puts: pd.DataFrame,
+    puts: pd.DataFrame | ChainArrays,
     target: np.ndarray,
+    weights: np.ndarray | None = None,
+    execution: ExecutionModel | None = None,
+    quantity: float = 1.0,
 ) -> pd.DataFrame:
     """
     Brute-force search over all valid put spreads (K_long > K_short).
+    puts is a puts DataFrame or a ChainArrays, whose put rows are used.
+    cost is at mid, or at execution fill prices for `quantity` spreads.
     """
     results = []
 
-    strikes = puts["strike"].to_numpy(dtype=float)
-    mids = puts["mid"].to_numpy(dtype=float)
+    if isinstance(puts, ChainArrays):
+        arrays = puts.puts()
+        strikes, mids = arrays.strike, arrays.mid
+        if execution is not None:
+            puts = arrays.meta()
+    else:
+        strikes = puts["strike"].to_numpy(dtype=float)
+        mids = puts["mid"].to_numpy(dtype=float)
+    buy, sell = (mids, mids) if execution is None else execution.prices(puts, quantity)
 
     for i, K_long in enumerate(strikes):
         for j, K_short in enumerate(strikes):
             if K_long <= K_short:
                 continue
 
-            cost = mids[i] - mids[j]
-            error = evaluate_put_spread(S_grid, K_long, K_short, target)
+            cost = buy[i] - sell[j]
+            error = evaluate_put_spread(S_grid, K_long, K_short, target, weights=weights)
 
             results.append({
                 "K_long": K_long,
@@ -56,3 +72,113 @@ def search_best_put_spread(
             })
 
     return pd.DataFrame(results).sort_values("error").reset_index(drop=True)
+
+
+def keep_smallest(values: np.ndarray, k: int | None) -> np.ndarray:
+    """
+    Indices of the k smallest values (unordered), or all indices when k is None.
+    """
+    if k is None or k >= len(values):
+        return np.arange(len(values))
+    return np.argpartition(values, k - 1)[:k]
+
+
+def search_put_spreads_batched(
+    S_grid: np.ndarray,
+    puts: pd.DataFrame | ChainArrays,
+    target: np.ndarray,
+    top_k: int | None = 100,
+    chunk_size: int = 256,
+    weights: np.ndarray | None = None,
+    execution: ExecutionModel | None = None,
+    quantity: float = 1.0,
+) -> pd.DataFrame:
+    """
+    Vectorised version of search_best_put_spread.
+
+    The put payoff matrix P is built once. For a spread (i long, j short) with
+    width w = K_i - K_j, the scaled-payoff MSE expands to
+
+        (G_ii - 2 G_ij + G_jj) / w^2 - 2 (b_i - b_j) / w + mean(target^2)
+
+    with G = P'P / n_grid and b = P'target / n_grid, so every pair is scored
+    from the Gram matrix without touching the grid again. With weights (e.g.
+    density_weights on an adaptive_price_grid) the means become weighted
+    ones: G = P' diag(w) P, b = P' diag(w) target, with w summing to 1.
+    Long legs are processed chunk_size rows at a time to bound memory, and
+    only the best top_k spreads are kept (top_k=None keeps all of them).
+
+    cost is at mid, or with an ExecutionModel the long leg is bought and the
+    short leg sold at their fill prices for `quantity` spreads. puts may be
+    a ChainArrays, whose put rows are used.
+
+    Returns the same columns as search_best_put_spread, sorted by error.
+    """
+    S_grid = np.asarray(S_grid, dtype=float)
+    target = np.asarray(target, dtype=float)
+
+    if isinstance(puts, ChainArrays):
+        arrays = puts.puts()
+        strikes, mids = arrays.strike, arrays.mid
+        if execution is not None:
+            puts = arrays.meta()
+    else:
+        strikes = puts["strike"].to_numpy(dtype=float)
+        mids = puts["mid"].to_numpy(dtype=float)
+    buy, sell = (mids, mids) if execution is None else execution.prices(puts, quantity)
+
+    order = np.argsort(strikes, kind="stable")
+    strikes = strikes[order]
+    buy, sell = buy[order], sell[order]
+
+    n_grid = len(S_grid)
+    if weights is None:
+        wts = np.full(n_grid, 1.0 / n_grid)
+    else:
+        wts = np.asarray(weights, dtype=float)
+        if len(wts) != n_grid:
+            raise ValueError("weights must have one entry per grid point.")
+        wts = wts / wts.sum()
+
+    P = put_payoff_matrix(S_grid, strikes)
+    gram = P.T @ (P * wts[:, None])
+    b = P.T @ (wts * target)
+    t2 = float(wts @ target ** 2)
+    diag = np.diag(gram)
+
+    best_err = np.empty(0, dtype=float)
+    best_i = np.empty(0, dtype=np.intp)
+    best_j = np.empty(0, dtype=np.intp)
+
+    for start in range(0, len(strikes), chunk_size):
+        stop = min(start + chunk_size, len(strikes))
+
+        # strikes are sorted, so every valid short leg sits in columns [0, stop)
+        width = strikes[start:stop, None] - strikes[None, :stop]
+        valid = width > 0
+        if not valid.any():
+            continue
+
+        w = np.where(valid, width, 1.0)
+        sq = diag[start:stop, None] - 2.0 * gram[start:stop, :stop] + diag[None, :stop]
+        cross = b[start:stop, None] - b[None, :stop]
+        err = np.maximum(sq / w ** 2 - 2.0 * cross / w + t2, 0.0)
+
+        rows, cols = np.nonzero(valid)
+        err = err[rows, cols]
+        keep = keep_smallest(err, top_k)
+
+        best_err = np.concatenate([best_err, err[keep]])
+        best_i = np.concatenate([best_i, rows[keep] + start])
+        best_j = np.concatenate([best_j, cols[keep]])
+
+        keep = keep_smallest(best_err, top_k)
+        best_err, best_i, best_j = best_err[keep], best_i[keep], best_j[keep]
+
+    out = pd.DataFrame({
+        "K_long": strikes[best_i],
+        "K_short": strikes[best_j],
+        "cost": (buy[best_i] - sell[best_j]) * 100,  # dollar cost
+        "error": best_err,
+    })
+    return out.sort_values("error", kind="stable").reset_index(drop=True)
@@ -0,0 +1,149 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .optimizer_inputs import cost_vector
+from .pricing import bs_greeks, implied_vol
+from .vol_surface import DAYS_PER_YEAR, VolSurface
+
+GREEKS = ("value", "pnl", "delta", "gamma", "vega", "theta")
+
+
+@dataclass(frozen=True)
+class RiskCube:
+    """
+    Mark-to-market and Greeks of one or more structures over a
+    (spot move, days elapsed, vol shift) grid.
+
+    Every field in GREEKS has shape (n_structures, n_spot, n_days, n_vol) and
+    is in dollars for the whole position: value and pnl (value - premium),
+    delta per $1 of spot, gamma per $1 of spot per $1, vega per vol point
+    (0.01) and theta per calendar day.
+    """
+    spot: np.ndarray
+    days: np.ndarray
+    vol_shift: np.ndarray
+    premium: np.ndarray
+    value: np.ndarray
+    pnl: np.ndarray
+    delta: np.ndarray
+    gamma: np.ndarray
+    vega: np.ndarray
+    theta: np.ndarray
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Long table: one row per structure and grid point.
+        """
+        idx = np.indices(self.value.shape).reshape(4, -1)
+        out = pd.DataFrame({
+            "structure": idx[0],
+            "spot": self.spot[idx[1]],
+            "days": self.days[idx[2]],
+            "vol_shift": self.vol_shift[idx[3]],
+        })
+        for name in GREEKS:
+            out[f"{name}_$" if name in ("value", "pnl") else name] = getattr(self, name).reshape(-1)
+        return out
+
+
+def contract_vols(
+    meta: pd.DataFrame,
+    s0: float,
+    T: float,
+    vol: Union[None, float, np.ndarray, VolSurface] = None,
+    r: float = 0.0,
+) -> np.ndarray:
+    """
+    Base vol per meta row.
+
+    - None: implied from each contract's mid (so an unshocked mark equals the
+      chain), falling back to the median where the mid has no implied vol
+    - a scalar or an array aligned with meta
+    - a VolSurface, read at each strike and T
+    """
+    K = meta["strike"].to_numpy(dtype=float)
+    if isinstance(vol, VolSurface):
+        return vol.iv(K, T)
+    if vol is not None:
+        return np.broadcast_to(np.asarray(vol, dtype=float), K.shape).copy()
+
+    iv = implied_vol(meta["mid"].to_numpy(dtype=float), s0, K, T, (meta["type"] == "call").to_numpy(), r=r)
+    if np.isnan(iv).all():
+        raise ValueError("No contract mid has an implied vol; pass vol explicitly.")
+    return np.where(np.isnan(iv), np.nanmedian(iv), iv)
+
+
+def structure_risk_cube(
+    meta: pd.DataFrame,
+    weights: np.ndarray,
+    s0: float,
+    T: float,
+    spot_moves: Sequence[float] = (0.0,),
+    days: Sequence[float] = (0.0,),
+    vol_shifts: Sequence[float] = (0.0,),
+    vol: Union[None, float, np.ndarray, VolSurface] = None,
+    r: float = 0.0,
+    premium: Optional[np.ndarray] = None,
+    multiplier: int = 100,
+) -> RiskCube:
+    """
+    Value every structure and its Greeks over the full shock grid in one
+    broadcast Black-Scholes evaluation.
+
+    - meta: contract rows (type, strike, mid), e.g. from build_design_matrix
+    - weights: (n_contracts,) or (n_structures, n_contracts) signed quantities
+    - T: years to expiry today; days elapsed shrink it (floored at expiry)
+    - spot_moves are relative (-0.1 = spot down 10%), vol_shifts additive
+    - premium: dollars paid per structure, cost_vector(meta) @ w by default
+    """
+    W = np.atleast_2d(np.asarray(weights, dtype=float))
+    if W.shape[1] != len(meta):
+        raise ValueError("weights must have one column per meta row.")
+    premium = W @ cost_vector(meta, multiplier) if premium is None else np.broadcast_to(
+        np.asarray(premium, dtype=float), (W.shape[0],)
+    )
+
+    spot = s0 * (1.0 + np.asarray(spot_moves, dtype=float))
+    days = np.asarray(days, dtype=float)
+    vol_shift = np.asarray(vol_shifts, dtype=float)
+
+    # only contracts that appear in some structure need pricing
+    used = np.flatnonzero(np.any(W != 0, axis=0))
+    rows = meta.iloc[used]
+    base = contract_vols(rows, s0, T, vol=vol, r=r)
+
+    S = spot[:, None, None, None]
+    T_rem = np.maximum(T - days / DAYS_PER_YEAR, 0.0)[None, :, None, None]
+    sigma = np.maximum(base[None, None, None, :] + vol_shift[None, None, :, None], 1e-6)
+    g = bs_greeks(
+        S,
+        rows["strike"].to_numpy(dtype=float),
+        T_rem,
+        sigma,
+        (rows["type"] == "call").to_numpy(),
+        r=r,
+    )
+
+    scale = {"price": 1.0, "delta": 1.0, "gamma": 1.0, "vega": 0.01, "theta": 1.0 / DAYS_PER_YEAR}
+    Wu = W[:, used] * multiplier
+    out = {}
+    for name, unit in scale.items():
+        # (n_spot, n_days, n_vol, n_used) @ (n_used, n_structures) -> structures first
+        out[name] = np.moveaxis((g[name] * unit) @ Wu.T, -1, 0)
+
+    return RiskCube(
+        spot=spot,
+        days=days,
+        vol_shift=vol_shift,
+        premium=premium,
+        value=out["price"],
+        pnl=out["price"] - premium[:, None, None, None],
+        delta=out["delta"],
+        gamma=out["gamma"],
+        vega=out["vega"],
+        theta=out["theta"],
+    )
@@ -0,0 +1,577 @@
+from __future__ import annotations
+import time
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.optimize import Bounds, LinearConstraint, milp
+
+from .payoff import HingePayoffMatrix
+
+# Grid points the local search scores moves on (see _search_rows)
+_SEARCH_ROWS = 64
+# +-1 steps on a (leg, other column) pair
+_PAIR_STEPS = np.array([[-1.0, -1.0], [-1.0, 1.0], [1.0, -1.0], [1.0, 1.0]])
+
+
+@dataclass(frozen=True)
+class StructureFit:
+    weights: np.ndarray   # signed contracts per column of X (long > 0, short < 0)
+    legs: pd.DataFrame    # meta rows with a non-zero weight, plus "quantity"
+    premium: float        # net premium in dollars (longs at cost, shorts at sell_cost)
+    mae: float            # mean absolute error vs target (the LP objective)
+    mse: float            # mean squared error vs target
+    status: str
+
+
+def _payoff_blocks(
+    X: Union[np.ndarray, HingePayoffMatrix],
+) -> tuple[sparse.csr_matrix, sparse.csr_matrix, sparse.csr_matrix, sparse.csr_matrix]:
+    """
+    X @ w as linear constraints with auxiliary variables u:
+
+        X @ w = P_w @ w + P_u @ u,   Q_w @ w + Q_u @ u = 0
+
+    A dense X is P_w itself, with no u. A HingePayoffMatrix is described by
+    its hinges instead, with O(n_grid + n_contracts) non-zeros: a put is the
+    call at its strike minus (S - K), and over the sorted grid the calls'
+    payoff F follows the sum A of w over the strikes below each point,
+
+        A_i = A_{i-1} + sum_{S_{i-1} <= K_j < S_i} w_j
+        F_i = F_{i-1} + (S_i - S_{i-1}) A_{i-1} + sum_{S_{i-1} <= K_j < S_i} w_j (S_i - K_j)
+
+    so u = [A (n_grid), F (n_grid), sum of w K over puts, sum of w over puts]
+    and X @ w = F + u_K - S u_1.
+    """
+    n_grid, n = X.shape
+    if not isinstance(X, HingePayoffMatrix):
+        return sparse.csr_matrix(X), sparse.csr_matrix((n_grid, 0)), sparse.csr_matrix((0, n)), sparse.csr_matrix((0, 0))
+
+    order = np.argsort(X.S, kind="stable")
+    S = X.S[order]
+    K = X.strikes
+    A, F, put_K, put_1 = 0, n_grid, 2 * n_grid, 2 * n_grid + 1
+    grid = np.arange(n_grid)
+    rest = grid[1:]
+
+    # strikes enter at the first grid point above them
+    j = np.flatnonzero(np.searchsorted(S, K, side="right") < n_grid)
+    first = np.searchsorted(S, K[j], side="right")
+    puts = np.flatnonzero(~X.is_call)
+    Q_w = sparse.csr_matrix(
+        (
+            np.concatenate([-np.ones(len(j)), K[j] - S[first], -K[puts], -np.ones(len(puts))]),
+            (
+                np.concatenate([A + first, F + first, np.full(len(puts), put_K), np.full(len(puts), put_1)]),
+                np.concatenate([j, j, puts, puts]),
+            ),
+        ),
+        shape=(2 * n_grid + 2, n),
+    )
+    Q_u = sparse.csr_matrix(
+        (
+            np.concatenate([np.ones(n_grid), -np.ones(n_grid - 1), np.ones(n_grid), -np.ones(n_grid - 1), -np.diff(S), [1.0, 1.0]]),
+            (
+                np.concatenate([A + grid, A + rest, F + grid, F + rest, F + rest, [put_K, put_1]]),
+                np.concatenate([A + grid, A + rest - 1, F + grid, F + rest - 1, A + rest - 1, [put_K, put_1]]),
+            ),
+        ),
+        shape=(2 * n_grid + 2, 2 * n_grid + 2),
+    )
+    position = np.empty(n_grid, dtype=int)
+    position[order] = grid
+    P_u = sparse.csr_matrix(
+        (
+            np.concatenate([np.ones(n_grid), np.ones(n_grid), -X.S]),
+            (np.tile(grid, 3), np.concatenate([F + position, np.full(n_grid, put_K), np.full(n_grid, put_1)])),
+        ),
+        shape=(n_grid, 2 * n_grid + 2),
+    )
+    return sparse.csr_matrix((n_grid, n)), P_u, Q_w, Q_u
+
+
+def _solve(
+    X: Union[np.ndarray, HingePayoffMatrix],
+    y: np.ndarray,
+    cost: np.ndarray,
+    sell_cost: np.ndarray,
+    budget: Optional[float],
+    max_legs: Optional[int],
+    max_units: float,
+    allow_short: bool,
+    integer: bool,
+    unit_penalty: float,
+    time_limit: Optional[float],
+    grid_weights: np.ndarray,
+) -> tuple[np.ndarray, str]:
+    """
+    Build and solve the L1 fit as an LP / MILP. Returns signed weights and the solver message.
+    """
+    n_grid, n = X.shape
+    use_legs = max_legs is not None
+    n_z = n if use_legs else 0
+    P_w, P_u, Q_w, Q_u = _payoff_blocks(X)
+    n_u = P_u.shape[1]
+
+    # variables: [w_long (n), w_short (n), e_over (n_grid), e_under (n_grid), z (n_z), u (n_u)]
+    n_vars = 2 * n + 2 * n_grid + n_z + n_u
+
+    obj = np.concatenate([
+        np.full(2 * n, unit_penalty),
+        np.tile(grid_weights, 2),
+        np.zeros(n_z + n_u),
+    ])
+
+    eye_g = sparse.identity(n_grid, format="csr")
+    blocks = [P_w, -P_w, -eye_g, eye_g, sparse.csr_matrix((n_grid, n_z)), P_u]
+    constraints = [LinearConstraint(sparse.hstack(blocks, format="csr"), y, y)]
+    if n_u:
+        blocks = [Q_w, -Q_w, sparse.csr_matrix((Q_w.shape[0], 2 * n_grid + n_z)), Q_u]
+        constraints.append(LinearConstraint(sparse.hstack(blocks, format="csr"), 0.0, 0.0))
+
+    if budget is not None:
+        row = np.concatenate([cost, -sell_cost, np.zeros(2 * n_grid + n_z + n_u)])
+        constraints.append(LinearConstraint(row[None, :], -np.inf, budget))
+
+    if use_legs:
+        eye_n = sparse.identity(n, format="csr")
+        zeros_n = sparse.csr_matrix((n, n))
+        zeros_e = sparse.csr_matrix((n, 2 * n_grid))
+        zeros_u = sparse.csr_matrix((n, n_u))
+        link_long = sparse.hstack([eye_n, zeros_n, zeros_e, -max_units * eye_n, zeros_u])
+        link_short = sparse.hstack([zeros_n, eye_n, zeros_e, -max_units * eye_n, zeros_u])
+        constraints.append(LinearConstraint(sparse.vstack([link_long, link_short], format="csr"), -np.inf, 0.0))
+
+        count = np.concatenate([np.zeros(2 * n + 2 * n_grid), np.ones(n_z), np.zeros(n_u)])
+        constraints.append(LinearConstraint(count[None, :], 0, max_legs))
+
+    lower = np.concatenate([np.zeros(2 * n + 2 * n_grid + n_z), np.full(n_u, -np.inf)])
+    upper = np.concatenate([
+        np.full(n, max_units),
+        np.full(n, max_units if allow_short else 0.0),
+        np.full(2 * n_grid, np.inf),
+        np.ones(n_z),
+        np.full(n_u, np.inf),
+    ])
+    integrality = np.concatenate([
+        np.full(2 * n, 1 if integer else 0),
+        np.zeros(2 * n_grid),
+        np.ones(n_z),
+        np.zeros(n_u),
+    ])
+
+    options = {} if time_limit is None else {"time_limit": time_limit}
+    res = milp(
+        c=obj,
+        constraints=constraints,
+        bounds=Bounds(lower, upper),
+        integrality=integrality,
+        options=options,
+    )
+    if res.x is None:
+        raise ValueError(f"Structure optimisation failed: {res.message}")
+
+    w = res.x[:n] - res.x[n : 2 * n]
+    w[np.abs(w) < 1e-9] = 0.0
+    if integer:
+        w = np.round(w)
+    return w, res.message
+
+
+def _objective(
+    W: np.ndarray,
+    X: np.ndarray,
+    y: np.ndarray,
+    cost: np.ndarray,
+    sell_cost: np.ndarray,
+    budget: Optional[float],
+    grid_weights: np.ndarray,
+    unit_penalty: float,
+) -> np.ndarray:
+    """
+    _solve's objective for every row of W, inf where the net premium is over budget.
+    """
+    W = np.atleast_2d(W)
+    objective = np.abs(W @ X.T - y) @ grid_weights + unit_penalty * np.abs(W).sum(axis=1)
+    if budget is None:
+        return objective
+    premium = np.maximum(W, 0.0) @ cost + np.minimum(W, 0.0) @ sell_cost
+    return np.where(premium <= budget + 1e-9, objective, np.inf)
+
+
+def _drop_to_legs(
+    X: np.ndarray,
+    y: np.ndarray,
+    cost: np.ndarray,
+    sell_cost: np.ndarray,
+    w: np.ndarray,
+    max_legs: int,
+    common: dict,
+) -> np.ndarray:
+    """
+    LP-guided cardinality: keep the legs with the largest mean |payoff|
+    contribution and re-solve the LP on them, until max_legs are left. A
+    wide support is halved per round, a narrow one loses one leg at a time.
+    """
+    support = np.flatnonzero(w)
+    while len(support) > max_legs:
+        contribution = np.abs(w[support]) * (common["grid_weights"] @ np.abs(X[:, support]))
+        keep = len(support) // 2 if len(support) > 2 * max_legs else len(support) - 1
+        support = np.sort(support[np.argsort(-contribution, kind="stable")[:keep]])
+        w_sub, _ = _solve(X[:, support], y, cost[support], sell_cost[support], max_legs=None, integer=False, **common)
+        w = np.zeros(len(w))
+        w[support] = w_sub
+        support = np.flatnonzero(w)
+    return w
+
+
+def _search_rows(grid_weights: np.ndarray, max_rows: int = _SEARCH_ROWS) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Grid rows for the local search and their weights: every step-th row,
+    carrying the weight of the rows around it in grid order, so the search
+    sees a coarse copy of the objective. Grids up to max_rows are kept whole.
+    """
+    n_grid = len(grid_weights)
+    if n_grid <= max_rows:
+        return np.arange(n_grid), grid_weights
+    step = -(-n_grid // max_rows)
+    rows = np.arange(step // 2, n_grid, step)
+    edges = np.concatenate([[0], (rows[1:] + rows[:-1]) // 2 + 1])
+    return rows, np.add.reduceat(grid_weights, edges)
+
+
+class _LocalSearch:
+    """
+    Best-improvement descent over whole-contract moves that keep the
+    bounds, the budget and max_legs:
+
+    - set one column to its best value: the objective is convex along a
+      column, so that is the weighted median of the column's breakpoints
+      -r_i / X_ij, rounded down or up (or 0, dropping a leg)
+    - move one leg's whole quantity to another column (a strike shift)
+    - +-1 on a leg and +-1 on any other column, tried when neither of the
+      above improves
+
+    Each kind of move is scored for all columns at once from the current
+    residual, so a pass costs O(n_legs * n * n_grid) in a few array ops.
+    """
+
+    def __init__(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        cost: np.ndarray,
+        sell_cost: np.ndarray,
+        budget: Optional[float],
+        max_legs: Optional[int],
+        max_units: float,
+        allow_short: bool,
+        grid_weights: np.ndarray,
+        unit_penalty: float,
+    ):
+        self.Xt = np.ascontiguousarray(X.T)
+        self.y, self.grid_weights, self.unit_penalty = y, grid_weights, unit_penalty
+        self.cost, self.sell_cost = cost, sell_cost
+        self.budget = np.inf if budget is None else budget + 1e-9
+        self.max_legs = X.shape[1] if max_legs is None else max_legs
+        self.hi = np.floor(max_units)
+        self.lo = -self.hi if allow_short else 0.0
+        self.cols = np.arange(X.shape[1])
+        nonzero = self.Xt != 0
+        self.inv = np.where(nonzero, -1.0 / np.where(nonzero, self.Xt, 1.0), 0.0)
+        self.slope = grid_weights * np.abs(self.Xt)
+
+    def premium(self, v: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        return self.cost[cols] * np.maximum(v, 0.0) + self.sell_cost[cols] * np.minimum(v, 0.0)
+
+    def objective(self, w: np.ndarray) -> float:
+        """
+        _solve's objective, inf when w breaks the budget or max_legs.
+        """
+        if self.premium(w, self.cols).sum() > self.budget or np.count_nonzero(w) > self.max_legs:
+            return np.inf
+        return float(self.grid_weights @ np.abs(w @ self.Xt - self.y) + self.unit_penalty * np.abs(w).sum())
+
+    def __call__(self, w: np.ndarray) -> tuple[np.ndarray, float]:
+        """
+        Local optimum from w and its objective.
+        """
+        Xt, g, penalty, cols = self.Xt, self.grid_weights, self.unit_penalty, self.cols
+        w = np.asarray(w, dtype=float).copy()
+        obj = self.objective(w)
+
+        while True:
+            r = w @ Xt - self.y
+            legs = w != 0
+            n_legs = np.count_nonzero(legs)
+            leg_premium = self.premium(w, cols)
+            premium = leg_premium.sum()
+            units = np.abs(w).sum()
+
+            # best value per column, from the weighted median of its breakpoints
+            breaks = r * self.inv
+            order = np.argsort(breaks, axis=1)
+            mass = np.cumsum(np.take_along_axis(self.slope, order, axis=1), axis=1)
+            median = np.take_along_axis(breaks, order, axis=1)[cols, (mass < 0.5 * mass[:, -1:]).sum(axis=1)]
+            room = self.budget - premium + leg_premium
+            with np.errstate(divide="ignore", invalid="ignore"):
+                top = np.where(room >= 0, room / self.cost, room / self.sell_cost)
+            top = np.minimum(self.hi, np.floor(top + 1e-9))
+            v = np.clip(w + median, self.lo, top)
+            V = np.stack([np.floor(v), np.ceil(v), np.zeros(len(w))], axis=1)
+            D = V - w[:, None]
+            obj1 = np.abs(r + D[:, :, None] * Xt[:, None, :]) @ g
+            obj1 += penalty * (units + np.abs(V) - np.abs(w)[:, None])
+            ok = (D != 0) & (V >= self.lo) & (V <= top[:, None])
+            ok &= n_legs + (V != 0) - legs[:, None] <= self.max_legs
+            obj1 = np.where(ok, obj1, np.inf)
+
+            # move a leg to another column
+            L = np.flatnonzero(legs)
+            wL = w[L][:, None]
+            obj2 = np.abs((r - wL * Xt[L])[:, None, :] + wL[:, :, None] * Xt[None, :, :]) @ g + penalty * units
+            ok = ~legs & (premium - leg_premium[L][:, None] + self.premium(wL, cols) <= self.budget)
+            obj2 = np.where(ok, obj2, np.inf)
+
+            # +-1 on a leg and +-1 on another column
+            obj3 = np.full((4, len(L), len(w)), np.inf)
+            if len(L) and not min(obj1.min(), obj2.min(initial=np.inf)) < obj - 1e-12:
+                step_a, step_b = _PAIR_STEPS[:, 0, None, None], _PAIR_STEPS[:, 1, None, None]
+                R = (r + np.array([-1.0, 1.0])[:, None, None] * Xt[L])[[0, 0, 1, 1]]
+                obj3 = np.abs(R[:, :, None, :] + step_b[..., None] * Xt) @ g
+                va, vb = wL + step_a, w + step_b
+                obj3 += penalty * (units + np.abs(va) - np.abs(wL) + np.abs(vb) - np.abs(w))
+                ok = (va >= self.lo) & (va <= self.hi) & (vb >= self.lo) & (vb <= self.hi) & (L[:, None] != cols)
+                ok &= n_legs - (va == 0) + (vb != 0) - legs <= self.max_legs
+                ok &= premium + self.premium(va, L[:, None]) - leg_premium[L][:, None] + self.premium(vb, cols) - leg_premium <= self.budget
+                obj3 = np.where(ok, obj3, np.inf)
+
+            best = [m.min(initial=np.inf) for m in (obj1, obj2, obj3)]
+            if not min(best) < obj - 1e-12:
+                return w, obj
+            obj = min(best)
+            if obj == best[0]:
+                j, q = np.unravel_index(np.argmin(obj1), obj1.shape)
+                w[j] = V[j, q]
+            elif obj == best[1]:
+                i, j = np.unravel_index(np.argmin(obj2), obj2.shape)
+                w[j], w[L[i]] = w[L[i]], 0.0
+            else:
+                q, i, j = np.unravel_index(np.argmin(obj3), obj3.shape)
+                w[L[i]] += _PAIR_STEPS[q, 0]
+                w[j] += _PAIR_STEPS[q, 1]
+
+
+def _incumbent(
+    X: np.ndarray,
+    y: np.ndarray,
+    cost: np.ndarray,
+    sell_cost: np.ndarray,
+    w_lp: np.ndarray,
+    max_legs: Optional[int],
+    integer: bool,
+    n_kicks: int,
+    search_time: Optional[float],
+    common: dict,
+) -> np.ndarray:
+    """
+    Heuristic solution of the MILP on the given columns.
+
+    _LocalSearch runs on a coarse grid (_search_rows) from flat (its first
+    moves build the best one- or two-contract structure, e.g. the best put
+    spread) and from the LP solution rounded to its max_legs largest legs,
+    then from random +-1/+-2 kicks to two columns of the best structure so
+    far (iterated local search with a fixed seed) until n_kicks kicks or
+    search_time seconds are used. The winner is polished on the full grid.
+
+    With integer=False the LP solution is first cut down to max_legs with
+    _drop_to_legs, the LP is re-solved on the legs the search picked, and
+    the better of that and the dropped LP solution is kept.
+    """
+    w = w_lp if integer or max_legs is None else _drop_to_legs(X, y, cost, sell_cost, w_lp, max_legs, common)
+
+    n = X.shape[1]
+    grid_weights = common["grid_weights"]
+    settings = (common["budget"], max_legs, common["max_units"], common["allow_short"])
+    rows, row_weights = _search_rows(grid_weights)
+    coarse = _LocalSearch(X[rows], y[rows], cost, sell_cost, *settings, row_weights, common["unit_penalty"])
+    full = _LocalSearch(X, y, cost, sell_cost, *settings, grid_weights, common["unit_penalty"])
+
+    start = w.copy()
+    if max_legs is not None:
+        contribution = np.abs(w) * (grid_weights @ np.abs(X))
+        start[np.argsort(-contribution, kind="stable")[max_legs:]] = 0.0
+    starts = (np.zeros(n), np.clip(np.round(start), coarse.lo, coarse.hi))
+    best, best_obj = min((coarse(v) for v in starts), key=lambda fit: fit[1])
+
+    rng = np.random.default_rng(0)
+    deadline = np.inf if search_time is None else time.perf_counter() + search_time
+    for _ in range(n_kicks):
+        if time.perf_counter() > deadline:
+            break
+        kicked = best.copy()
+        cols = rng.choice(n, size=min(2, n), replace=False)
+        kicked[cols] = np.clip(kicked[cols] + rng.choice([-2.0, -1.0, 1.0, 2.0], size=len(cols)), coarse.lo, coarse.hi)
+        if max_legs is not None:
+            extra = np.count_nonzero(kicked) - max_legs
+            if extra > 0:
+                kicked[rng.choice(np.flatnonzero(kicked), size=extra, replace=False)] = 0.0
+        fit, obj = coarse(kicked)
+        if obj < best_obj:
+            best, best_obj = fit, obj
+
+    best, _ = full(best)
+    if integer:
+        return best
+
+    support = np.flatnonzero(best)
+    if len(support) == 0:
+        return w
+    w_sub, _ = _solve(X[:, support], y, cost[support], sell_cost[support], max_legs=None, integer=False, **common)
+    refit = np.zeros(n)
+    refit[support] = w_sub
+    return min((w, refit), key=full.objective)
+
+
+def fit_structure(
+    X: Union[np.ndarray, HingePayoffMatrix],
+    y: np.ndarray,
+    cost: np.ndarray,
+    meta: Optional[pd.DataFrame] = None,
+    budget: Optional[float] = None,
+    max_legs: Optional[int] = None,
+    max_units: float = 10.0,
+    allow_short: bool = True,
+    integer: bool = False,
+    unit_penalty: float = 1e-6,
+    screen: bool = True,
+    neighbours: int = 2,
+    time_limit: Optional[float] = 0.25,
+    weights: Optional[np.ndarray] = None,
+    sell_cost: Optional[np.ndarray] = None,
+    n_kicks: int = 1000,
+    search_time: Optional[float] = 0.25,
+) -> StructureFit:
+    """
+    Fit a combination of listed options to a target payoff.
+
+    Solves, with HiGHS via scipy.optimize.milp,
+
+        min  mean_p |X w - y|  +  unit_penalty * sum |w|
+        s.t. cost @ w+ - sell_cost @ w- <= budget   (net premium, dollars)
+             #legs with w != 0 <= max_legs
+             -max_units <= w <= max_units
+
+    X and cost come from build_design_matrix / cost_vector, y from
+    downside_target_payoff. cost prices the long side w+ and sell_cost the
+    short side w- (cost by default, i.e. both at mid); execution_costs gives
+    both at fill prices. Weights are in contracts when y is in the same
+    per-share payoff units as X; use the target's scale argument to size it.
+    X may also be the lazy HingePayoffMatrix (build_design_matrix with
+    lazy=True): the LP then states X @ w through the hinges (_payoff_blocks),
+    and only the screened columns are ever made dense.
+
+    Without max_legs or integer this is a plain LP. max_legs adds one binary
+    per contract and integer=True forces whole contracts, which makes it a
+    MILP whose relaxation is weak: proving optimality can take seconds on a
+    dozen contracts and minutes on a few dozen. So the LP relaxation is
+    solved first and turned into a heuristic incumbent (_incumbent: an
+    iterated local search on a coarse copy of the grid, with up to n_kicks
+    restarts in at most search_time seconds, polished on the full grid).
+    search_time=None always runs all n_kicks, so fits are reproducible.
+    HiGHS then gets time_limit seconds to improve on the incumbent and the
+    better of the two is kept; time_limit=None runs the MILP to optimality,
+    time_limit=0 skips it. The status says which one won.
+
+    With screen=True the heuristic and the MILP only see the contracts the
+    LP used plus `neighbours` adjacent columns on each side (adjacent
+    strikes in a build_design_matrix layout), which keeps full chains fast;
+    screen=False searches every column. For whole contracts the relaxation
+    only does this screening, so it is solved on the coarse grid as well.
+
+    mean_p is a plain mean over the grid, or the weighted mean under
+    `weights` (e.g. density_weights), so errors count in proportion to how
+    likely each price is; mae / mse are reported the same way.
+    """
+    if not isinstance(X, HingePayoffMatrix):
+        X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    cost = np.asarray(cost, dtype=float)
+
+    n_grid, n = X.shape
+    if len(y) != n_grid:
+        raise ValueError("Target length must match the number of rows of X.")
+    if len(cost) != n:
+        raise ValueError("Cost vector length must match the number of columns of X.")
+    sell_cost = cost if sell_cost is None else np.asarray(sell_cost, dtype=float)
+    if len(sell_cost) != n:
+        raise ValueError("Sell cost vector length must match the number of columns of X.")
+    if weights is None:
+        grid_weights = np.full(n_grid, 1.0 / n_grid)
+    else:
+        grid_weights = np.asarray(weights, dtype=float)
+        if len(grid_weights) != n_grid:
+            raise ValueError("Weights length must match the number of rows of X.")
+        grid_weights = grid_weights / grid_weights.sum()
+
+    common = dict(
+        budget=budget,
+        max_units=max_units,
+        allow_short=allow_short,
+        unit_penalty=unit_penalty,
+        time_limit=None,
+        grid_weights=grid_weights,
+    )
+    if integer:
+        rows, row_weights = _search_rows(grid_weights)
+        relaxed = {**common, "grid_weights": row_weights}
+        w, message = _solve(X[rows, :], y[rows], cost, sell_cost, max_legs=None, integer=False, **relaxed)
+    else:
+        w, message = _solve(X, y, cost, sell_cost, max_legs=None, integer=False, **common)
+    needs_milp = integer or (max_legs is not None and np.count_nonzero(w) > max_legs)
+
+    if needs_milp:
+        if screen:
+            offsets = np.arange(-neighbours, neighbours + 1)
+            pool = np.unique(np.clip(np.flatnonzero(w)[:, None] + offsets[None, :], 0, n - 1))
+        else:
+            pool = np.arange(n)
+        Xp, cp, sp = X[:, pool], cost[pool], sell_cost[pool]
+        if isinstance(Xp, HingePayoffMatrix):
+            Xp = Xp.toarray()
+
+        w_pool = _incumbent(Xp, y, cp, sp, w[pool], max_legs, integer, n_kicks, search_time, common)
+        message = "Heuristic incumbent (MILP skipped)."
+        if time_limit is None or time_limit > 0:
+            try:
+                w_milp, milp_message = _solve(
+                    Xp, y, cp, sp, max_legs=max_legs, integer=integer, **{**common, "time_limit": time_limit}
+                )
+            except ValueError as exc:
+                w_milp, milp_message = None, str(exc)
+            message = f"Heuristic incumbent kept; {milp_message}"
+            if w_milp is not None:
+                obj = _objective(np.array([w_pool, w_milp]), Xp, y, cp, sp, budget, grid_weights, unit_penalty)
+                if obj[1] <= obj[0] + 1e-12:
+                    w_pool, message = w_milp, milp_message
+
+        if not np.isfinite(_objective(w_pool, Xp, y, cp, sp, budget, grid_weights, unit_penalty)[0]):
+            raise ValueError(f"Structure optimisation failed: {message}")
+        w = np.zeros(n)
+        w[pool] = w_pool
+
+    resid = X @ w - y
+    legs = meta if meta is not None else pd.DataFrame(index=range(n))
+    legs = legs.loc[w != 0].copy()
+    legs["quantity"] = w[w != 0]
+
+    return StructureFit(
+        weights=w,
+        legs=legs.reset_index(drop=True),
+        premium=float(cost @ np.maximum(w, 0.0) + sell_cost @ np.minimum(w, 0.0)),
+        mae=float(grid_weights @ np.abs(resid)),
+        mse=float(grid_weights @ resid ** 2),
+        status=message,
+    )
@@ -1,4 +1,5 @@
 from __future__ import annotations
+from typing import Optional
 import numpy as np
 import pandas as pd
 
@@ -11,6 +12,77 @@ def build_price_grid(s0: float, grid_min: float = 0.60, grid_max: float = 1.40,
     return np.linspace(grid_min * s0, grid_max * s0, n)
 
 
+def _cell_edges(S: np.ndarray) -> np.ndarray:
+    # each grid point owns the interval up to the midpoints with its
+    # neighbours; the end cells run out to 0 and +inf
+    mids = 0.5 * (S[1:] + S[:-1])
+    return np.concatenate([[0.0], mids, [np.inf]])
+
+
+def density_weights(
+    S_grid: np.ndarray,
+    S_T: Optional[np.ndarray] = None,
+    mixture=None,
+) -> np.ndarray:
+    """
+    Probability weight of every grid point under the terminal distribution,
+    summing to 1: the mass of the cell around each point, taken from the
+    simulated S_T (histogram) or exactly from a mixture's cdf (e.g.
+    mixture_from_calibration). Works for non-uniform grids, where the cell
+    widths double as quadrature weights.
+    """
+    S_grid = np.asarray(S_grid, dtype=float)
+    if np.any(np.diff(S_grid) <= 0):
+        raise ValueError("S_grid must be strictly increasing.")
+    edges = _cell_edges(S_grid)
+
+    if mixture is not None:
+        mass = np.diff(mixture.cdf(edges))
+    elif S_T is not None:
+        cells = np.searchsorted(edges, np.asarray(S_T, dtype=float), side="right") - 1
+        mass = np.bincount(cells, minlength=len(S_grid)).astype(float)
+    else:
+        raise ValueError("Pass simulated S_T or a mixture.")
+
+    total = mass.sum()
+    if total <= 0:
+        raise ValueError("No probability mass on the grid.")
+    return mass / total
+
+
+def adaptive_price_grid(
+    n: int,
+    S_T: Optional[np.ndarray] = None,
+    mixture=None,
+    q_lo: float = 0.001,
+    q_hi: float = 0.999,
+    include: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Non-uniform price grid with points at equally spaced quantiles of S_T
+    (or of a mixture), so the points sit where the probability mass is.
+
+    include adds fixed knots, e.g. strikes and the target's floor/cap, where
+    payoffs bend. Returns a sorted grid without duplicates.
+    """
+    q = np.linspace(q_lo, q_hi, n)
+    if mixture is not None:
+        # invert the cdf on a fine log-spaced grid spanning the mixture
+        spread = 8 * float(np.max(mixture.sigma))
+        lo = mixture.s0 * np.exp(float(np.min(mixture.mu)) - spread)
+        hi = mixture.s0 * np.exp(float(np.max(mixture.mu)) + spread)
+        x = np.geomspace(lo, hi, 20_000)
+        grid = np.interp(q, mixture.cdf(x), x)
+    elif S_T is not None:
+        grid = np.quantile(np.asarray(S_T, dtype=float), q)
+    else:
+        raise ValueError("Pass simulated S_T or a mixture.")
+
+    if include is not None:
+        grid = np.concatenate([grid, np.asarray(include, dtype=float)])
+    return np.unique(grid)
+
+
 def downside_target_payoff(
     S: np.ndarray,
     s0: float,
@@ -0,0 +1,224 @@
+from __future__ import annotations
+import warnings
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from ..data.market_data import OptionsChain
+from ..modeling.analytic import LognormalMixture
+from ..modeling.distribution import scenario_params
+from .execution import ExecutionModel
+from .optimizer_inputs import LIQUIDITY_COLUMNS
+from .pricing import bs_call_price, bs_put_price, implied_vol
+from .put_spread_search import keep_smallest
+from .vol_surface import DAYS_PER_YEAR, VolSurface, long_chain, year_fraction
+
+BASE_DAYS = 30  # horizon of sigma_30 / mu_30 and of the scenario tables
+
+
+def horizon_params(
+    mu_base: Union[float, np.ndarray],
+    sigma_base: Union[float, np.ndarray],
+    days: float,
+    base_days: float = BASE_DAYS,
+) -> tuple:
+    """
+    Scale 30-day (mu, sigma), scalars or per-scenario arrays, to another
+    horizon: drift linearly, vol with the square root of time.
+    """
+    f = days / base_days
+    return mu_base * f, sigma_base * np.sqrt(f)
+
+
+def horizon_mixture(
+    s0: float,
+    scenarios: pd.DataFrame,
+    mu_base: float,
+    sigma_base: float,
+    days: float,
+    base_days: float = BASE_DAYS,
+) -> LognormalMixture:
+    """
+    Terminal-price mixture `days` ahead: each scenario's 30-day (mu, sigma),
+    drift penalty and volatility multiplier included, is scaled to the
+    horizon with horizon_params, so the penalty grows with days / base_days
+    and the scenario vol with its square root.
+    """
+    mu, sigma = scenario_params(scenarios, mu_base=mu_base, sigma_base=sigma_base)
+    mu, sigma = horizon_params(mu, sigma, days, base_days)
+    return LognormalMixture(s0=float(s0), p=scenarios["p"].to_numpy(dtype=float), mu=mu, sigma=sigma)
+
+
+@dataclass(frozen=True)
+class ExpiryCurve:
+    """
+    Every listed contract valued on one price grid at a common horizon.
+
+    Contracts expiring at the horizon are worth their payoff; longer-dated
+    ones are worth their Black-Scholes value with the remaining life, so
+    calendars and mixed-tenor structures are ordinary column combinations
+    of X (e.g. for fit_structure).
+    """
+    S_grid: np.ndarray       # prices at the horizon
+    horizon_days: float
+    X: np.ndarray            # (n_grid, n_contracts) per-share values at the horizon
+    meta: pd.DataFrame       # type, strike, mid, quote columns, expiry, days, iv
+    blocks: Dict[str, slice]  # expiry -> its columns of X and rows of meta
+
+
+def _contract_meta(g: pd.DataFrame) -> pd.DataFrame:
+    # calls then puts by strike, as in build_design_matrix; symbols are optional
+    g = g.assign(_call=g["type"] != "call").sort_values(["_call", "strike"], kind="stable")
+    cols = ["type", "strike", "mid"] + [c for c in ("contractSymbol", *LIQUIDITY_COLUMNS) if c in g.columns]
+    meta = g[cols].rename(columns={"contractSymbol": "symbol"}).reset_index(drop=True)
+    meta["strike"] = meta["strike"].astype(float)
+    meta["mid"] = meta["mid"].astype(float)
+    for col in LIQUIDITY_COLUMNS:
+        if col in meta.columns:
+            meta[col] = pd.to_numeric(meta[col], errors="coerce").astype(float)
+    return meta
+
+
+def build_expiry_curve(
+    chains: Union[pd.DataFrame, Iterable[OptionsChain]],
+    S_grid: np.ndarray,
+    s0: float,
+    as_of: str,
+    horizon_days: float = BASE_DAYS,
+    vol: Optional[VolSurface] = None,
+    r: float = 0.0,
+) -> ExpiryCurve:
+    """
+    Value every contract of every expiry at least horizon_days out on S_grid;
+    shorter expiries are dropped with a warning.
+
+    - chains: cleaned OptionsChains or a long table (fetch_chains + mid)
+    - the remaining-life vol is the contract's own implied vol (sticky
+      strike, the expiry's median where the mid has none) or, with a
+      VolSurface, the surface at the strike and remaining life
+    - one (n_grid, n_contracts) block is computed per expiry and the blocks
+      sit side by side in X
+    """
+    table = long_chain(chains)
+    if "mid" not in table.columns:
+        raise ValueError("Chains have no 'mid' column; run clean_chain first.")
+    table = table.dropna(subset=["mid", "strike"])
+    S_grid = np.asarray(S_grid, dtype=float)
+
+    days_out = np.round(year_fraction(table["expiry"], as_of) * DAYS_PER_YEAR)
+    short = sorted(table.loc[days_out < horizon_days, "expiry"].unique())
+    if short:
+        warnings.warn(f"Dropping expiries before the {horizon_days:g}-day horizon: {', '.join(map(str, short))}")
+    table = table[days_out >= horizon_days]
+    if table.empty:
+        raise ValueError("No expiry reaches the horizon.")
+
+    X_blocks, metas, blocks = [], [], {}
+    col = 0
+    for expiry, g in table.groupby("expiry", sort=True):
+        meta = _contract_meta(g)
+
+        T = float(year_fraction(expiry, as_of)[0])
+        T_rem = max(T - horizon_days / DAYS_PER_YEAR, 0.0)
+        K = meta["strike"].to_numpy(dtype=float)
+        is_call = (meta["type"] == "call").to_numpy()
+
+        if vol is not None:
+            iv = vol.iv(K, max(T_rem, 1.0 / DAYS_PER_YEAR))
+        else:
+            iv = implied_vol(meta["mid"].to_numpy(dtype=float), s0, K, T, is_call, r=r)
+            iv = np.where(np.isnan(iv), np.nanmedian(iv) if np.isfinite(iv).any() else 0.3, iv)
+
+        S = S_grid[:, None]
+        X_blocks.append(np.where(
+            is_call[None, :],
+            bs_call_price(S, K[None, :], T_rem, iv[None, :], r),
+            bs_put_price(S, K[None, :], T_rem, iv[None, :], r),
+        ))
+        metas.append(meta.assign(expiry=expiry, days=round(T * DAYS_PER_YEAR), iv=iv))
+        blocks[expiry] = slice(col, col + len(meta))
+        col += len(meta)
+
+    return ExpiryCurve(
+        S_grid=S_grid,
+        horizon_days=horizon_days,
+        X=np.hstack(X_blocks),
+        meta=pd.concat(metas, ignore_index=True),
+        blocks=blocks,
+    )
+
+
+def search_two_leg_structures(
+    curve: ExpiryCurve,
+    target: np.ndarray,
+    weights: Optional[np.ndarray] = None,
+    types: Sequence[str] = ("put",),
+    top_k: Optional[int] = 100,
+    chunk_size: int = 256,
+    execution: Optional[ExecutionModel] = None,
+) -> pd.DataFrame:
+    """
+    Best long-one / short-one structures across every expiry pair (vertical
+    spreads, calendars and diagonals) for a target on the curve's grid.
+
+    Each pair is sized optimally: for d = X_long - X_short the weighted
+    least-squares scale is a = <d, y> / <d, d> and the error
+    <y, y> - <d, y>^2 / <d, d>, all read off one Gram matrix over the
+    candidate columns, long legs chunk_size at a time. Only pairs with a > 0
+    are kept. units is a (structures per unit of target), cost_per_unit is
+    one structure in dollars at mid or at execution fill prices and
+    total_cost is units * cost_per_unit.
+    """
+    target = np.asarray(target, dtype=float)
+    n_grid = len(curve.S_grid)
+    wts = np.full(n_grid, 1.0 / n_grid) if weights is None else np.asarray(weights, dtype=float) / np.sum(weights)
+
+    cols = np.flatnonzero(curve.meta["type"].isin(types).to_numpy())
+    meta = curve.meta.iloc[cols].reset_index(drop=True)
+    X = curve.X[:, cols]
+    mids = meta["mid"].to_numpy(dtype=float)
+    buy, sell = (mids, mids) if execution is None else execution.prices(meta)
+
+    gram = X.T @ (X * wts[:, None])
+    b = X.T @ (wts * target)
+    yy = float(wts @ target ** 2)
+    diag = np.diag(gram)
+    n = len(cols)
+
+    best_err = np.empty(0)
+    best_i = np.empty(0, dtype=np.intp)
+    best_j = np.empty(0, dtype=np.intp)
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        dd = diag[start:stop, None] - 2.0 * gram[start:stop] + diag[None, :]
+        dy = b[start:stop, None] - b[None, :]
+        valid = (dy > 0) & (dd > 1e-12 * max(yy, 1e-12))
+        valid[np.arange(stop - start), np.arange(start, stop)] = False
+        rows, cj = np.nonzero(valid)
+        err = np.maximum(yy - dy[rows, cj] ** 2 / dd[rows, cj], 0.0)
+        keep = keep_smallest(err, top_k)
+
+        best_err = np.concatenate([best_err, err[keep]])
+        best_i = np.concatenate([best_i, rows[keep] + start])
+        best_j = np.concatenate([best_j, cj[keep]])
+        keep = keep_smallest(best_err, top_k)
+        best_err, best_i, best_j = best_err[keep], best_i[keep], best_j[keep]
+
+    dd = diag[best_i] - 2.0 * gram[best_i, best_j] + diag[best_j]
+    units = (b[best_i] - b[best_j]) / dd
+    cost = (buy[best_i] - sell[best_j]) * 100  # dollar cost of one structure
+    out = pd.DataFrame({
+        "long_expiry": meta["expiry"].to_numpy()[best_i],
+        "long_type": meta["type"].to_numpy()[best_i],
+        "K_long": meta["strike"].to_numpy()[best_i],
+        "short_expiry": meta["expiry"].to_numpy()[best_j],
+        "short_type": meta["type"].to_numpy()[best_j],
+        "K_short": meta["strike"].to_numpy()[best_j],
+        "units": units,
+        "cost_per_unit": cost,
+        "total_cost": units * cost,
+        "error": best_err,
+    })
+    return out.sort_values("error", kind="stable").reset_index(drop=True)
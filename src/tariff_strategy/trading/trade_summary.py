@@ -1,5 +1,12 @@
 from __future__ import annotations
+from functools import partial
+from typing import Iterable, Optional, Union
 import numpy as np
+import pandas as pd
+
+from ..modeling.distribution import TerminalSample
+from ..modeling.parallel import sample_block, run_blocks
+from ..modeling.streaming import PnLAccumulator, StreamingHistogram
 
 
 def put_spread_metrics(K_long: float, K_short: float, premium_paid: float) -> dict:
@@ -34,3 +41,86 @@ def put_spread_payoff_dollars(S: np.ndarray, K_long: float, K_short: float, prem
     payoff = long_put - short_put
     pnl = payoff - premium_paid
     return pnl
+
+
+def put_spread_pnl_stats(
+    paths: Union[np.ndarray, Iterable[Union[np.ndarray, TerminalSample]]],
+    K_long: float,
+    K_short: float,
+    premium_paid: float,
+    bins: int = 200,
+) -> dict:
+    """
+    EV, std / standard error, P(P&L > 0) and P&L quantiles for 1 spread.
+
+    paths is either one array of S_T or an iterable of chunks (S_T arrays or
+    TerminalSample, e.g. from iter_terminal_prices), so arbitrarily many paths
+    can be scored in constant memory. The P&L histogram spans exactly
+    [-premium, max profit], so its counts do not depend on the chunking.
+    """
+    if isinstance(paths, np.ndarray):
+        paths = [paths]
+
+    acc = _pnl_accumulator(K_long, K_short, premium_paid, bins)
+    for chunk in paths:
+        st = chunk.S_T if isinstance(chunk, TerminalSample) else np.asarray(chunk, dtype=float)
+        acc.update(put_spread_payoff_dollars(st, K_long, K_short, premium_paid))
+
+    out = acc.summary()
+    out["histogram"] = acc.hist.to_frame()
+    return out
+
+
+def _pnl_accumulator(K_long: float, K_short: float, premium_paid: float, bins: int) -> PnLAccumulator:
+    width = (K_long - K_short) * 100
+    return PnLAccumulator(StreamingHistogram.linear(-premium_paid, width - premium_paid, bins))
+
+
+def _put_spread_block(n, seed_seq, K_long, K_short, premium_paid, bins, **sim_kwargs) -> PnLAccumulator:
+    acc = _pnl_accumulator(K_long, K_short, premium_paid, bins)
+    st = sample_block(n, seed_seq, **sim_kwargs).S_T
+    acc.update(put_spread_payoff_dollars(st, K_long, K_short, premium_paid))
+    return acc
+
+
+def put_spread_pnl_stats_parallel(
+    s0: float,
+    scenarios: pd.DataFrame,
+    mu_base: float,
+    sigma_base: float,
+    K_long: float,
+    K_short: float,
+    premium_paid: float,
+    n_sims: int = 10_000_000,
+    seed: int = 42,
+    block_size: int = 1_000_000,
+    n_workers: Optional[int] = None,
+    bins: int = 200,
+) -> dict:
+    """
+    put_spread_pnl_stats over n_sims simulated paths spread across processes.
+
+    Each block simulates and scores its own paths and only ships back a small
+    accumulator; accumulators are merged in block order, so results do not
+    depend on n_workers.
+    """
+    fn = partial(
+        _put_spread_block,
+        K_long=K_long,
+        K_short=K_short,
+        premium_paid=premium_paid,
+        bins=bins,
+        s0=s0,
+        scenarios=scenarios,
+        mu_base=mu_base,
+        sigma_base=sigma_base,
+    )
+    blocks = run_blocks(fn, n_sims=n_sims, seed=seed, block_size=block_size, n_workers=n_workers)
+
+    acc = blocks[0]
+    for other in blocks[1:]:
+        acc.merge(other)
+
+    out = acc.summary()
+    out["histogram"] = acc.hist.to_frame()
+    return out
@@ -0,0 +1,227 @@
+from __future__ import annotations
+import hashlib
+from dataclasses import dataclass
+from typing import Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from ..data.cache import MarketDataCache
+from ..data.market_data import OptionsChain
+from .pricing import bs_vega, implied_vol
+
+DAYS_PER_YEAR = 365.0
+
+
+def year_fraction(expiry, as_of) -> np.ndarray:
+    """
+    Calendar-day time to expiry in years.
+    """
+    expiry = pd.to_datetime(np.atleast_1d(expiry))
+    as_of = pd.Timestamp(as_of)
+    return np.asarray((expiry - as_of).days, dtype=float) / DAYS_PER_YEAR
+
+
+def long_chain(chain: Union[OptionsChain, Iterable[OptionsChain], pd.DataFrame]) -> pd.DataFrame:
+    """
+    One table with expiry and type columns, like fetch_chains returns, from
+    an OptionsChain, several of them, or an already-long table.
+    """
+    if isinstance(chain, pd.DataFrame):
+        return chain
+    chains = [chain] if isinstance(chain, OptionsChain) else list(chain)
+    return pd.concat(
+        [
+            pd.concat([c.calls.assign(type="call"), c.puts.assign(type="put")], ignore_index=True).assign(expiry=c.expiry)
+            for c in chains
+        ],
+        ignore_index=True,
+    )
+
+
+def chain_implied_vols(
+    chain: Union[OptionsChain, pd.DataFrame],
+    s0: float,
+    as_of: str,
+    r: float = 0.0,
+) -> pd.DataFrame:
+    """
+    Our own Black-Scholes implied vols from `mid` for every contract.
+
+    Takes a cleaned OptionsChain or a long table with expiry / type columns
+    (fetch_chains output) and adds T (years), k = log(K / F) and iv.
+    """
+    df = long_chain(chain).copy()
+    if "mid" not in df.columns:
+        raise ValueError("Chain has no 'mid' column; run clean_chain first.")
+
+    T = year_fraction(df["expiry"], as_of)
+    K = df["strike"].to_numpy(dtype=float)
+    df["T"] = T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        df["k"] = np.log(K / (s0 * np.exp(r * T)))
+    df["iv"] = implied_vol(
+        pd.to_numeric(df["mid"], errors="coerce").to_numpy(dtype=float),
+        s0,
+        K,
+        T,
+        (df["type"] == "call").to_numpy(),
+        r=r,
+    )
+    return df
+
+
+def fit_smile(k: np.ndarray, w: np.ndarray, weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Weighted least-squares quadratic in log-moneyness for total variance,
+    w(k) = a + b k + c k^2. Returns (a, b, c); fewer than three points give a
+    flat smile at the weighted mean.
+    """
+    k = np.asarray(k, dtype=float)
+    w = np.asarray(w, dtype=float)
+    sw = np.sqrt(np.ones_like(w) if weights is None else np.asarray(weights, dtype=float))
+    if len(k) < 3:
+        return np.array([np.average(w, weights=sw ** 2), 0.0, 0.0])
+    A = np.column_stack([np.ones_like(k), k, k ** 2])
+    coef, *_ = np.linalg.lstsq(A * sw[:, None], w * sw, rcond=None)
+    return coef
+
+
+@dataclass(frozen=True)
+class VolSurface:
+    """
+    Per-expiry smiles in total variance, interpolated linearly in total
+    variance across expiries at fixed log-moneyness.
+
+    Smiles are held flat outside the k range they were fitted on. Before the
+    first expiry the first smile's vol is used, after the last the last's.
+    """
+    s0: float
+    r: float
+    T: np.ndarray        # (n_expiries,) sorted
+    coef: np.ndarray     # (n_expiries, 3): a, b, c of w(k)
+    k_min: np.ndarray    # fitted k range per expiry
+    k_max: np.ndarray
+
+    def _smiles(self, k: np.ndarray) -> np.ndarray:
+        # total variance of every smile at k, trailing axis = expiry
+        kk = np.clip(k[..., None], self.k_min, self.k_max)
+        w = self.coef[:, 0] + self.coef[:, 1] * kk + self.coef[:, 2] * kk ** 2
+        return np.maximum(w, 1e-12)
+
+    def total_variance(self, k, T) -> np.ndarray:
+        k, T = np.broadcast_arrays(np.asarray(k, dtype=float), np.asarray(T, dtype=float))
+        w = self._smiles(k)
+        vol2 = w / self.T  # implied variance per smile
+
+        j = np.clip(np.searchsorted(self.T, T), 1, len(self.T) - 1) if len(self.T) > 1 else np.zeros(T.shape, int)
+        i = np.maximum(j - 1, 0)
+        w_i = np.take_along_axis(w, i[..., None], axis=-1)[..., 0]
+        w_j = np.take_along_axis(w, j[..., None], axis=-1)[..., 0]
+        T_i, T_j = self.T[i], self.T[j]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            frac = np.where(T_j > T_i, (T - T_i) / (T_j - T_i), 0.0)
+        inside = w_i + frac * (w_j - w_i)
+
+        first = vol2[..., 0] * T
+        last = vol2[..., -1] * T
+        return np.where(T <= self.T[0], first, np.where(T >= self.T[-1], last, inside))
+
+    def iv(self, K, T) -> np.ndarray:
+        """
+        Implied vol at strike K and time T (years), broadcasting.
+        """
+        K, T = np.broadcast_arrays(np.asarray(K, dtype=float), np.asarray(T, dtype=float))
+        k = np.log(K / (self.s0 * np.exp(self.r * T)))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.sqrt(self.total_variance(k, T) / T)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            "T": self.T,
+            "a": self.coef[:, 0],
+            "b": self.coef[:, 1],
+            "c": self.coef[:, 2],
+            "k_min": self.k_min,
+            "k_max": self.k_max,
+            "s0": self.s0,
+            "r": self.r,
+        })
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "VolSurface":
+        return cls(
+            s0=float(df["s0"].iloc[0]),
+            r=float(df["r"].iloc[0]),
+            T=df["T"].to_numpy(dtype=float),
+            coef=df[["a", "b", "c"]].to_numpy(dtype=float),
+            k_min=df["k_min"].to_numpy(dtype=float),
+            k_max=df["k_max"].to_numpy(dtype=float),
+        )
+
+
+def chain_fingerprint(chain: pd.DataFrame, *params) -> str:
+    """
+    Short hash of a long chain's expiries, types, strikes and mids plus any
+    fitting parameters, so cached fits follow the quotes they came from.
+    """
+    cols = [c for c in ("expiry", "type", "strike", "mid") if c in chain.columns]
+    h = hashlib.sha1(pd.util.hash_pandas_object(chain[cols], index=False).to_numpy().tobytes())
+    h.update(repr(params).encode())
+    return h.hexdigest()[:16]
+
+
+def build_vol_surface(
+    chain: Union[OptionsChain, pd.DataFrame],
+    s0: float,
+    as_of: str,
+    r: float = 0.0,
+    otm_only: bool = True,
+    cache: Optional[MarketDataCache] = None,
+    ticker: Optional[str] = None,
+) -> VolSurface:
+    """
+    Implied vols -> one vega-weighted smile per expiry -> VolSurface.
+
+    - otm_only keeps puts below the forward and calls above it, where mids
+      carry the information (ITM mids are mostly intrinsic)
+    - with a cache and ticker the fitted surface is stored under
+      ("vol_surface", ticker, as_of), keyed by a fingerprint of the quotes,
+      s0, r and otm_only, and served from there while they are unchanged
+    """
+    table = long_chain(chain)
+    key = None
+    if cache is not None and ticker is not None:
+        key = f"smiles-{chain_fingerprint(table, float(s0), float(r), bool(otm_only))}"
+        cached = cache.get("vol_surface", ticker, key, as_of)
+        if cached is not None:
+            return VolSurface.from_frame(cached)
+
+    df = chain_implied_vols(table, s0, as_of, r=r)
+    df = df[np.isfinite(df["iv"]) & (df["T"] > 0)]
+    if otm_only:
+        df = df[((df["type"] == "put") & (df["k"] <= 0)) | ((df["type"] == "call") & (df["k"] > 0))]
+    if df.empty:
+        raise ValueError("No contracts with a usable implied vol.")
+
+    T_all, coefs, k_min, k_max = [], [], [], []
+    for T, g in df.groupby("T", sort=True):
+        k = g["k"].to_numpy(dtype=float)
+        iv = g["iv"].to_numpy(dtype=float)
+        vega = bs_vega(s0, g["strike"].to_numpy(dtype=float), T, iv, r)
+        T_all.append(float(T))
+        coefs.append(fit_smile(k, iv ** 2 * T, weights=vega))
+        k_min.append(k.min())
+        k_max.append(k.max())
+
+    surface = VolSurface(
+        s0=float(s0),
+        r=float(r),
+        T=np.array(T_all),
+        coef=np.array(coefs),
+        k_min=np.array(k_min),
+        k_max=np.array(k_max),
+    )
+    if key is not None:
+        cache.put("vol_surface", ticker, key, surface.to_frame(), as_of)
+    return surface
@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.tariff_strategy.modeling.calibration import baseline_mu_30d, baseline_sigma_30d
+from src.tariff_strategy.pipeline.backtest import CalibrationState
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(0)
+    adj = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.015, 400)))
+    return pd.DataFrame({"Date": pd.bdate_range("2024-01-01", periods=400), "Adj Close": adj})
+
+
+@pytest.mark.parametrize("t", [119, 160, 399])
+def test_calibration_state_matches_baselines_on_trailing_sample(prices, t):
+    lookback = 120
+    state = CalibrationState.from_prices(prices, window=30, lookback=lookback, trim=0.10)
+    sample = prices.iloc[t - lookback + 1 : t + 1]
+
+    mu_base, sigma_base = state.calibrate(t)
+    assert mu_base == pytest.approx(baseline_mu_30d(sample, trim=0.10), abs=1e-12)
+    assert sigma_base == pytest.approx(baseline_sigma_30d(sample), abs=1e-12)
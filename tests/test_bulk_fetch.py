@@ -0,0 +1,128 @@
+import threading
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.tariff_strategy.data.bulk_fetch import RateLimiter, chain_requests, fetch_chains
+from src.tariff_strategy.data.market_data import OptionsChain
+
+
+def _chain(expiry):
+    df = pd.DataFrame({"strike": [350.0, 385.0], "mid": [2.28, 8.05]})
+    return OptionsChain(calls=df, puts=df, expiry=expiry)
+
+
+class FakeSource:
+    """
+    In-memory data source: fails the first `failures[pair]` calls for a pair.
+    """
+
+    def __init__(self, failures=None):
+        self.failures = dict(failures or {})
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, ticker, expiry):
+        with self.lock:
+            self.calls.append((ticker, expiry, time.monotonic()))
+            left = self.failures.get((ticker, expiry), 0)
+            self.failures[(ticker, expiry)] = left - 1
+        if left > 0:
+            raise ConnectionError(f"{ticker} {expiry} unavailable")
+        return _chain(expiry)
+
+
+def test_rate_limiter_spaces_starts_across_threads():
+    limiter = RateLimiter(rate=50.0)
+    starts = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(5):
+            limiter.wait()
+            with lock:
+                starts.append(time.monotonic())
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # starts are scheduled on a fixed 20 ms grid; allow for thread wake-up jitter
+    starts = np.sort(starts)
+    assert len(starts) == 20
+    assert np.all(starts - starts[0] >= 0.02 * np.arange(20) - 0.01)
+
+
+def test_rate_limiter_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        RateLimiter(0)
+
+
+def test_fetch_chains_stacks_in_pair_order():
+    pairs = [("SMH", "2026-02-13"), ("NVDA", "2026-03-20"), ("SMH", "2026-03-20")]
+    out = fetch_chains(pairs, fetch=FakeSource(), max_workers=3, rate=None)
+
+    assert list(out.columns[:3]) == ["ticker", "expiry", "strike"]
+    assert list(out.drop_duplicates(["ticker", "expiry"])[["ticker", "expiry"]].itertuples(index=False, name=None)) == pairs
+    assert len(out) == 4 * len(pairs)
+
+
+def test_fetch_chains_retries_transient_failures():
+    source = FakeSource({("SMH", "2026-02-13"): 2})
+    out = fetch_chains([("SMH", "2026-02-13")], fetch=source, rate=None, retries=2, backoff=0.0)
+
+    assert len(source.calls) == 3
+    assert len(out) == 4
+
+
+def test_fetch_chains_skips_or_raises_after_retries():
+    pairs = [("SMH", "2026-02-13"), ("BAD", "2026-02-13")]
+    source = FakeSource({("BAD", "2026-02-13"): 10})
+    with pytest.warns(UserWarning, match="Skipping BAD"):
+        out = fetch_chains(pairs, fetch=source, rate=None, retries=1, backoff=0.0)
+    assert set(out["ticker"]) == {"SMH"}
+
+    source = FakeSource({("BAD", "2026-02-13"): 10})
+    with pytest.raises(ConnectionError):
+        fetch_chains(pairs, fetch=source, rate=None, retries=1, backoff=0.0, skip_failed=False)
+
+    with pytest.warns(UserWarning), pytest.raises(ValueError, match="No option chains"):
+        fetch_chains(pairs[1:], fetch=FakeSource({("BAD", "2026-02-13"): 10}), rate=None, retries=0)
+
+
+def test_fetch_chains_respects_rate_with_workers():
+    pairs = [("SMH", f"2026-0{m}-20") for m in range(1, 9)]
+    source = FakeSource()
+    fetch_chains(pairs, fetch=source, max_workers=8, rate=40.0)
+
+    starts = sorted(t for _, _, t in source.calls)
+    assert starts[-1] - starts[0] >= (len(pairs) - 1) / 40.0 - 5e-3
+
+
+def test_chain_requests_lists_through_the_shared_limiter_and_retries():
+    today = pd.Timestamp.now("UTC").tz_localize(None).normalize()
+    listed = [(today + pd.Timedelta(days=d)).date().isoformat() for d in (-3, 10, 60)]
+    failures = {"SMH": 1}
+    starts = []
+
+    def list_expiries(ticker):
+        starts.append(time.monotonic())
+        failures[ticker] = failures.get(ticker, 0) - 1
+        if failures[ticker] >= 0:
+            raise ConnectionError(f"{ticker} unavailable")
+        return listed
+
+    limiter = RateLimiter(rate=40.0)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        pairs = chain_requests(["SMH", "NVDA"], list_expiries, max_days=30, rate=limiter, backoff=0.0)
+
+    assert pairs == [("SMH", listed[1]), ("NVDA", listed[1])]
+    # starts are scheduled on a fixed 25 ms grid; allow for wake-up jitter
+    assert len(starts) == 3
+    assert np.all(np.subtract(starts, starts[0]) >= np.arange(3) / 40.0 - 5e-3)
@@ -0,0 +1,87 @@
+import time
+
+import pandas as pd
+import pytest
+
+from src.tariff_strategy.data import cache as cache_mod
+from src.tariff_strategy.data import market_data
+from src.tariff_strategy.data.cache import CacheMiss, MarketDataCache
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({"strike": [350.0, 385.0], "mid": [2.28, 8.05], "contractSymbol": ["A", "B"]})
+
+
+def test_offline_serves_entry_filled_on_an_earlier_day(tmp_path, monkeypatch, frame):
+    monkeypatch.setattr(cache_mod, "today_utc", lambda: "2026-10-17")
+    MarketDataCache(tmp_path).put("calls", "SMH", "2026-11-20", frame)
+
+    monkeypatch.setattr(cache_mod, "today_utc", lambda: "2026-10-18")
+    offline = MarketDataCache(tmp_path, offline=True)
+    pd.testing.assert_frame_equal(offline.get("calls", "SMH", "2026-11-20"), frame)
+
+
+def test_offline_fallback_never_looks_ahead(tmp_path, frame):
+    cache = MarketDataCache(tmp_path, ttl_seconds=None)
+    cache.put("calls", "SMH", "2026-11-20", frame, as_of="2026-10-10")
+    cache.put("calls", "SMH", "2026-11-20", frame.assign(mid=0.0), as_of="2026-10-17")
+
+    offline = MarketDataCache(tmp_path, offline=True)
+    assert offline.get("calls", "SMH", "2026-11-20", as_of="2026-10-12")["mid"].tolist() == [2.28, 8.05]
+    assert offline.get("calls", "SMH", "2026-11-20", as_of="2026-10-20")["mid"].tolist() == [0.0, 0.0]
+    with pytest.raises(CacheMiss):
+        offline.get("calls", "SMH", "2026-11-20", as_of="2026-10-01")
+
+
+def test_online_with_explicit_as_of_is_exact(tmp_path, frame):
+    cache = MarketDataCache(tmp_path)
+    cache.put("calls", "SMH", "2026-11-20", frame, as_of="2026-10-10")
+    assert cache.get("calls", "SMH", "2026-11-20", as_of="2026-10-11") is None
+
+
+class FakeTicker:
+    calls = 0
+
+    def __init__(self, ticker):
+        pass
+
+    def option_chain(self, expiry):
+        FakeTicker.calls += 1
+        frame = pd.DataFrame({"strike": [350.0], "mid": [2.28]})
+        return market_data.OptionsChain(calls=frame, puts=frame, expiry=expiry)
+
+
+def test_live_download_is_stored_as_of_today(tmp_path, monkeypatch):
+    monkeypatch.setattr(market_data.yf, "Ticker", FakeTicker)
+    cache = MarketDataCache(tmp_path)
+    market_data.fetch_options_chain("SMH", "2026-11-20", cache=cache)
+
+    assert cache.path("calls", "SMH", "2026-11-20", cache_mod.today_utc()).exists()
+
+
+def test_past_as_of_is_served_from_earlier_entries_or_refused(tmp_path, monkeypatch, frame):
+    monkeypatch.setattr(market_data.yf, "Ticker", FakeTicker)
+    FakeTicker.calls = 0
+    cache = MarketDataCache(tmp_path)
+    cache.put("calls", "SMH", "2020-11-20", frame, as_of="2020-10-10")
+    cache.put("puts", "SMH", "2020-11-20", frame, as_of="2020-10-10")
+
+    chain = market_data.fetch_options_chain("SMH", "2020-11-20", cache=cache, as_of="2020-10-12")
+    pd.testing.assert_frame_equal(chain.puts, frame)
+
+    with pytest.raises(LookupError, match="on or before 2020-10-01"):
+        market_data.fetch_options_chain("SMH", "2020-11-20", cache=cache, as_of="2020-10-01")
+    with pytest.raises(LookupError):
+        market_data.fetch_options_chain("SMH", "2020-11-20", as_of="2020-10-12")
+    assert FakeTicker.calls == 0
+
+
+def test_ttl_only_expires_current_entries(tmp_path, frame):
+    cache = MarketDataCache(tmp_path, ttl_seconds=0.0)
+    cache.put("calls", "SMH", "2020-11-20", frame, as_of="2020-10-10")
+    cache.put("calls", "SMH", "2026-11-20", frame)
+    time.sleep(0.01)
+
+    assert cache.get("calls", "SMH", "2020-11-20", as_of="2020-10-10") is not None
+    assert cache.get("calls", "SMH", "2026-11-20") is None
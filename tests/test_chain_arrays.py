@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.tariff_strategy.data.chain_arrays import ChainArrays
+from src.tariff_strategy.data.market_data import OptionsChain, clean_chain
+from src.tariff_strategy.trading.execution import ExecutionModel
+from src.tariff_strategy.trading.optimizer_inputs import build_design_matrix, design_matrix_from_arrays
+from src.tariff_strategy.trading.options_universe import filter_liquid_options
+from src.tariff_strategy.trading.put_spread_search import search_put_spreads_batched
+from src.tariff_strategy.trading.target_payoff import build_price_grid, downside_target_payoff
+
+
+@pytest.fixture
+def chain():
+    return clean_chain(OptionsChain(
+        calls=pd.read_csv("data/smh_calls_2026-02-13.csv"),
+        puts=pd.read_csv("data/smh_puts_2026-02-13.csv"),
+        expiry="2026-02-13",
+    ))
+
+
+def test_design_matrix_from_arrays_matches_frames(chain):
+    S_grid = build_price_grid(s0=400.39)
+    calls, puts = filter_liquid_options(chain.calls), filter_liquid_options(chain.puts)
+    X, meta = build_design_matrix(S_grid, calls, puts)
+
+    X_arr, meta_arr = design_matrix_from_arrays(S_grid, ChainArrays.from_chain(chain).filter_liquid())
+    np.testing.assert_array_equal(X_arr, X)
+    pd.testing.assert_frame_equal(meta_arr, meta, check_dtype=False)
+
+
+def test_put_spread_search_accepts_chain_arrays(chain):
+    S_grid = build_price_grid(s0=400.39)
+    target = downside_target_payoff(S_grid, s0=400.39)
+    puts = filter_liquid_options(chain.puts)
+    arrays = ChainArrays.from_chain(chain).filter_liquid()
+
+    for execution in (None, ExecutionModel()):
+        expected = search_put_spreads_batched(S_grid, puts, target, top_k=20, execution=execution)
+        got = search_put_spreads_batched(S_grid, arrays, target, top_k=20, execution=execution)
+        pd.testing.assert_frame_equal(got, expected)
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from src.tariff_strategy.pipeline.dag import Pipeline, _fingerprint
+from src.tariff_strategy.pipeline.tariff import build_tariff_pipeline
+
+
+def test_fingerprint_hashes_arrays_nested_in_containers():
+    a = np.zeros(10_000)
+    b = a.copy()
+    b[5_000] = 1.0  # hidden in the middle of numpy's truncated repr
+    assert repr({"x": a}) == repr({"x": b})
+
+    assert _fingerprint({"x": a}) != _fingerprint({"x": b})
+    assert _fingerprint([1, (a, "k")]) != _fingerprint([1, (b, "k")])
+    assert _fingerprint({"f": pd.DataFrame({"v": a})}) != _fingerprint({"f": pd.DataFrame({"v": b})})
+    assert _fingerprint({"x": a, "n": [1, 2]}) == _fingerprint({"x": a.copy(), "n": [1, 2]})
+
+
+def test_nested_array_change_reruns_the_step():
+    calls = []
+    pipe = Pipeline().add("total", lambda cfg: calls.append(1) or float(cfg["w"].sum()), deps=("cfg",))
+    w = np.zeros(10_000)
+    pipe.run({"cfg": {"w": w}})
+    w2 = w.copy()
+    w2[5_000] = 1.0
+    out = pipe.run({"cfg": {"w": w2}})
+
+    assert len(calls) == 2
+    assert out["total"] == 1.0
+
+
+def test_tariff_design_matrix_feeds_the_structure_step():
+    pipe = build_tariff_pipeline()
+    assert "design" in pipe.steps["structure"].deps
+    assert pipe.order(["structure"])[-1] == "structure"
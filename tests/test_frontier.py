@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from src.tariff_strategy.trading.frontier import _dominated_by, pareto_mask
+
+
+def brute_force_mask(V):
+    le = (V[:, None, :] <= V[None, :, :]).all(axis=2)
+    lt = (V[:, None, :] < V[None, :, :]).any(axis=2)
+    return ~(le & lt).any(axis=0)
+
+
+@pytest.mark.parametrize("m", [2, 3, 4, 5])
+@pytest.mark.parametrize("ties", [False, True])
+def test_pareto_mask_matches_brute_force(m, ties):
+    rng = np.random.default_rng(m)
+    V = rng.integers(0, 4, (600, m)).astype(float) if ties else rng.random((600, m))
+    np.testing.assert_array_equal(pareto_mask(V), brute_force_mask(V))
+
+
+def test_front_heavy_input():
+    # every point of a simplex is on the frontier
+    V = np.random.default_rng(0).dirichlet(np.ones(4), 3000)
+    assert pareto_mask(V).all()
+
+
+@pytest.mark.parametrize("k", [1, 2, 3, 4])
+def test_dominated_by_divide_and_conquer(k):
+    rng = np.random.default_rng(k)
+    A = rng.integers(0, 5, (80, k)).astype(float)
+    B = rng.integers(0, 5, (90, k)).astype(float)
+    expected = (A[:, None, :] <= B[None, :, :]).all(axis=2).any(axis=0)
+    np.testing.assert_array_equal(_dominated_by(A, B, block=1), expected)
@@ -0,0 +1,43 @@
+import numpy as np
+
+from src.tariff_strategy.modeling.paths import iter_paths, simulate_paths
+from src.tariff_strategy.modeling.scenarios import tariff_scenarios
+from src.tariff_strategy.trading.path_rules import HELD, ExitRule, RuleOutcome, evaluate_put_spread_rules
+
+S0, MU_BASE, SIGMA_BASE = 400.39, 0.04468, 0.10747
+K_LONG, K_SHORT, PREMIUM = 385.0, 350.0, 577.0
+
+
+def test_iter_paths_blocks_concatenate_to_simulate_paths():
+    scenarios = tariff_scenarios()
+    whole = simulate_paths(S0, scenarios, MU_BASE, SIGMA_BASE, n_paths=10_001, n_steps=10, seed=7, block_size=3_000)
+    blocks = list(iter_paths(S0, scenarios, MU_BASE, SIGMA_BASE, n_paths=10_001, n_steps=10, seed=7, block_size=3_000))
+
+    assert len(blocks) > 1
+    np.testing.assert_array_equal(np.concatenate([b.codes for b in blocks]), whole.codes)
+    np.testing.assert_array_equal(np.hstack([b.log_S for b in blocks]), whole.log_S)
+
+
+def test_barrier_that_is_never_hit_leaves_the_hold_pnl():
+    paths = simulate_paths(S0, tariff_scenarios(), MU_BASE, SIGMA_BASE, n_paths=5_000, seed=3)
+    rule = ExitRule(barrier_down=1.0, barrier_up=1e9, roll_on_barrier=True)
+    out = evaluate_put_spread_rules(paths, K_LONG, K_SHORT, PREMIUM, rule, sigma=0.35)
+
+    assert np.all(out.reason == HELD)
+    np.testing.assert_array_equal(out.pnl, out.hold_pnl)
+
+
+def test_block_outcomes_concatenate_to_the_whole_run():
+    scenarios = tariff_scenarios()
+    rule = ExitRule(stop_loss=0.5, barrier_down=360.0, roll_on_barrier=True)
+    kwargs = dict(n_paths=4_000, n_steps=10, seed=5, block_size=1_500)
+
+    whole = evaluate_put_spread_rules(
+        simulate_paths(S0, scenarios, MU_BASE, SIGMA_BASE, **kwargs), K_LONG, K_SHORT, PREMIUM, rule, sigma=0.35
+    )
+    blocks = RuleOutcome.concat([
+        evaluate_put_spread_rules(b, K_LONG, K_SHORT, PREMIUM, rule, sigma=0.35)
+        for b in iter_paths(S0, scenarios, MU_BASE, SIGMA_BASE, **kwargs)
+    ])
+    np.testing.assert_array_equal(blocks.reason, whole.reason)
+    np.testing.assert_allclose(blocks.pnl, whole.pnl, rtol=1e-12)
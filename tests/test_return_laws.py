@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from src.tariff_strategy.modeling.distribution import sample_terminal_prices
+from src.tariff_strategy.modeling.return_laws import (
+    EmpiricalLaw,
+    GaussianLaw,
+    MertonJumpLaw,
+    StudentTLaw,
+    law_mixture,
+    sample_terminal_prices_law,
+)
+from src.tariff_strategy.modeling.scenarios import tariff_scenarios
+from src.tariff_strategy.trading.analytic_pnl import put_spread_pnl_analytic
+from src.tariff_strategy.trading.target_payoff import adaptive_price_grid, density_weights
+from src.tariff_strategy.trading.trade_summary import put_spread_payoff_dollars
+
+S0, MU_BASE, SIGMA_BASE = 400.39, 0.04468, 0.10747
+K_LONG, K_SHORT, PREMIUM = 385.0, 350.0, 577.0
+
+
+def _empirical():
+    rng = np.random.default_rng(3)
+    return EmpiricalLaw.from_returns(-rng.gamma(2.0, 1.0, 500))  # left-skewed returns
+
+
+LAWS = {
+    "student_t": StudentTLaw(df=4.0),
+    "merton": MertonJumpLaw(),
+    "empirical": _empirical(),
+    "per_severity": {0: GaussianLaw(), 1: StudentTLaw(df=5.0), 2: MertonJumpLaw(), 3: _empirical()},
+}
+
+
+def test_gaussian_law_reproduces_sample_terminal_prices():
+    scenarios = tariff_scenarios()
+    batch = sample_terminal_prices(S0, scenarios, MU_BASE, SIGMA_BASE, n_sims=10_001, seed=7)
+    law = sample_terminal_prices_law(S0, scenarios, MU_BASE, SIGMA_BASE, law=GaussianLaw(), n_sims=10_001, seed=7)
+
+    np.testing.assert_array_equal(law.codes, batch.codes)
+    np.testing.assert_array_equal(law.S_T, batch.S_T)
+
+
+@pytest.mark.parametrize("name", sorted(LAWS))
+def test_law_mixture_pnl_matches_monte_carlo(name):
+    scenarios = tariff_scenarios()
+    mixture = law_mixture(S0, scenarios, MU_BASE, SIGMA_BASE, law=LAWS[name])
+    sample = sample_terminal_prices_law(S0, scenarios, MU_BASE, SIGMA_BASE, law=LAWS[name], n_sims=200_000, seed=5)
+
+    exact = put_spread_pnl_analytic(mixture, K_LONG, K_SHORT, PREMIUM).iloc[0]
+    pnl = put_spread_payoff_dollars(sample.S_T, K_LONG, K_SHORT, PREMIUM)
+    n = len(pnl)
+    assert abs(pnl.mean() - exact["ev_$"]) < 3 * pnl.std() / np.sqrt(n)
+    p = np.mean(pnl > 0)
+    assert abs(p - exact["p_profit"]) < 3 * np.sqrt(p * (1 - p) / n)
+
+
+def test_law_mixture_feeds_the_grid_builders():
+    scenarios = tariff_scenarios()
+    mixture = law_mixture(S0, scenarios, MU_BASE, SIGMA_BASE, law=LAWS["per_severity"])
+
+    S_grid = adaptive_price_grid(101, mixture=mixture, include=[K_SHORT, K_LONG])
+    assert np.all(np.diff(S_grid) > 0)
+    assert {K_SHORT, K_LONG} <= set(S_grid)
+
+    w = density_weights(S_grid, mixture=mixture)
+    assert w.sum() == pytest.approx(1.0)
+    assert np.all(w >= 0)
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from src.tariff_strategy.modeling.distribution import sample_terminal_prices, simulate_terminal_prices
+from src.tariff_strategy.modeling.mapping import params_from_calibration
+from src.tariff_strategy.modeling.parallel import sample_terminal_prices_parallel
+from src.tariff_strategy.modeling.scenarios import tariff_scenarios
+from src.tariff_strategy.modeling.streaming import iter_terminal_prices
+from src.tariff_strategy.trading.trade_summary import put_spread_pnl_stats
+
+S0, MU_BASE, SIGMA_BASE = 400.39, 0.04468, 0.10747
+
+
+def test_streaming_matches_batch_for_any_chunk_size():
+    scenarios = tariff_scenarios()
+    batch = sample_terminal_prices(S0, scenarios, MU_BASE, SIGMA_BASE, n_sims=10_001, seed=7)
+
+    for chunk_size in (1_000, 3_333, 10_001, 50_000):
+        chunks = list(
+            iter_terminal_prices(S0, scenarios, MU_BASE, SIGMA_BASE, n_sims=10_001, seed=7, chunk_size=chunk_size)
+        )
+        np.testing.assert_array_equal(np.concatenate([c.codes for c in chunks]), batch.codes)
+        np.testing.assert_array_equal(np.concatenate([c.S_T for c in chunks]), batch.S_T)
+
+
+def test_streamed_pnl_matches_simulate_terminal_prices_as_called():
+    scenarios = tariff_scenarios()
+    sims = simulate_terminal_prices(s0=S0, scenarios=scenarios, mu_base=MU_BASE, sigma_base=SIGMA_BASE, n_sims=50_000)
+    chunks = iter_terminal_prices(S0, scenarios, MU_BASE, SIGMA_BASE, n_sims=50_000, chunk_size=7_000)
+
+    batch = put_spread_pnl_stats(sims["S_T"].to_numpy(), 385.0, 350.0, 577.0)
+    streamed = put_spread_pnl_stats(chunks, 385.0, 350.0, 577.0)
+    assert streamed["ev_$"] == pytest.approx(batch["ev_$"], rel=1e-12)
+    assert streamed["p_profit"] == batch["p_profit"]
+
+
+def test_severity_ordering_reproduces_the_original_loop():
+    scenarios = tariff_scenarios()
+    rng = np.random.default_rng(11)
+    idx = rng.choice(len(scenarios), size=5_000, p=scenarios["p"].to_numpy())
+    severities = scenarios["severity"].to_numpy()[idx]
+    r = np.empty(len(idx))
+    for sev in np.unique(severities):
+        mask = severities == sev
+        params = params_from_calibration(int(sev), mu_base=MU_BASE, sigma_base=SIGMA_BASE)
+        r[mask] = rng.normal(loc=params.mu, scale=params.sigma, size=mask.sum())
+
+    sample = sample_terminal_prices(S0, scenarios, MU_BASE, SIGMA_BASE, n_sims=5_000, seed=11, ordering="severity")
+    np.testing.assert_allclose(sample.log_return, r, rtol=1e-12)
+
+
+def test_parallel_sampler_rejects_empty_runs():
+    with pytest.raises(ValueError, match="n_sims"):
+        sample_terminal_prices_parallel(S0, tariff_scenarios(), MU_BASE, SIGMA_BASE, n_sims=0, n_workers=1)
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.tariff_strategy.trading.payoff import HingePayoffMatrix, call_payoff_matrix, put_payoff_matrix
+from src.tariff_strategy.trading.put_spread_search import search_put_spreads_batched
+from src.tariff_strategy.trading.structure_optimizer import fit_structure
+
+
+@pytest.fixture(scope="module")
+def step8():
+    S_grid = np.load("data/step8_S_grid.npy")
+    target = np.load("data/step8_target_y.npy")
+    meta = pd.read_csv("data/step8_contract_meta.csv")
+    X = np.load("data/step8_payoff_X.npy")
+    cost = np.load("data/step8_cost_c.npy")
+    best = search_put_spreads_batched(S_grid, meta[meta["type"] == "put"].reset_index(drop=True), target).iloc[0]
+    y = target * (best["K_long"] - best["K_short"])
+    return X, y, cost, meta, best
+
+
+def spread_mae(X, y, meta, best):
+    w = np.zeros(X.shape[1])
+    puts = (meta["type"] == "put").to_numpy()
+    w[np.flatnonzero(puts & (meta["strike"] == best["K_long"]).to_numpy())] = 1.0
+    w[np.flatnonzero(puts & (meta["strike"] == best["K_short"]).to_numpy())] = -1.0
+    return np.mean(np.abs(X @ w - y))
+
+
+@pytest.mark.parametrize("time_limit", [0, 0.25])
+def test_whole_contract_fit_beats_best_spread_within_budget(step8, time_limit):
+    X, y, cost, meta, best = step8
+    fit = fit_structure(X, y, cost, meta=meta, budget=float(best["cost"]), max_legs=4, integer=True, time_limit=time_limit)
+
+    assert len(fit.legs) <= 4
+    np.testing.assert_array_equal(fit.weights, np.round(fit.weights))
+    assert fit.premium <= float(best["cost"]) + 1e-9
+    assert fit.mae <= spread_mae(X, y, meta, best) + 1e-12
+
+
+def test_heuristic_fit_is_reproducible(step8):
+    X, y, cost, meta, best = step8
+    kwargs = dict(budget=float(best["cost"]), max_legs=4, integer=True, time_limit=0, search_time=None)
+    a = fit_structure(X, y, cost, **kwargs)
+    b = fit_structure(X, y, cost, **kwargs)
+    np.testing.assert_array_equal(a.weights, b.weights)
+    assert a.status.startswith("Heuristic")
+
+
+def test_fine_grid_fit_searches_a_coarse_copy(step8):
+    X, y, cost, meta, best = step8
+    S_grid = np.load("data/step8_S_grid.npy")
+    S_fine = np.linspace(S_grid[0], S_grid[-1], 1000)
+    strikes = meta["strike"].to_numpy()
+    calls = (meta["type"] == "call").to_numpy()
+    X_fine = np.where(calls, call_payoff_matrix(S_fine, strikes), put_payoff_matrix(S_fine, strikes))
+    y_fine = np.interp(S_fine, S_grid, y)
+
+    fit = fit_structure(X_fine, y_fine, cost, meta=meta, budget=float(best["cost"]), max_legs=4, integer=True, time_limit=0)
+    assert len(fit.legs) <= 4
+    assert fit.premium <= float(best["cost"]) + 1e-9
+    assert fit.mae <= spread_mae(X_fine, y_fine, meta, best) + 1e-12
+
+
+def test_leg_limit_holds_for_continuous_fit(step8):
+    X, y, cost, meta, best = step8
+    fit = fit_structure(X, y, cost, budget=float(best["cost"]), max_legs=3)
+    assert np.count_nonzero(fit.weights) <= 3
+    assert fit.premium <= float(best["cost"]) + 1e-6
+
+
+def test_lazy_payoff_matrix_fits_like_the_dense_one(step8):
+    X, y, cost, meta, best = step8
+    S_grid = np.load("data/step8_S_grid.npy")
+    lazy = HingePayoffMatrix(S_grid, meta["strike"].to_numpy(), (meta["type"] == "call").to_numpy())
+    np.testing.assert_allclose(lazy.toarray(), X)
+
+    budget = float(best["cost"])
+    dense_lp = fit_structure(X, y, cost, budget=budget)
+    lazy_lp = fit_structure(lazy, y, cost, budget=budget)
+    assert lazy_lp.mae == pytest.approx(dense_lp.mae, abs=1e-9)
+    assert lazy_lp.premium <= budget + 1e-6
+
+    fit = fit_structure(lazy, y, cost, meta=meta, budget=budget, max_legs=4, integer=True)
+    assert len(fit.legs) <= 4
+    assert fit.premium <= budget + 1e-9
+    assert fit.mae <= spread_mae(X, y, meta, best) + 1e-12
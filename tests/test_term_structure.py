@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.tariff_strategy.modeling.analytic import mixture_from_calibration
+from src.tariff_strategy.modeling.mapping import MU_PENALTY
+from src.tariff_strategy.modeling.scenarios import tariff_scenarios
+from src.tariff_strategy.trading.pricing import bs_put_price
+from src.tariff_strategy.trading.target_payoff import build_price_grid, downside_target_payoff
+from src.tariff_strategy.trading.term_structure import build_expiry_curve, horizon_mixture, search_two_leg_structures
+
+
+@pytest.fixture
+def chains():
+    strikes = np.arange(300.0, 420.0, 5.0)
+    rows = []
+    for expiry, days in (("2026-01-30", 16), ("2026-02-13", 30), ("2026-03-20", 65)):
+        mid = bs_put_price(400.0, strikes, days / 365, 0.3, 0.0)
+        symbols = [f"SMH{expiry}P{k:g}" for k in strikes]
+        rows.append(pd.DataFrame({"expiry": expiry, "type": "put", "contractSymbol": symbols, "strike": strikes, "mid": mid}))
+    return pd.concat(rows, ignore_index=True)
+
+
+def test_expiries_before_the_horizon_are_dropped_with_a_warning(chains):
+    S_grid = build_price_grid(s0=400.0)
+    with pytest.warns(UserWarning, match="2026-01-30"):
+        curve = build_expiry_curve(chains, S_grid, 400.0, "2026-01-14")
+    assert list(curve.blocks) == ["2026-02-13", "2026-03-20"]
+
+
+def test_two_leg_total_cost_is_units_times_cost_per_unit(chains):
+    S_grid = build_price_grid(s0=400.0)
+    with pytest.warns(UserWarning):
+        curve = build_expiry_curve(chains, S_grid, 400.0, "2026-01-14")
+    out = search_two_leg_structures(curve, downside_target_payoff(S_grid, s0=400.0), top_k=5)
+    np.testing.assert_allclose(out["total_cost"], out["units"] * out["cost_per_unit"])
+
+
+def test_chains_without_symbols_keep_their_quote_columns(chains):
+    S_grid = build_price_grid(s0=400.0)
+    chains = chains.drop(columns="contractSymbol").assign(bid=lambda d: d["mid"] - 0.05)
+    with pytest.warns(UserWarning):
+        curve = build_expiry_curve(chains, S_grid, 400.0, "2026-01-14")
+    assert "symbol" not in curve.meta.columns
+    np.testing.assert_allclose(curve.meta["mid"] - curve.meta["bid"], 0.05)
+    assert curve.X.shape == (len(S_grid), len(curve.meta))
+
+
+def test_horizon_mixture_scales_the_scenario_penalty_and_vol():
+    scenarios = tariff_scenarios()
+    base = mixture_from_calibration(400.0, scenarios, 0.01, 0.08)
+    at_30 = horizon_mixture(400.0, scenarios, 0.01, 0.08, days=30)
+    at_60 = horizon_mixture(400.0, scenarios, 0.01, 0.08, days=60)
+
+    np.testing.assert_allclose(at_30.mu, base.mu)
+    np.testing.assert_allclose(at_60.mu, 2.0 * base.mu)
+    np.testing.assert_allclose(at_60.sigma, np.sqrt(2.0) * base.sigma)
+    penalty = np.array([MU_PENALTY[int(s)] for s in scenarios["severity"]])
+    np.testing.assert_allclose(at_60.mu - 2.0 * 0.01, 2.0 * penalty)